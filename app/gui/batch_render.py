@@ -0,0 +1,244 @@
+"""
+Contains functions rendering all the schedules of a folder to images without the user interface.
+
+Nothing here imports tkinter, so the schedules can be rendered on a machine without a display.
+"""
+import concurrent.futures
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from app.gui.schedule_painter import SchedulePainter
+from app.src.schedule_index import ScheduleIndex
+from app.src.schedule_loader import load_file
+from app.utils import config
+from app.utils import utilities
+from app.utils.settings_service import SettingsService
+
+RENDER_VERSION = 1
+
+IMAGE_FORMATS = {"png": "PNG", "jpg": "JPEG", "pdf": "PDF"}
+
+painters: Dict[str, SchedulePainter] = {}
+
+class RenderResult(NamedTuple):
+    """Result of rendering of one schedule file."""
+    schedule_file: Path
+    output_file: Optional[Path]
+    status: utilities.RenderStatus
+    seconds: float
+    error: Optional[Exception]
+
+def render_folder(folder: Path,
+                  output_folder: Path,
+                  image_format: str="png",
+                  settings_path: Path=config.SETTINGS_PATH,
+                  processes: Optional[int]=None,
+                  force: bool=False,
+                  progress: Optional[Callable[[int, int, RenderResult], None]]=None) -> List[RenderResult]:
+    """
+    Renders all the schedules saved in a folder to images.
+
+    The content hashes of the schedule files are taken from the index of the folder. An image
+    whose schedule, settings and format have the same hash as when it was rendered the last time
+    is skipped. The hashes of the rendered images are kept in a manifest in the output folder.
+
+    Args:
+        folder (Path): The folder with the schedules.
+        output_folder (Path): The folder the images are saved to.
+        image_format (str): Extension of the images, one of IMAGE_FORMATS.
+        settings_path (Path): Path to the settings the schedules are drawn with.
+        processes (Optional[int]): Number of processes rendering the images, None for the number of
+            the processors, 0 to render them in this process.
+        force (bool): If True, the images are rendered even if they are up to date.
+        progress (Optional[Callable[[int, int, RenderResult], None]]): Function called with the
+            number of finished files, the number of all the files and the result of every file.
+
+    Raises:
+        ValueError: If the format is not supported or the settings are not valid.
+        OSError: If the settings cannot be read.
+
+    Returns:
+        List[RenderResult]: The results in the order of completion.
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Nepodporovaný formát obrázku: {image_format}.")
+    settings = SettingsService(settings_path).get()
+    output_folder = Path(output_folder)
+    output_folder.mkdir(parents=True, exist_ok=True)
+
+    schedule_index = ScheduleIndex(folder)
+    results = [RenderResult(file, None, utilities.RenderStatus.FAILED, 0.0, error)
+               for file, error in schedule_index.refresh()]
+    manifest = load_manifest(output_folder)
+    jobs = {}
+    for entry in schedule_index.get_entries():
+        schedule_file = Path(entry.file_path)
+        output_file = output_folder / f"{schedule_file.stem}.{image_format}"
+        key = get_render_key(entry.content_hash, settings, image_format)
+        if not force and manifest.get(output_file.name) == key and output_file.exists():
+            results.append(RenderResult(schedule_file, output_file, utilities.RenderStatus.SKIPPED, 0.0, None))
+        else:
+            jobs[schedule_file] = (output_file, key)
+
+    total = len(results) + len(jobs)
+    if progress is not None:
+        for finished, result in enumerate(results, 1):
+            progress(finished, total, result)
+
+    for result in iterate_renders(jobs, image_format, settings_path, processes):
+        if result.status == utilities.RenderStatus.RENDERED:
+            manifest[result.output_file.name] = jobs[result.schedule_file][1]
+        results.append(result)
+        if progress is not None:
+            progress(len(results), total, result)
+
+    if jobs:
+        save_manifest(output_folder, manifest)
+    return results
+
+def iterate_renders(jobs: Dict[Path, Tuple[Path, str]],
+                    image_format: str,
+                    settings_path: Path,
+                    processes: Optional[int]) -> Iterator[RenderResult]:
+    """
+    Renders schedule files and yields the results as they are completed.
+
+    Args:
+        jobs (Dict[Path, Tuple[Path, str]]): The schedule files with their output files and
+            render keys.
+        image_format (str): Extension of the images.
+        settings_path (Path): Path to the settings.
+        processes (Optional[int]): Number of processes, None for the number of the processors, 0
+            to render in this process.
+
+    Yields:
+        RenderResult: The result of every file.
+    """
+    if processes == 0:
+        for schedule_file, (output_file, _) in jobs.items():
+            try:
+                seconds = render_file(schedule_file, output_file, image_format, settings_path)
+            except Exception as e:
+                yield RenderResult(schedule_file, output_file, utilities.RenderStatus.FAILED, 0.0, e)
+            else:
+                yield RenderResult(schedule_file, output_file, utilities.RenderStatus.RENDERED, seconds, None)
+        return
+    if not jobs:
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {executor.submit(render_file, schedule_file, output_file, image_format, settings_path): schedule_file
+                   for schedule_file, (output_file, _) in jobs.items()}
+        for future in concurrent.futures.as_completed(futures):
+            schedule_file = futures[future]
+            output_file = jobs[schedule_file][0]
+            if future.exception() is not None:
+                yield RenderResult(schedule_file, output_file, utilities.RenderStatus.FAILED, 0.0, future.exception())
+            else:
+                yield RenderResult(schedule_file, output_file, utilities.RenderStatus.RENDERED, future.result(), None)
+
+def render_file(schedule_file: Path, output_file: Path, image_format: str, settings_path: Path) -> float:
+    """
+    Renders a schedule file to an image.
+
+    The image is saved to a temporary file renamed to the output file, so an interrupted
+    rendering never leaves a broken image.
+
+    Args:
+        schedule_file (Path): The schedule file.
+        output_file (Path): The image file.
+        image_format (str): Extension of the image.
+        settings_path (Path): Path to the settings.
+
+    Returns:
+        float: Time of the loading and the rendering in seconds.
+    """
+    start = time.perf_counter()
+    schedule = load_file(schedule_file)
+    painter = get_painter(settings_path)
+    painter.change_schedule(schedule)
+    painter.draw()
+    temporary_path = output_file.with_name(output_file.name + ".tmp")
+    painter.image.save(temporary_path, IMAGE_FORMATS[image_format])
+    os.replace(temporary_path, output_file)
+    return time.perf_counter() - start
+
+def get_painter(settings_path: Path) -> SchedulePainter:
+    """
+    Returns the painter of the process drawing with given settings.
+
+    The painter is created once for every process, so the processes keep their caches of fonts
+    and sprites between the files.
+
+    Args:
+        settings_path (Path): Path to the settings.
+
+    Returns:
+        SchedulePainter: The painter.
+    """
+    key = str(settings_path)
+    if key not in painters:
+        painters[key] = SchedulePainter(settings_service=SettingsService(settings_path))
+    return painters[key]
+
+def get_render_key(content_hash: str, settings: Dict, image_format: str) -> str:
+    """
+    Returns the hash of everything an image depends on.
+
+    Args:
+        content_hash (str): Content hash of the schedule file with its journal.
+        settings (Dict): The settings.
+        image_format (str): Extension of the image.
+
+    Returns:
+        str: The hash in hexadecimal.
+    """
+    data = json.dumps({"version": RENDER_VERSION,
+                       "schedule": content_hash,
+                       "settings": settings,
+                       "format": image_format},
+                      sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def load_manifest(output_folder: Path) -> Dict[str, str]:
+    """
+    Reads the hashes of the rendered images, a missing or damaged manifest is read as empty.
+
+    Args:
+        output_folder (Path): The folder with the images.
+
+    Returns:
+        Dict[str, str]: The hashes by the names of the images.
+    """
+    try:
+        with open(output_folder / config.RENDER_MANIFEST_FILE_NAME, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data["version"] != RENDER_VERSION:
+            return {}
+        return dict(data["images"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+def save_manifest(output_folder: Path, manifest: Dict[str, str]) -> None:
+    """
+    Writes the hashes of the rendered images, the old manifest is replaced at once.
+
+    Args:
+        output_folder (Path): The folder with the images.
+        manifest (Dict[str, str]): The hashes by the names of the images.
+    """
+    manifest_path = output_folder / config.RENDER_MANIFEST_FILE_NAME
+    temporary_path = manifest_path.with_suffix(".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump({"version": RENDER_VERSION, "images": manifest}, f, ensure_ascii=False, indent=4)
+    os.replace(temporary_path, manifest_path)
@@ -0,0 +1,62 @@
+"""Contains a class caching the fonts used by the schedule painter."""
+from collections import OrderedDict
+from typing import Tuple
+
+from PIL import ImageFont
+
+from app.utils import config
+
+class FontCache():
+    """
+    Cache of loaded fonts.
+
+    Keeps loaded fonts by their path and size so that the font files are not opened and parsed
+    again on every draw. When the cache is full, the least recently used font is evicted.
+    """
+
+    def __init__(self, max_size: int=config.FONT_CACHE_SIZE):
+        self.max_size = max_size
+        self.fonts: OrderedDict[Tuple[str, int], ImageFont.FreeTypeFont] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font: str, size: int) -> ImageFont.FreeTypeFont:
+        """
+        Returns the font with given size.
+
+        Loads the font from the file only if it is not already in the cache.
+
+        Args:
+            font (str): Path or name of the font file.
+            size (int): Size of the font.
+
+        Returns:
+            ImageFont.FreeTypeFont: The loaded font.
+        """
+        key = (font, size)
+        if key in self.fonts:
+            self.hits += 1
+            self.fonts.move_to_end(key)
+            return self.fonts[key]
+
+        self.misses += 1
+        loaded_font = ImageFont.truetype(font, size)
+        self.fonts[key] = loaded_font
+        if len(self.fonts) > self.max_size:
+            self.fonts.popitem(last=False)
+        return loaded_font
+
+    def clear(self) -> None:
+        """Removes all the fonts from the cache and resets the counters."""
+        self.fonts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics(self) -> Tuple[int, int]:
+        """
+        Returns statistics of the cache usage.
+
+        Returns:
+            Tuple[int, int]: Number of cache hits and number of cache misses.
+        """
+        return self.hits, self.misses
@@ -0,0 +1,112 @@
+"""Contains a class for the window finding common free time of the schedules."""
+import tkinter as tk
+from tkinter import messagebox
+from tkinter import ttk
+from typing import List
+
+from app.utils import config
+from app.utils.settings_service import get_settings_service
+from app.src.schedule import Schedule
+from app.src import free_time
+
+class FreeTimeWindow():
+    """
+    Window finding the time when the owners of the loaded schedules are free.
+
+    The user sets how many owners have to be free and the minimal length of the free time. The
+    time is searched in the days and the hours set to be shown in the settings.
+    """
+
+    def __init__(self, parent_window: tk.Tk, schedules: List[Schedule]):
+        self.window = tk.Toplevel(parent_window)
+        self.set_window_geometry()
+        self.window.title("Volný čas")
+        self.window.focus_set()
+        self.window.grab_set()
+        self.window.transient(parent_window)
+        self.schedules = schedules
+        self.widget_variables = {"quorum": tk.StringVar(value=str(len(schedules))),
+                                 "minimal_length": tk.StringVar(value="30")}
+        self.tree = ttk.Treeview(self.window, columns=("Day", "Start", "End", "Free"), show="headings")
+
+        self.add_widgets()
+        self.find_free_time()
+
+        self.window.bind("<Return>", func=lambda event: self.find_free_time())
+
+        parent_window.wait_window(self.window)
+
+    def set_window_geometry(self) -> None:
+        """Sets the geometry of the window."""
+        x_offset = (self.window.winfo_screenwidth() - config.FREE_TIME_WINDOW_INITIAL_SIZE[0])//4*3
+        y_offset = (self.window.winfo_screenheight() - config.FREE_TIME_WINDOW_INITIAL_SIZE[1])//2
+        geometry = f"{config.FREE_TIME_WINDOW_INITIAL_SIZE[0]}x{config.FREE_TIME_WINDOW_INITIAL_SIZE[1]}+{x_offset}+{y_offset}"
+        self.window.geometry(geometry)
+
+    def add_widgets(self) -> None:
+        """Adds widgets to the window."""
+        input_frame = tk.Frame(self.window)
+        input_frame.pack(fill="none", side="top", pady=10, padx=10)
+        quorum_label = tk.Label(input_frame, text="Volných alespoň:")
+        quorum_label.pack(side="left", padx=5)
+        quorum_spinbox = tk.Spinbox(input_frame,
+                                    from_=1,
+                                    to=max(len(self.schedules), 1),
+                                    width=5,
+                                    textvariable=self.widget_variables["quorum"])
+        quorum_spinbox.pack(side="left", padx=5)
+        length_label = tk.Label(input_frame, text="Délka (min):")
+        length_label.pack(side="left", padx=5)
+        length_spinbox = tk.Spinbox(input_frame,
+                                    from_=0,
+                                    to=24*60,
+                                    increment=config.FREE_TIME_GRANULARITY,
+                                    width=5,
+                                    textvariable=self.widget_variables["minimal_length"])
+        length_spinbox.pack(side="left", padx=5)
+        find_button = tk.Button(input_frame, text="Hledat", width=10, command=self.find_free_time)
+        find_button.pack(side="left", padx=5)
+
+        self.tree.heading("Day", text="Den")
+        self.tree.heading("Start", text="Začátek")
+        self.tree.heading("End", text="Konec")
+        self.tree.heading("Free", text="Volných")
+        for column in ("Day", "Start", "End", "Free"):
+            self.tree.column(column, width=100)
+        self.tree.pack(fill="both", expand=True)
+
+        close_button = tk.Button(self.window, text="Zavřít", width=10, command=self.close)
+        close_button.pack(side="bottom", padx=5, pady=5)
+
+    def find_free_time(self) -> None:
+        """Finds the free time with the set parameters and shows it in the treeview."""
+        try:
+            quorum = int(self.widget_variables["quorum"].get())
+            minimal_length = int(self.widget_variables["minimal_length"].get())
+        except ValueError:
+            messagebox.showwarning("Špatná hodnota", "Počet volných a délka musí být celá čísla.")
+            return
+
+        settings = get_settings_service().get()
+        start = int(settings["day_start"][:2])*60 + int(settings["day_start"][3:5])
+        end = int(settings["day_end"][:2])*60 + int(settings["day_end"][3:5])
+        slots = free_time.find_common_free_time(self.schedules,
+                                                quorum,
+                                                start=start,
+                                                end=end,
+                                                minimal_length=minimal_length)
+
+        days = ["Pondělí", "Úterý", "Středa", "Čtvrtek", "Pátek", "Sobota", "Neděle"]
+        self.tree.delete(*self.tree.get_children())
+        for slot in slots:
+            if settings["days_in_week"][slot.day.value] == "1":
+                self.tree.insert("",
+                                 "end",
+                                 values=(days[slot.day.value],
+                                         free_time.format_minutes(slot.start),
+                                         free_time.format_minutes(slot.end),
+                                         f"{slot.free_count}/{len(self.schedules)}"))
+
+    def close(self) -> None:
+        """Closes the window."""
+        self.window.destroy()
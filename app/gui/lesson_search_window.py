@@ -0,0 +1,121 @@
+"""Contains a class for the window searching the lessons of all the schedules."""
+import tkinter as tk
+from tkinter import messagebox
+from tkinter import ttk
+
+from app.utils import config
+from app.utils import utilities
+from app.src.schedule_database import ScheduleDatabase
+
+class LessonSearchWindow():
+    """
+    Window searching the lessons of all the schedules in the database.
+
+    The user can set the place, the instructor, the day and the time of the lessons. Empty fields
+    are not used in the search.
+    """
+
+    def __init__(self, parent_window: tk.Tk, database: ScheduleDatabase):
+        self.window = tk.Toplevel(parent_window)
+        self.set_window_geometry()
+        self.window.title("Hledat hodiny")
+        self.window.focus_set()
+        self.window.grab_set()
+        self.window.transient(parent_window)
+        self.database = database
+        self.widget_variables = {"place": tk.StringVar(),
+                                 "instructor": tk.StringVar(),
+                                 "day": tk.StringVar(value="Všechny"),
+                                 "start": tk.StringVar(),
+                                 "end": tk.StringVar()}
+        self.tree = ttk.Treeview(self.window,
+                                 columns=("Schedule", "Name", "Place", "Instructor", "Day", "Start", "End"),
+                                 show="headings")
+
+        self.add_widgets()
+
+        self.window.bind("<Return>", func=lambda event: self.search())
+
+        parent_window.wait_window(self.window)
+
+    def set_window_geometry(self) -> None:
+        """Sets the geometry of the window."""
+        x_offset = (self.window.winfo_screenwidth() - config.SEARCH_WINDOW_INITIAL_SIZE[0])//2
+        y_offset = (self.window.winfo_screenheight() - config.SEARCH_WINDOW_INITIAL_SIZE[1])//2
+        geometry = f"{config.SEARCH_WINDOW_INITIAL_SIZE[0]}x{config.SEARCH_WINDOW_INITIAL_SIZE[1]}+{x_offset}+{y_offset}"
+        self.window.geometry(geometry)
+
+    def add_widgets(self) -> None:
+        """Adds widgets to the window."""
+        input_frame = tk.Frame(self.window)
+        input_frame.pack(fill="none", side="top", pady=10, padx=10)
+        for text, variable, width in (("Místo:", "place", 10),
+                                      ("Vyučující:", "instructor", 12),
+                                      ("Od:", "start", 6),
+                                      ("Do:", "end", 6)):
+            label = tk.Label(input_frame, text=text)
+            label.pack(side="left", padx=2)
+            entry = tk.Entry(input_frame, width=width, textvariable=self.widget_variables[variable])
+            entry.pack(side="left", padx=2)
+        day_label = tk.Label(input_frame, text="Den:")
+        day_label.pack(side="left", padx=2)
+        day_combobox = ttk.Combobox(input_frame,
+                                    values=["Všechny"] + [str(day) for day in utilities.Day],
+                                    width=8,
+                                    state="readonly",
+                                    textvariable=self.widget_variables["day"])
+        day_combobox.pack(side="left", padx=2)
+        search_button = tk.Button(input_frame, text="Hledat", width=10, command=self.search)
+        search_button.pack(side="left", padx=5)
+
+        for column, text in (("Schedule", "Rozvrh"),
+                             ("Name", "Hodina"),
+                             ("Place", "Místo"),
+                             ("Instructor", "Vyučující"),
+                             ("Day", "Den"),
+                             ("Start", "Začátek"),
+                             ("End", "Konec")):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=100)
+        self.tree.pack(fill="both", expand=True)
+
+        close_button = tk.Button(self.window, text="Zavřít", width=10, command=self.close)
+        close_button.pack(side="bottom", padx=5, pady=5)
+
+    def search(self) -> None:
+        """Searches the lessons with the set conditions and shows them in the treeview."""
+        times = []
+        for variable in ("start", "end"):
+            value = self.widget_variables[variable].get().strip()
+            if not value:
+                times.append(None)
+                continue
+            try:
+                hours, minutes = value.split(":")
+                times.append(int(hours)*60 + int(minutes))
+            except ValueError:
+                messagebox.showwarning("Špatná hodnota", "Časy musí být ve formátu HH:MM.")
+                return
+        day_names = [str(day) for day in utilities.Day]
+        day = self.widget_variables["day"].get()
+        matches = self.database.find_lessons(utilities.Day(day_names.index(day)) if day in day_names else None,
+                                             times[0],
+                                             times[1],
+                                             self.widget_variables["place"].get().strip() or None,
+                                             self.widget_variables["instructor"].get().strip() or None)
+
+        self.tree.delete(*self.tree.get_children())
+        for match in matches:
+            self.tree.insert("",
+                             "end",
+                             values=(match.schedule_name,
+                                     match.lesson.name,
+                                     match.lesson.place,
+                                     match.lesson.instructor,
+                                     str(match.lesson.day),
+                                     match.lesson.start_time.strftime("%H:%M"),
+                                     match.lesson.end_time.strftime("%H:%M")))
+
+    def close(self) -> None:
+        """Closes the window."""
+        self.window.destroy()
@@ -119,6 +119,9 @@ class LessonsWindow:
         edit_lesson = self.schedule.lessons[edit_index]
         form = LessonForm(self.window, edit_lesson)
         edit_lesson = form.run()
+        # the table of a large schedule creates a new lesson every time, so they are compared by value
+        if edit_lesson == self.schedule.lessons[edit_index]:
+            return
         self.schedule.edit_lesson(edit_index, edit_lesson)
         self.tree.item(self.tree.get_children()[edit_index], values=(edit_lesson.name,
                                                                      edit_lesson.place,
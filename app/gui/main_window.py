@@ -1,22 +1,42 @@
 """Contains a class for the main window of the program."""
+import concurrent.futures
 import tkinter as tk
 from tkinter import simpledialog
 from tkinter import filedialog
 from tkinter import messagebox
 import platform
+import sqlite3
+import time
+from typing import Dict
 from typing import List
-import pickle
+from typing import Optional
+from typing import Tuple
+from typing import Union
 from pathlib import Path
 import os
 
-from PIL import Image, ImageTk
+from PIL import Image
 
 from app.utils import config
 from app.utils import utilities
+from app.utils.settings_service import Settings
+from app.utils.settings_service import get_settings_service
 from app.src.schedule import Schedule
+from app.src import schedule_loader
+from app.src import schedule_format
+from app.src.schedule_journal import get_journal_path
+from app.src.autosave import AutosaveWriter
+from app.src.schedule_database import ScheduleDatabase
+from app.src.schedule_index import ScheduleEntry
+from app.src.schedule_index import ScheduleIndex
+from app.src.schedule_index import load_schedule
 from app.gui.schedule_painter import SchedulePainter
 from app.gui.settings_window import SettingsWindow
 from app.gui.lessons_window import LessonsWindow
+from app.gui.free_time_window import FreeTimeWindow
+from app.gui.lesson_search_window import LessonSearchWindow
+from app.gui.render_scheduler import RenderScheduler
+from app.gui.schedule_view import ScheduleView
 
 class MainWindow():
     """The main window of the program."""
@@ -28,18 +48,32 @@ class MainWindow():
         self.win_size = (0, 0)
         self.current_screen_state = utilities.ScreenState.SCHEDULE_LIST_SHOWN
         self.initialize_menu()
-        self.schedules: List[Schedule] = []
+        self.schedules: List[Union[Schedule, ScheduleEntry]] = []
+        self.schedule_files: Dict[int, Path] = {}
+        self.autosave = AutosaveWriter()
+        self.database: Optional[ScheduleDatabase] = None
+        self.import_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.import_future: Optional[concurrent.futures.Future] = None
         self.load_schedules(config.SCHEDULE_FOLDER_PATH)
         self.painter = SchedulePainter()
         self.painter.change_schedule(Schedule(""))
-        self.tk_image = ImageTk.PhotoImage(self.painter.get_image())
+        self.export_painter = SchedulePainter()
+        self.render_scheduler = RenderScheduler(self.window,
+                                               self.painter,
+                                               self.display_schedule_image,
+                                               self.display_render_error)
+        self.schedule_view = ScheduleView(self.window)
+        self.settings_service = get_settings_service()
+        self.settings_service.subscribe(self.on_settings_changed)
+        self.window.after(config.SETTINGS_CHECK_INTERVAL, self.check_settings_file)
+        self.window.after(config.AUTOSAVE_STATUS_INTERVAL, self.update_autosave_status)
 
         def on_resize(event) -> None:
             if self.current_screen_state == utilities.ScreenState.SCHEDULE_DRAWN:
                 if str(event.widget) == ".": # . is toplevel window
                     if self.win_size != (event.width, event.height):
                         self.win_size = (event.width, event.height)
-                        self.show_schedule()
+                        self.show_schedule(debounce=True)
 
         self.window.bind("<Configure>", func=on_resize)
 
@@ -84,6 +118,8 @@ class MainWindow():
         schedule_menu.add_command(label="Uložit jako", command=self.save_schedule_as, accelerator=f"{modifier_name}+Shift+S")
 
         menu_bar.add_command(label="Hodiny", command=self.manage_lessons)
+        menu_bar.add_command(label="Volný čas", command=self.find_free_time)
+        menu_bar.add_command(label="Hledat", command=self.search_lessons)
         menu_bar.add_command(label="Nastavení", command=self.open_settings)
 
         self.window.config(menu=menu_bar)
@@ -97,23 +133,58 @@ class MainWindow():
         self.window.bind(f"<{modifier}-h>", lambda event: self.manage_lessons())
 
     def open_settings(self) -> None:
-        """Opens the settings window and then redraws the schedule if it is shown."""
+        """
+        Opens the settings window.
+
+        Saved settings are announced by the settings service to on_settings_changed.
+        """
         settings_window = SettingsWindow(self.window)
+        settings_window.close()
+
+    def on_settings_changed(self, settings: Settings) -> None:
+        """
+        Updates the painters and redraws the schedule if it is shown.
 
-        self.painter.update()
+        Args:
+            settings (Settings): The new settings.
+        """
+        with self.render_scheduler.lock:
+            self.painter.update()
+        self.export_painter.update()
         if self.current_screen_state == utilities.ScreenState.SCHEDULE_DRAWN:
-            self.draw_schedule()
             self.show_schedule()
-        settings_window.close()
+
+    def check_settings_file(self) -> None:
+        """Periodically checks whether the settings file has been changed outside of the application."""
+        self.settings_service.reload_if_changed()
+        self.window.after(config.SETTINGS_CHECK_INTERVAL, self.check_settings_file)
+
+    def update_autosave_status(self) -> None:
+        """Periodically shows the state of the autosave in the title of the window."""
+        title = config.APP_NAME
+        queue_depth = self.autosave.get_queue_depth()
+        last_saved_time = self.autosave.get_last_saved_time()
+        last_error = self.autosave.get_last_error()
+        if last_error is not None:
+            title += f" - chyba ukládání rozvrhu {last_error[0]}"
+        elif queue_depth:
+            title += f" - neuložené změny: {queue_depth}"
+        elif last_saved_time is not None:
+            title += f" - uloženo {time.strftime('%H:%M:%S', time.localtime(last_saved_time))}"
+        if self.window.title() != title:
+            self.window.title(title)
+        self.window.after(config.AUTOSAVE_STATUS_INTERVAL, self.update_autosave_status)
 
     def clear_window(self) -> None:
-        """Clears all the widgets of the window except for menu."""
+        """Clears all the widgets of the window except for menu and hides the schedule view."""
+        self.schedule_view.hide()
         for widget in self.window.winfo_children():
-            if widget.winfo_class() != "Menu":
+            if widget.winfo_class() != "Menu" and widget is not self.schedule_view.frame:
                 widget.destroy()
 
     def display_schedule_list(self) -> None:
         """Displays the list of all loaded schedules."""
+        self.render_scheduler.cancel()
         self.clear_window()
 
         self.window.grid_rowconfigure(0, weight=1)
@@ -145,21 +216,25 @@ class MainWindow():
     def open_schedule(self, index: int) -> None:
         """
         Opens the chosen schedule.
-        
+
+        The schedule is loaded from its file if only its entry from the index has been loaded.
+
         Args:
             index (int): The index of the schedule to be opened.
         """
+        if self.get_schedule(index) is None:
+            return
         self.clear_window()
-        self.draw_schedule(True, index)
-        self.show_schedule()
+        self.schedule_view.show()
         self.current_screen_state = utilities.ScreenState.SCHEDULE_DRAWN
+        self.draw_schedule(True, index)
 
     def rename_schedule(self, index: int) -> None:
         """
         Renames the chosen schedule.
 
-        Renames the schedule with given index. If the schedule is from the default schedule folder 
-        then it is renamed there to.
+        Renames the schedule with given index. The schedule is saved to the default schedule folder
+        under the new name, its file is moved there by the autosave writer in the background.
         
         Args:
             index (int): The index of the schedule to be renamed.
@@ -168,11 +243,15 @@ class MainWindow():
                                           prompt="Jméno",
                                           initialvalue=self.schedules[index].name)
         if new_name:
-            if os.path.exists(config.SCHEDULE_FOLDER_PATH / f"{self.schedules[index].name}.txt"):
-                os.rename(config.SCHEDULE_FOLDER_PATH / f"{self.schedules[index].name}.txt",
-                          config.SCHEDULE_FOLDER_PATH / f"{new_name}.txt")
-
-            self.schedules[index].rename(new_name)
+            schedule = self.get_schedule(index)
+            if schedule is None:
+                return
+            new_path = config.SCHEDULE_FOLDER_PATH / f"{new_name}.txt"
+            self.autosave.watch(schedule, self.schedule_files.get(id(schedule)))
+            schedule.rename(new_name)
+            self.autosave.move(schedule, new_path)
+            if id(schedule) in self.schedule_files:
+                self.schedule_files[id(schedule)] = new_path
             self.display_schedule_list()
 
     def delete_schedule(self, index: int) -> None:
@@ -187,10 +266,17 @@ class MainWindow():
         confirm = messagebox.askyesno(title="Potvrdit",
                                       message=f"Opravdu chcete smazat rozvrh {self.schedules[index].name}?")
         if confirm:
-            file_path = config.SCHEDULE_FOLDER_PATH / f"{self.schedules[index].name}.txt"
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            self.schedules.pop(index)
+            schedule = self.schedules.pop(index)
+            if isinstance(schedule, Schedule):
+                # the writer deletes the files after it is done with them
+                self.autosave.watch(schedule, self.schedule_files.pop(id(schedule), None))
+                self.autosave.unwatch(schedule, remove=True)
+            else:
+                file_path = Path(schedule.file_path)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                if os.path.exists(get_journal_path(file_path)):
+                    os.remove(get_journal_path(file_path))
             self.display_schedule_list()
 
     def manage_lessons(self) -> None:
@@ -198,80 +284,175 @@ class MainWindow():
         Opens a window for lessons management.
 
         First checks wheter a schedule is shown. Then opens a window for lessons management.
-        After the window is closed it redraws the schedule
+        After the window is closed it requests redrawing of the schedule if any of its days has
+        been changed, the painter then redraws only the changed lessons.
         """
         if self.current_screen_state != utilities.ScreenState.SCHEDULE_DRAWN:
             messagebox.showwarning("Nevybrán rozvrh", "Před úpravou hodin je potřeba vybrat rozvrh.")
             return
 
-        LessonsWindow(self.window, self.painter.active_schedule)
-        self.draw_schedule(False)
-        self.show_schedule()
+        schedule = self.painter.active_schedule
+        schedule.pop_dirty_days()
+        LessonsWindow(self.window, schedule)
+        if schedule.pop_dirty_days():
+            self.show_schedule()
+
+    def find_free_time(self) -> None:
+        """Opens a window finding the common free time of the loaded schedules."""
+        schedules = self.load_all_schedules()
+        if not schedules:
+            messagebox.showwarning("Žádné rozvrhy", "Pro hledání volného času je potřeba načíst rozvrhy.")
+            return
+
+        FreeTimeWindow(self.window, schedules)
+
+    def search_lessons(self) -> None:
+        """
+        Opens a window searching the lessons of all the schedules saved in the default folder.
+
+        The schedules are imported to the database on a background thread and the window is
+        opened by finish_search when the import is done.
+        """
+        if self.import_future is not None:
+            return
+        self.import_future = self.import_executor.submit(self.import_schedules)
+        self.window.after(config.DATABASE_IMPORT_POLL_INTERVAL, self.finish_search)
+
+    def import_schedules(self) -> List[Tuple[Path, Exception]]:
+        """
+        Writes the unsaved changes and imports the changed schedule files to the database.
+
+        Runs on a background thread with its own connection to the database.
+
+        Returns:
+            List[Tuple[Path, Exception]]: Files which could not be imported with the errors.
+        """
+        self.autosave.flush(wait=True)
+        database = ScheduleDatabase()
+        try:
+            return database.import_folder(config.SCHEDULE_FOLDER_PATH)
+        finally:
+            database.close()
+
+    def finish_search(self) -> None:
+        """Waits for the import of the schedules and opens the window searching the lessons."""
+        if not self.import_future.done():
+            self.window.after(config.DATABASE_IMPORT_POLL_INTERVAL, self.finish_search)
+            return
+        future = self.import_future
+        self.import_future = None
+        try:
+            errors = future.result()
+            if self.database is None:
+                self.database = ScheduleDatabase()
+        except (sqlite3.Error, ValueError) as e:
+            messagebox.showerror("Chyba", f"Databázi rozvrhů nejde otevřít: {e}")
+            return
+        self.show_loading_errors(errors)
+
+        LessonSearchWindow(self.window, self.database)
 
     def draw_schedule(self, change_schedule: bool=False, index: int=0) -> None:
         """
         Draws a schedule to the window.
 
-        If demanded changes the drawn schedule. Redraws the schedule in the painter.
+        If demanded changes the drawn schedule. Then requests drawing of the schedule.
 
         Args:
             change_schedule (bool): If True, drawn schedule is changed.
             index (int): Index of the new schedule to be drawn.
         """
         if change_schedule:
-            self.painter.change_schedule(self.schedules[index])
-        self.painter.draw()
+            schedule = self.get_schedule(index)
+            self.autosave.watch(schedule, self.schedule_files.get(id(schedule)))
+            with self.render_scheduler.lock:
+                self.painter.change_schedule(schedule)
+        self.show_schedule()
 
-    def show_schedule(self) -> None:
+    def show_schedule(self, debounce: bool=False) -> None:
         """
-        Renders the drawn schedule to the screen.
+        Requests rendering of the active schedule to the screen.
 
-        Sets up the window. Draws the active schedule to the window.
+        The painter draws the schedule directly in the size of the canvas on a worker thread. The
+        rendered image is then shown by display_schedule_image.
+
+        Args:
+            debounce (bool): If True, the request waits whether a newer one comes (eg. while the
+                window is being resized).
         """
-        self.clear_window()
+        self.render_scheduler.request(self.compute_canvas_size(), None if debounce else 0)
+
+    def compute_canvas_size(self) -> Tuple[int, int]:
+        """
+        Computes the size of the canvas for the schedule.
 
-        canvas_frame = tk.Frame(self.window)
-        canvas_frame.pack(pady=10, padx=10, fill="both", expand=True)
-        canvas_frame.update_idletasks()
+        The canvas is as large as possible while fitting into the window and keeping the ratio of
+        the width and the height of the schedule set in the settings.
 
-        settings = utilities.load_settings(config.SETTINGS_PATH)
+        Returns:
+            Tuple[int, int]: Width and height of the canvas.
+        """
+        settings = self.settings_service.get()
 
+        frame_width = max(self.window.winfo_width() - 20, 1)
+        frame_height = max(self.window.winfo_height() - 20, 1)
         image_ratio = settings["schedule_width"]/float(settings["schedule_height"])
-        canvas_frame_ratio = canvas_frame.winfo_width()/float(canvas_frame.winfo_height())
+        canvas_frame_ratio = frame_width/float(frame_height)
         if image_ratio >= canvas_frame_ratio:
-            canvas_width = canvas_frame.winfo_width()
+            canvas_width = frame_width
             canvas_height = int(canvas_width / image_ratio)
         else:
-            canvas_height = canvas_frame.winfo_height()
+            canvas_height = frame_height
             canvas_width = int(canvas_height * image_ratio)
+        return (max(canvas_width, 1), max(canvas_height, 1))
+
+    def display_schedule_image(self, image: Image.Image, box: Optional[Tuple[int, int, int, int]]) -> None:
+        """
+        Shows the rendered schedule in the schedule view.
 
-        canvas = tk.Canvas(canvas_frame, width=canvas_width, height=canvas_height, background="white")
-        self.tk_image = ImageTk.PhotoImage(self.painter.get_image().resize((canvas_width, canvas_height), Image.Resampling.LANCZOS))
-        canvas.delete("all")
-        canvas.create_image(0, 0, anchor="nw", image=self.tk_image)
-        canvas.place(relx=0.5, rely=0.5, anchor="center")
+        The view is updated even when it is hidden, as the following images may be only the
+        regions changed since this one.
+
+        Args:
+            image (Image.Image): Image of the schedule in the size of the canvas or its region.
+            box (Optional[Tuple[int, int, int, int]]): Box of the region, None if the image is whole.
+        """
+        self.schedule_view.display(image, box)
+
+    def display_render_error(self, error: Exception) -> None:
+        """
+        Tells the user that the schedule could not be rendered.
+
+        Args:
+            error (Exception): The error raised by the rendering.
+        """
+        if self.current_screen_state != utilities.ScreenState.SCHEDULE_DRAWN:
+            return
+        messagebox.showerror("Chyba vykreslování", f"Rozvrh nejde vykreslit: {error}")
 
     def save_schedule(self) -> None:
         """
         Saves the active schedule to the default folder in .txt file.
 
         First checks whether a schedule is shown, then saves the schedule in .txt file to the folder
-        where the schedules will be loaded from on the next start of the application.
+        where the schedules will be loaded from on the next start of the application. The schedule
+        is saved by the autosave writer in the background, its journal is compacted.
         """
         if self.current_screen_state == utilities.ScreenState.SCHEDULE_LIST_SHOWN:
             messagebox.showwarning(title="Nevybrán rozvrh", message="Nejdříve otevřete rozvrh, který chcete uložit.")
             return
 
-        file_path = Path(config.SCHEDULE_FOLDER_PATH) / f"{self.painter.active_schedule.name}.txt"
-
-        self.painter.active_schedule.save_to_txt_file(file_path)
+        schedule = self.painter.active_schedule
+        self.autosave.watch(schedule, self.schedule_files.get(id(schedule)))
+        self.autosave.save(schedule)
 
     def save_schedule_as(self) -> None:
         """
         Saves the active schedule to a file.
 
         First checks wheter a schedule is shown, then dialog window asks where to save the
-        schedule. If a destination is chosen, it saves the schedule there. Default destination is
+        schedule. If a destination is chosen, it saves the schedule there. Images are drawn in the
+        size set in the settings, not in the size of the window. Default destination is
         folder where the schedules will be automatically loaded from on the next start of the
         application.
         """
@@ -283,23 +464,32 @@ class MainWindow():
                                                 filetypes=[("PNG files", "*.png"),
                                                            ("JPEG files", "*.jpg"),
                                                            ("PDF files", "*.pdf"),
-                                                           ("TXT file", ".txt")],
+                                                           ("TXT file", ".txt"),
+                                                           ("JSON file", ".json")],
                                                 initialdir=config.SCHEDULE_FOLDER_PATH,
                                                 initialfile="Rozvrh")
         if filename:
-            if filename.endswith(".pdf"):
-                self.painter.image.save(filename, "PDF")
-            elif filename.endswith(".txt"):
+            if filename.endswith(".txt"):
                 self.painter.active_schedule.save_to_txt_file(filename)
+                return
+            if filename.endswith(".json"):
+                schedule_format.save_file(self.painter.active_schedule, Path(filename), json_format=True)
+                return
+
+            self.export_painter.change_schedule(self.painter.active_schedule)
+            self.export_painter.draw()
+            if filename.endswith(".pdf"):
+                self.export_painter.image.save(filename, "PDF")
             else:
-                self.painter.image.save(filename)
+                self.export_painter.image.save(filename)
 
     def load_schedules(self, folder_name: str) -> None:
         """
-        Loads all the schedules saved in a folder.
+        Loads the entries of all the schedules saved in a folder.
 
-        Checks if the valid folder name was passed. Checks if the .txt files contain valid schedule
-        data and then loads the schedules to the schedule list.
+        Checks if the valid folder name was passed. Then refreshes the index of the folder and adds
+        the entries of the schedules to the schedule list. The schedules themselves are loaded when
+        they are needed.
 
         Args:
             folder_name (str): Name of the folder to load the schedules from.
@@ -310,30 +500,79 @@ class MainWindow():
             messagebox.showerror("Složka nenalezena", "Nebyla nalezena složka s rozvrhy!")
             return
 
-        for file in folder.glob("*.txt"):
+        schedule_index = ScheduleIndex(folder)
+        self.show_loading_errors(schedule_index.refresh())
+        self.schedules += schedule_index.get_entries()
+
+    def get_schedule(self, index: int) -> Optional[Schedule]:
+        """
+        Returns the schedule from the schedule list and loads it if needed.
+
+        The file a schedule is loaded from is remembered, so that only this file gets the changes
+        of the schedule appended to its journal.
+
+        Args:
+            index (int): The index of the schedule.
+
+        Returns:
+            Optional[Schedule]: The schedule or None if it could not be loaded.
+        """
+        schedule = self.schedules[index]
+        if isinstance(schedule, ScheduleEntry):
+            file_path = Path(schedule.file_path)
             try:
-                if file:
-                    with open(file, 'rb') as schedule_file:
-                        schedule = pickle.load(schedule_file)
-                    self.schedules.append(schedule)
-            except (EOFError, pickle.UnpicklingError):
-                messagebox.showerror("Poškozený soubor",
-                                     f"Soubor '{file}' je poškozený a nejde načíst.")
-            except Exception as e: #TODO: Fix this
-                messagebox.showerror("Chyba",
-                                     f"Při načítání rozvrhu ze souboru '{file}' došlo k neočekávané chybě: {e}")
+                schedule = load_schedule(schedule)
+            except Exception as e:
+                self.show_loading_errors([(file_path, e)])
+                return None
+            self.schedule_files[id(schedule)] = file_path
+            self.schedules[index] = schedule
+        return schedule
+
+    def load_all_schedules(self) -> List[Schedule]:
+        """
+        Loads all the schedules of the schedule list.
+
+        The schedules which have not been loaded yet are loaded concurrently and the errors are
+        shown together.
+
+        Returns:
+            List[Schedule]: The schedules which could be loaded.
+        """
+        entry_indexes = {Path(schedule.file_path): index
+                         for index, schedule in enumerate(self.schedules)
+                         if isinstance(schedule, ScheduleEntry)}
+        report = schedule_loader.load_schedules(list(entry_indexes))
+        for file, schedule in report.schedules:
+            self.schedules[entry_indexes[file]] = schedule
+            self.schedule_files[id(schedule)] = file
+        self.show_loading_errors(report.errors)
+        return [schedule for schedule in self.schedules if isinstance(schedule, Schedule)]
+
+    def show_loading_errors(self, errors: List[Tuple[Path, Exception]]) -> None:
+        """
+        Shows the errors of loading of schedule files in one message.
+
+        Args:
+            errors (List[Tuple[Path, Exception]]): The files and their errors.
+        """
+        if errors:
+            messagebox.showerror("Chyba načítání", schedule_loader.format_errors(errors))
 
     def load_extra_schedule(self) -> None:
         """
-        Loads the chosen schedule from a BSON file.
+        Loads the chosen schedule from a TXT or JSON file.
 
         Shows a dialog window and asks for the file. Then saves the schedule to the list of schedules.
         """
         filename = filedialog.askopenfilename(defaultextension=".txt",
-                                              filetypes=[("TXT file", ".txt")])
+                                              filetypes=[("TXT file", ".txt"), ("JSON file", ".json")])
         if filename:
-            with open(filename, 'rb') as file:
-                schedule = pickle.load(file)
+            try:
+                schedule = schedule_loader.load_file(Path(filename))
+            except Exception as e:
+                self.show_loading_errors([(Path(filename), e)])
+                return
             self.schedules.append(schedule)
             self.open_schedule(len(self.schedules)-1)
 
@@ -350,5 +589,9 @@ class MainWindow():
             self.open_schedule(len(self.schedules)-1)
 
     def run(self) -> None:
-        """Launches the application."""
+        """Launches the application and writes the unsaved changes after the window is closed."""
         self.window.mainloop()
+        self.import_executor.shutdown()
+        self.autosave.stop()
+        if self.database is not None:
+            self.database.close()
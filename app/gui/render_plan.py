@@ -0,0 +1,127 @@
+"""Contains the display list of the schedule and the rasterizer executing it."""
+from collections import Counter
+from typing import Iterable
+from typing import NamedTuple
+from typing import Tuple
+from typing import Union
+
+from PIL import Image, ImageDraw
+
+from app.utils import config
+from app.utils import utilities
+from app.gui.font_cache import FontCache
+from app.gui import text_outline
+
+Color = Union[str, Tuple[int, ...]]
+
+class Rectangle(NamedTuple):
+    """Rectangle with a fill and an outline."""
+    box: Tuple[float, float, float, float]
+    fill: Color
+    outline: Color
+    width: int
+
+class Line(NamedTuple):
+    """Straight line."""
+    coordinates: Tuple[float, float, float, float]
+    fill: Color
+    width: int
+
+class Text(NamedTuple):
+    """Text run with a resolved font size."""
+    position: Tuple[float, float]
+    text: str
+    fill: Color
+    font: str
+    size: int
+    anchor: str
+
+class OutlinedText(NamedTuple):
+    """Black text with a white outline centered on the position."""
+    position: Tuple[float, float]
+    text: str
+    font: str
+    size: int
+    outline_width: int
+
+Primitive = Union[Rectangle, Line, Text, OutlinedText]
+
+class LessonPlacement(NamedTuple):
+    """
+    Lesson laid out in the schedule.
+
+    The primitives are in the coordinates of a sprite of the given size, the sprite is placed with
+    the margin around the lesson so that its pixel origin lands on the origin in the image.
+    """
+    origin: Tuple[int, int]
+    margin: int
+    sprite_size: Tuple[int, int]
+    primitives: Tuple[Primitive, ...]
+
+class RenderPlan(NamedTuple):
+    """
+    Display list of the whole schedule.
+
+    The plan does not depend on how it is rasterized, so it can be compared with a previous plan
+    to find out what has to be drawn again.
+    """
+    size: Tuple[int, int]
+    background: Tuple[Primitive, ...]
+    background_geometry: Tuple[Tuple[float, float], Tuple[float, float]]
+    lessons: Tuple[LessonPlacement, ...]
+
+    def diff(self, other: "RenderPlan") -> Tuple[Tuple[LessonPlacement, ...], Tuple[LessonPlacement, ...]]:
+        """
+        Compares the lessons of the plan with the lessons of an older plan.
+
+        Args:
+            other (RenderPlan): The older plan.
+
+        Returns:
+            Tuple[Tuple[LessonPlacement, ...], Tuple[LessonPlacement, ...]]: Placements only in the
+                older plan and placements only in this plan.
+        """
+        old_lessons = Counter(other.lessons)
+        new_lessons = Counter(self.lessons)
+        return (tuple((old_lessons - new_lessons).elements()),
+                tuple((new_lessons - old_lessons).elements()))
+
+class PillowRasterizer():
+    """Executes display lists with Pillow."""
+
+    def __init__(self, fonts: FontCache, outline_mode: utilities.OutlineMode=config.TEXT_OUTLINE_MODE):
+        self.fonts = fonts
+        self.outline_mode = outline_mode
+
+    def rasterize(self, image: Image.Image, primitives: Iterable[Primitive]) -> None:
+        """
+        Draws the primitives to the image in their order.
+
+        Args:
+            image (Image.Image): Image to be drawn to.
+            primitives (Iterable[Primitive]): The primitives.
+
+        Raises:
+            TypeError: If some of the primitives is not known to the rasterizer.
+        """
+        draw = ImageDraw.Draw(image)
+        for primitive in primitives:
+            if isinstance(primitive, Rectangle):
+                draw.rectangle(primitive.box, fill=primitive.fill, outline=primitive.outline, width=primitive.width)
+            elif isinstance(primitive, Line):
+                draw.line(primitive.coordinates, fill=primitive.fill, width=primitive.width)
+            elif isinstance(primitive, Text):
+                draw.text(primitive.position,
+                          text=primitive.text,
+                          fill=primitive.fill,
+                          font=self.fonts.get(primitive.font, primitive.size),
+                          anchor=primitive.anchor)
+            elif isinstance(primitive, OutlinedText):
+                text_outline.draw_outlined_text(draw,
+                                                primitive.position,
+                                                primitive.text,
+                                                self.fonts.get(primitive.font, primitive.size),
+                                                primitive.outline_width,
+                                                self.outline_mode)
+            else:
+                raise TypeError(f"Neznámé grafické primitivum: {primitive!r}")
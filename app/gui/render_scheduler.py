@@ -0,0 +1,225 @@
+"""Contains a class rendering the shown schedule in the background."""
+import tkinter as tk
+import threading
+import queue
+import time
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from PIL import Image
+
+from app.utils import config
+from app.gui.schedule_painter import SchedulePainter
+
+class RenderScheduler():
+    """
+    Renders the shown schedule on a worker thread.
+
+    Requests coming in a quick succession (eg. while the window is being resized) are merged into
+    one. Only the newest request is rendered, requests replaced by a newer one before their
+    rendering started are dropped and images of replaced requests are never shown. Finished
+    images are handed back to the Tk main loop, which polls for them using after().
+
+    Only the region of the image redrawn by the painter is handed back together with its box, the
+    whole image is handed back with no box when its size changes. The regions of replaced
+    requests are kept and handed back before the region of the newest request, so the shown
+    image never misses a change.
+
+    The painter must not be used outside of the scheduler without holding its lock. The schedule
+    is read by the worker under the lock of the schedule, which the main loop holds while changing
+    it. A failed rendering is reported to on_error and the worker goes on with the next request.
+    """
+
+    def __init__(self,
+                 window: tk.Tk,
+                 painter: SchedulePainter,
+                 on_frame: Callable[[Image.Image, Optional[Tuple[int, int, int, int]]], None],
+                 on_error: Callable[[Exception], None],
+                 delay: int=config.RENDER_DEBOUNCE_DELAY):
+        self.window = window
+        self.painter = painter
+        self.on_frame = on_frame
+        self.on_error = on_error
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.pending_request: Optional[Tuple[int, Tuple[int, int]]] = None
+        self.request_time: Optional[float] = None
+        self.failed = False
+        self.frame_size: Optional[Tuple[int, int]] = None
+        self.regions: List[Tuple[Image.Image, Optional[Tuple[int, int, int, int]]]] = []
+        self.timer: Optional[str] = None
+        self.polling = False
+        self.frames: queue.Queue = queue.Queue()
+        self.latencies: Deque[float] = deque(maxlen=config.RENDER_LATENCY_HISTORY)
+        self.closed = False
+        self.worker = threading.Thread(target=self.run_worker, daemon=True)
+        self.worker.start()
+
+    def request(self, size: Tuple[int, int], delay: Optional[int]=None) -> None:
+        """
+        Requests rendering of the schedule in given size.
+
+        The request is submitted to the worker only if no other request comes within the delay.
+        Must be called from the Tk main loop.
+
+        Args:
+            size (Tuple[int, int]): Width and height of the image to be rendered.
+            delay (Optional[int]): Delay in milliseconds. If None, the delay of the scheduler is
+                used.
+        """
+        if self.request_time is None:
+            self.request_time = time.perf_counter()
+        self.generation += 1
+        if self.timer is not None:
+            self.window.after_cancel(self.timer)
+        generation = self.generation
+        self.timer = self.window.after(self.delay if delay is None else delay,
+                                       lambda: self.submit(generation, size))
+
+    def cancel(self) -> None:
+        """Cancels all the requests, so that no image requested so far is shown."""
+        self.generation += 1
+        self.request_time = None
+        if self.timer is not None:
+            self.window.after_cancel(self.timer)
+            self.timer = None
+
+    def submit(self, generation: int, size: Tuple[int, int]) -> None:
+        """
+        Hands the request over to the worker and starts polling for the rendered image.
+
+        Args:
+            generation (int): Number of the request.
+            size (Tuple[int, int]): Width and height of the image to be rendered.
+        """
+        self.timer = None
+        with self.condition:
+            self.pending_request = (generation, size)
+            self.condition.notify()
+        if not self.polling:
+            self.polling = True
+            self.window.after(config.RENDER_POLL_INTERVAL, self.poll)
+
+    def run_worker(self) -> None:
+        """
+        Renders the submitted requests until the scheduler is closed.
+
+        An exception raised by the rendering is handed to the main loop instead of the image, so
+        the worker keeps running.
+        """
+        while True:
+            with self.condition:
+                while self.pending_request is None and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                generation, size = self.pending_request
+                self.pending_request = None
+
+            if generation != self.generation:
+                continue
+            try:
+                image, box = self.render(size)
+            except Exception as e:
+                self.frame_size = None
+                self.frames.put((generation, None, None, e))
+            else:
+                self.frames.put((generation, image, box, None))
+
+    def render(self, size: Tuple[int, int]) -> Tuple[Optional[Image.Image], Optional[Tuple[int, int, int, int]]]:
+        """
+        Renders the schedule in given size.
+
+        Sizes smaller than the minimal size of the viewport are rendered in the minimal size and
+        scaled down, the scaled image is always returned whole.
+
+        Args:
+            size (Tuple[int, int]): Width and height of the image.
+
+        Returns:
+            Tuple[Optional[Image.Image], Optional[Tuple[int, int, int, int]]]: Copy of the redrawn
+                region with its box in the image, copy of the whole image with no box, or no
+                image if nothing has changed since the last rendered image.
+        """
+        viewport_size = (max(size[0], config.MIN_VIEWPORT_SIZE[0]), max(size[1], config.MIN_VIEWPORT_SIZE[1]))
+        with self.lock:
+            self.painter.set_viewport_size(viewport_size)
+            box = self.painter.draw_dirty()
+            whole = size != self.frame_size or size != viewport_size
+            if not whole and box is None:
+                return None, None
+            image = self.painter.get_image()
+            if whole or box == (0, 0, image.width, image.height):
+                image, box = image.copy(), None
+            else:
+                image = image.crop(box)
+        self.frame_size = size
+        if image.size != size and box is None:
+            image = image.resize((max(size[0], 1), max(size[1], 1)), Image.Resampling.LANCZOS)
+        return image, box
+
+    def poll(self) -> None:
+        """
+        Shows the newest rendered image if it has not been replaced by a newer request.
+
+        The regions of replaced requests are kept until the newest one is shown. An error of the
+        newest request is reported only if the previous request did not fail too, so a schedule
+        which cannot be rendered is not reported on every resize of the window.
+        """
+        while not self.frames.empty():
+            generation, image, box, error = self.frames.get()
+            if image is not None:
+                if box is None:
+                    self.regions.clear()
+                self.regions.append((image, box))
+            if generation != self.generation:
+                continue
+            if error is None:
+                self.failed = False
+                for region, region_box in self.regions:
+                    self.on_frame(region, region_box)
+                self.regions.clear()
+                self.latencies.append(time.perf_counter() - self.request_time)
+            elif not self.failed:
+                self.failed = True
+                self.on_error(error)
+            self.request_time = None
+
+        with self.condition:
+            busy = self.pending_request is not None
+        if busy or self.request_time is not None:
+            self.window.after(config.RENDER_POLL_INTERVAL, self.poll)
+        else:
+            self.polling = False
+
+    def get_latency_statistics(self) -> Dict:
+        """
+        Returns statistics of the time from a request to the shown image.
+
+        The latency is measured from the first request that has not been shown yet, so it
+        includes the delay of merged requests.
+
+        Returns:
+            Dict: Number of the measured frames and the last, average and maximal latency in
+                seconds.
+        """
+        if not self.latencies:
+            return {"frames": 0, "last": 0.0, "average": 0.0, "maximum": 0.0}
+        return {"frames": len(self.latencies),
+                "last": self.latencies[-1],
+                "average": sum(self.latencies) / len(self.latencies),
+                "maximum": max(self.latencies)}
+
+    def close(self) -> None:
+        """Cancels the requests and stops the worker."""
+        self.cancel()
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
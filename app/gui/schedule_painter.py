@@ -3,113 +3,293 @@ import math
 from typing import Tuple
 from typing import Dict
 from typing import List
+from typing import Optional
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 
 from app.utils import config
 from app.utils import utilities
+from app.utils.settings_service import SettingsService
+from app.utils.settings_service import get_settings_service
 from app.src.lesson import Lesson
 from app.src.schedule import Schedule
+from app.gui.font_cache import FontCache
+from app.gui.text_fitter import TextFitter
+from app.gui.sprite_cache import SpriteCache
+from app.gui.render_plan import Line
+from app.gui.render_plan import LessonPlacement
+from app.gui.render_plan import OutlinedText
+from app.gui.render_plan import PillowRasterizer
+from app.gui.render_plan import Primitive
+from app.gui.render_plan import Rectangle
+from app.gui.render_plan import RenderPlan
+from app.gui.render_plan import Text
 
 
 class SchedulePainter():
-    """Drawing agent of the schedule."""
-
-    def __init__(self):
-        self.settings = utilities.load_settings(config.SETTINGS_PATH)
-        self.image = Image.new("RGB",
-                               (self.settings["schedule_width"], self.settings["schedule_height"]),
-                               "white")
+    """
+    Drawing agent of the schedule.
+
+    Drawing has two phases. First the schedule and the settings are laid out to a render plan,
+    a display list of primitives with resolved coordinates and font sizes. Then the plan is
+    executed by the rasterizer. The plan is computed again only when the schedule or the settings
+    change and a plan equal to the drawn one is not drawn at all.
+    """
+
+    def __init__(self,
+                 outline_mode: utilities.OutlineMode=config.TEXT_OUTLINE_MODE,
+                 settings_service: Optional[SettingsService]=None,
+                 rasterizer: Optional[PillowRasterizer]=None):
+        self.settings_service = settings_service if settings_service is not None else get_settings_service()
+        self.settings = dict(self.settings_service.get())
+        self.viewport_size = None
+        self.image = Image.new("RGB", self.get_image_size(), "white")
         self.font = self.settings["text_font"]
         self.bold_font = self.settings["text_bold_font"]
+        self.fonts = FontCache()
+        self.text_fitter = TextFitter(self.fonts)
+        self.rasterizer = rasterizer if rasterizer is not None else PillowRasterizer(self.fonts, outline_mode)
+        self.background = None
+        self.background_primitives = None
+        self.sprites = SpriteCache()
+        self.cached_plan = None
+        self.cached_plan_key = None
+        self.plan = None
+        self.lesson_boxes = None
         self.active_schedule = None
 
     def update(self) -> None:
-        """Updates the settings of the schedule."""
-        self.settings = utilities.load_settings(config.SETTINGS_PATH)
+        """Updates the settings of the schedule from the settings service."""
+        self.settings = dict(self.settings_service.get())
+        if (self.font, self.bold_font) != (self.settings["text_font"], self.settings["text_bold_font"]):
+            self.fonts.clear()
+            self.text_fitter.clear()
         self.font = self.settings["text_font"]
         self.bold_font = self.settings["text_bold_font"]
         self.update_image()
 
     def update_image(self) -> None:
         """Updates image of the painter."""
-        self.image = Image.new("RGB",
-                               (self.settings["schedule_width"], self.settings["schedule_height"]),
-                               "white")
+        self.image = Image.new("RGB", self.get_image_size(), "white")
+        self.plan = None
+        self.lesson_boxes = None
+
+    def set_viewport_size(self, size: Optional[Tuple[int, int]]) -> None:
+        """
+        Sets the size the schedule is laid out and drawn in.
+
+        The painter draws directly in the size of the viewport instead of the size of the
+        schedule set in the settings, so the image does not have to be resized to be shown.
+
+        Args:
+            size (Optional[Tuple[int, int]]): Width and height of the viewport. If None, the
+                size set in the settings is used.
+        """
+        self.viewport_size = size
+        if self.image.size != self.get_image_size():
+            self.update_image()
+
+    def get_image_size(self) -> Tuple[int, int]:
+        """
+        Returns the size of the drawn image.
+
+        Returns:
+            Tuple[int, int]: Size of the viewport if it is set, otherwise the size of the schedule
+                set in the settings.
+        """
+        if self.viewport_size is not None:
+            return self.viewport_size
+        return (self.settings["schedule_width"], self.settings["schedule_height"])
 
     def change_schedule(self, schedule: Schedule) -> None:
         """
         Changes the active schedule.
-        
+
         Args:
             schedule (Schedule): New schedule.
         """
         self.active_schedule = schedule
+        self.cached_plan = None
+        self.plan = None
+        self.lesson_boxes = None
 
     def draw(self) -> None:
         """
         Draws the schedule to the image.
-        
-        Based on the set orientation draws the horizontal or vertical schedule.
+
+        Nothing is drawn if the plan of the schedule is the same as the plan drawn the last time.
         """
-        draw = ImageDraw.Draw(self.image)
-        draw.rectangle((0, 0, self.settings["schedule_width"], self.settings["schedule_height"]),
-                       fill="white")
+        plan = self.compute_plan()
+        if plan == self.plan and self.image.size == plan.size:
+            return
+        self.render(plan)
 
-        if self.settings["schedule_orientation"] == "horizontal":
-            self.draw_horizontal(draw)
-        elif self.settings["schedule_orientation"] == "vertical":
-            self.draw_vertical(draw)
-        else:
-            raise ValueError
+    def draw_dirty(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Redraws only the lessons changed in the plan since the last draw.
+
+        Restores the places where the removed and the added lessons are drawn from the background.
+        Then draws there all the lessons reaching into this region in the same order as draw
+        does. If the background changed since the last draw, the whole schedule is drawn.
 
-    def draw_horizontal(self, draw: ImageDraw.ImageDraw) -> None:
+        Returns:
+            Optional[Tuple[int, int, int, int]]: The redrawn rectangle of the image or None if
+                nothing has changed.
+        """
+        plan = self.compute_plan()
+        if (self.plan is None
+            or plan.background != self.plan.background
+            or self.image.size != plan.size):
+            self.render(plan)
+            return (0, 0, self.image.width, self.image.height)
+        if plan == self.plan:
+            return None
+
+        removed, added = plan.diff(self.plan)
+        if not removed and not added:
+            self.render(plan)
+            return (0, 0, self.image.width, self.image.height)
+
+        dirty_boxes = [self.lesson_boxes[placement] for placement in removed]
+        sprites = []
+        lesson_boxes = {}
+        for placement in plan.lessons:
+            sprite_image, position = self.get_lesson_sprite(placement)
+            box = get_sprite_box(sprite_image, position)
+            sprites.append((sprite_image, position, box))
+            lesson_boxes[placement] = box
+        dirty_boxes += [lesson_boxes[placement] for placement in added]
+        self.plan = plan
+        self.lesson_boxes = lesson_boxes
+
+        dirty_box = (max(min(box[0] for box in dirty_boxes), 0),
+                     max(min(box[1] for box in dirty_boxes), 0),
+                     min(max(box[2] for box in dirty_boxes), self.image.width),
+                     min(max(box[3] for box in dirty_boxes), self.image.height))
+        if dirty_box[0] >= dirty_box[2] or dirty_box[1] >= dirty_box[3]:
+            return None
+        region = self.background.crop(dirty_box)
+        for sprite_image, position, box in sprites:
+            if (box[0] < dirty_box[2] and box[2] > dirty_box[0]
+                and box[1] < dirty_box[3] and box[3] > dirty_box[1]):
+                region.paste(sprite_image, (position[0] - dirty_box[0], position[1] - dirty_box[1]), sprite_image)
+        self.image.paste(region, dirty_box[:2])
+        return dirty_box
+
+    def render(self, plan: RenderPlan) -> None:
         """
-        Draws the schedule horizontally.
+        Draws the whole plan to the image.
 
-        Draws the background of the schedule. Then draws the lessons of the schedule that take place
-        in the days that are set in the settings to be shown. If a lesson, partially or wholly,
-        takes place outside of the set times of the schedule, only the part of the lesson that
-        protrude into the set times is drawn.
+        Copies the cached background layer to the image and draws the lessons over it. The
+        background is rasterized again only if its primitives changed. Remembers where every
+        lesson was drawn.
 
         Args:
-            draw (ImageDraw.ImageDraw): Drawing object.
+            plan (RenderPlan): The plan to be drawn.
+        """
+        if (self.background is None
+            or self.background.size != plan.size
+            or self.background_primitives != plan.background):
+            self.background = Image.new("RGB", plan.size, "white")
+            self.rasterizer.rasterize(self.background, plan.background)
+            self.background_primitives = plan.background
+        if self.image.size != plan.size:
+            self.image = Image.new("RGB", plan.size, "white")
+        self.image.paste(self.background)
+
+        self.lesson_boxes = {}
+        for placement in plan.lessons:
+            sprite_image, position = self.get_lesson_sprite(placement)
+            self.image.paste(sprite_image, position, sprite_image)
+            self.lesson_boxes[placement] = get_sprite_box(sprite_image, position)
+        self.plan = plan
+
+    def get_plan_key(self) -> Tuple:
+        """
+        Returns the key of the plan of the active schedule.
+
+        The key contains the settings, the name of the schedule and the key of its lessons, so
+        comparing it is much cheaper than laying out the schedule.
+
+        Returns:
+            Tuple: The key of the plan.
+        """
+        return (self.get_image_size(),
+                tuple(self.settings.items()),
+                self.font,
+                self.bold_font,
+                self.active_schedule.name,
+                self.active_schedule.get_lessons_key())
+
+    def compute_plan(self) -> RenderPlan:
+        """
+        Lays out the active schedule to a render plan.
+
+        The last computed plan is returned if its key has not changed since it was computed. The
+        schedule is locked while it is laid out, so it can be drawn on another thread than the one
+        changing it.
+
+        Returns:
+            RenderPlan: The plan of the schedule.
+        """
+        with self.active_schedule.lock:
+            plan_key = self.get_plan_key()
+            if self.cached_plan is not None and plan_key == self.cached_plan_key:
+                return self.cached_plan
+
+            if self.settings["schedule_orientation"] == "horizontal":
+                background, background_geometry = self.compute_horizontal_background()
+                layout = self.compute_horizontal_layout(background_geometry)
+            elif self.settings["schedule_orientation"] == "vertical":
+                background, background_geometry = self.compute_vertical_background()
+                layout = self.compute_vertical_layout(background_geometry)
+            else:
+                raise ValueError
+
+            general_size = int(math.sqrt(self.get_image_size()[0]**2 + self.get_image_size()[1]**2))
+            lessons = tuple(self.compute_lesson_placement(lesson, coordinates, dimensions, general_size)
+                            for lesson, coordinates, dimensions in layout)
+            self.cached_plan = RenderPlan(self.get_image_size(), background, background_geometry, lessons)
+            self.cached_plan_key = plan_key
+            return self.cached_plan
+
+    def compute_horizontal_layout(self,
+                                  background_geometry: Tuple[Tuple[float, float], Tuple[float, float]]
+                                  ) -> List[Tuple[Lesson, Tuple[float, float], Tuple[float, float]]]:
         """
-        base_origin, cell_dimension = self.draw_horizontal_background(draw)
+        Computes the layout of the horizontal schedule.
+
+        Places the lessons of the schedule that take place in the days that are set in the settings
+        to be shown. If a lesson, partially or wholly, takes place outside of the set times of the
+        schedule, only the part of the lesson that protrude into the set times is placed.
+        Overlapping lessons split the row of their day.
 
-        hours_in_day = (int(self.settings["day_end"][:2])*60
-                        + int(self.settings["day_end"][3:5])
-                        - int(self.settings["day_start"][:2])*60
-                        - int(self.settings["day_start"][3:5]))
-        hours_in_day = hours_in_day / 60
+        Args:
+            background_geometry (Tuple[Tuple[float, float], Tuple[float, float]]): Origin of the
+                base of the schedule and dimensions of its cells.
 
-        valid_lessons = [lssn for lssn in self.active_schedule.lessons if self.settings["days_in_week"][lssn.day.value] == "1"]
-        for lesson in valid_lessons:
-            try:
-                collision_bool = lesson.has_collision(valid_lessons)
-            except Exception as e:
-                print(f"Chyba: {e}")
-                collision_bool = False, False
+        Returns:
+            List[Tuple[Lesson, Tuple[float, float], Tuple[float, float]]]: The lessons to be
+                drawn with the coordinates of their upper left corners and their dimensions.
+        """
+        layout = []
+        base_origin, cell_dimension = background_geometry
+        day_start, day_end = self.compute_day_range()
+        hours_in_day = (day_end - day_start) / 60
+        days_before = self.compute_days_before()
 
+        for lesson, (column, column_count) in self.get_shown_lessons():
             lesson_dimensions = [0, 0]
             lesson_dimensions[1] = cell_dimension[1]
-            days_before = sum((int(char) for char in self.settings["days_in_week"][:lesson.day.value]))
-            y_offset = days_before * cell_dimension[1]
-            if collision_bool[0]:
-                lesson_dimensions[1] = int(cell_dimension[1]/2)
-                if not collision_bool[1]:
-                    y_offset += lesson_dimensions[1]
-
-            time_delta = lesson.start_time.hour * 60 \
-                         + lesson.start_time.minute \
-                         - int(self.settings["day_start"][:2])*60 \
-                         - int(self.settings["day_start"][3:5])
+            y_offset = days_before[lesson.day.value] * cell_dimension[1]
+            if column_count > 1:
+                lesson_dimensions[1] = int(cell_dimension[1]/column_count)
+                y_offset += column*lesson_dimensions[1]
+
+            time_delta = lesson.start_minute - day_start
             x_offset = time_delta / 60 * cell_dimension[0]
 
-            duration = (lesson.end_time.hour*60
-                        + lesson.end_time.minute
-                        - lesson.start_time.hour*60
-                        - lesson.start_time.minute)
+            duration = lesson.end_minute - lesson.start_minute
             lesson_dimensions[0] = int(cell_dimension[0]*duration/60)
 
 
@@ -119,22 +299,61 @@ class SchedulePainter():
                     x_offset = 0
                 elif x_offset + lesson_dimensions[0] > hours_in_day * cell_dimension[0]:
                     lesson_dimensions[0] = hours_in_day * cell_dimension[0] - x_offset
-                self.draw_lesson_horizontal(draw,
-                                            lesson,
-                                            (base_origin[0] + x_offset, base_origin[1] + y_offset),
-                                            (lesson_dimensions[0], lesson_dimensions[1]))
+                layout.append((lesson,
+                               (base_origin[0] + x_offset, base_origin[1] + y_offset),
+                               (lesson_dimensions[0], lesson_dimensions[1])))
+        return layout
+
+    def get_shown_lessons(self) -> List[Tuple[Lesson, Tuple[int, int]]]:
+        """
+        Returns the lessons of the days and the times set to be shown with their columns.
+
+        The lessons are taken from the indexes of the days, so they are ordered by the days and
+        their start and the lessons of the hidden days are not visited. Lessons outside the shown
+        times are left out.
+
+        Returns:
+            List[Tuple[Lesson, Tuple[int, int]]]: The lessons with their column index and column
+                count.
+        """
+        shown_lessons = []
+        day_start, day_end = self.compute_day_range()
+        for day in utilities.Day:
+            if self.settings["days_in_week"][day.value] == "1":
+                shown_lessons += self.active_schedule.get_day_layout(day, day_start, day_end)
+        return shown_lessons
+
+    def compute_day_range(self) -> Tuple[int, int]:
+        """
+        Returns the set start and end of the day.
+
+        Returns:
+            Tuple[int, int]: Start and end of the day in minutes after midnight.
+        """
+        day_start = int(self.settings["day_start"][:2])*60 + int(self.settings["day_start"][3:5])
+        day_end = int(self.settings["day_end"][:2])*60 + int(self.settings["day_end"][3:5])
+        return day_start, day_end
+
+    def compute_days_before(self) -> List[int]:
+        """
+        Returns the numbers of the shown days preceding every day of the week.
+
+        Returns:
+            List[int]: The numbers indexed by the values of the days.
+        """
+        return [self.settings["days_in_week"][:day.value].count("1") for day in utilities.Day]
 
     def compute_schedule_layout_dimensions(self) -> Dict:
         """
         Computes the dimensions of layout of the background of the schedule.
-        
+
         Returns:
             Dict: The layout dimensions.
         """
-        general_size = int(math.sqrt(self.settings["schedule_height"]**2 + self.settings["schedule_width"]**2))
+        general_size = int(math.sqrt(self.get_image_size()[0]**2 + self.get_image_size()[1]**2))
         layout_dimensions = {
             "line_width": int(general_size * config.BG_LINE_WIDTH_FACTOR),
-            "text_size": int(general_size * config.BG_TEXT_SIZE_FACTOR * self.settings["text_scale"]),
+            "text_size": max(int(general_size * config.BG_TEXT_SIZE_FACTOR * self.settings["text_scale"]), 1),
             "text_padding": int(general_size * config.BG_TEXT_PADDING_FACTOR * self.settings["text_scale"]),
             "schedule_padding": int(general_size * config.BG_SCHEDULE_PADDING_FACTOR),
             "side_offset": int(general_size * config.BG_SIDE_OFFSET_FACTOR),
@@ -143,20 +362,24 @@ class SchedulePainter():
         }
         return layout_dimensions
 
-    def draw_horizontal_background(self, draw: ImageDraw.ImageDraw) -> Tuple[Tuple[int, int], Tuple[float, float]]:
+    def compute_horizontal_background(self) -> Tuple[Tuple[Primitive, ...],
+                                                     Tuple[Tuple[int, int], Tuple[float, float]]]:
         """
-        Draws background lines and time and day labels to the horizontal schedule.
+        Lays out background lines and time and day labels of the horizontal schedule.
 
-        Draws the name of the schedule to the top right-hand corner. Draws vertical lines and
-        time labels. Draws horizontal lines with day labels.
+        Places the name of the schedule to the top right-hand corner. Places vertical lines and
+        time labels. Places horizontal lines with day labels.
 
         Returns:
-            Tuple[Tuple[int, int], Tuple[float, float]]: Tuple of two tuples. The first tuple
+            Tuple[Tuple[Primitive, ...], Tuple[Tuple[int, int], Tuple[float, float]]]: The
+                primitives of the background and a tuple of two tuples. The first tuple
                 contains coordinates of the origin of the base of the schedule, ie. rectangle where
                 the actual lessons are to be drawn. The second tuple contains width and height of
                 the cells of the schedule.
         """
         lay_dim = self.compute_schedule_layout_dimensions()
+        image_size = self.get_image_size()
+        primitives = []
 
         start_hour = int(self.settings["day_start"][0:2])
         end_hour = int(self.settings["day_end"][0:2])
@@ -164,11 +387,11 @@ class SchedulePainter():
             end_hour += 24
         column_number = end_hour - start_hour
 
-        cell_width = (self.settings["schedule_width"]
+        cell_width = (image_size[0]
                       - 2*lay_dim["schedule_padding"]
                       - lay_dim["left_side_offset"]
                       - lay_dim["side_offset"])/float(column_number)
-        cell_height = (self.settings["schedule_height"]
+        cell_height = (image_size[1]
                        - 2*lay_dim["schedule_padding"]
                        - lay_dim["text_size"]
                        - lay_dim["text_padding"]
@@ -179,161 +402,226 @@ class SchedulePainter():
                         + lay_dim["text_padding"]
                         + lay_dim["side_offset"]))
 
-        draw.text((lay_dim["schedule_padding"], lay_dim["schedule_padding"]),
-                  text=self.active_schedule.name,
-                  fill="black",
-                  font=ImageFont.truetype(self.bold_font, lay_dim["text_size"]),
-                  anchor="lt")
+        primitives.append(Text((lay_dim["schedule_padding"], lay_dim["schedule_padding"]),
+                               self.active_schedule.name,
+                               "black",
+                               self.bold_font,
+                               lay_dim["text_size"],
+                               "lt"))
 
         for increment, hour in enumerate(f"{i%24}:00" for i in range(start_hour, end_hour + 1)):
-            coords = [lay_dim["schedule_padding"] + lay_dim["left_side_offset"] + increment*cell_width,
+            coords = (lay_dim["schedule_padding"] + lay_dim["left_side_offset"] + increment*cell_width,
                       lay_dim["schedule_padding"] + lay_dim["text_size"] + lay_dim["text_padding"],
                       lay_dim["schedule_padding"] + lay_dim["left_side_offset"] + increment*cell_width,
-                      self.settings["schedule_height"] - lay_dim["schedule_padding"]]
-            draw.line(coords, fill="lightgrey", width=lay_dim["line_width"])
-            draw.text((coords[0],
-                       lay_dim["schedule_padding"] + lay_dim["text_size"]/2),
-                       text=hour, fill="black",
-                       font=ImageFont.truetype(self.font, lay_dim["text_size"]),
-                       anchor="mm")
+                      image_size[1] - lay_dim["schedule_padding"])
+            primitives.append(Line(coords, "lightgrey", lay_dim["line_width"]))
+            primitives.append(Text((coords[0], lay_dim["schedule_padding"] + lay_dim["text_size"]/2),
+                                   hour,
+                                   "black",
+                                   self.font,
+                                   lay_dim["text_size"],
+                                   "mm"))
 
         days_in_week = ["Pondělí", "Úterý", "Středa", "Čtvrtek", "Pátek", "Sobota", "Neděle"]
-        selected_days = (day for char, day in zip(self.settings["days_in_week"], days_in_week) if char == "1")
-        for increment, day in enumerate(selected_days):
-            coords = [lay_dim["schedule_padding"],
-                      (lay_dim["schedule_padding"]
-                      + lay_dim["text_size"]
-                      + lay_dim["text_padding"]
-                      + lay_dim["side_offset"]
-                      + increment*cell_height),
-                      self.settings["schedule_width"] - lay_dim["schedule_padding"],
-                      (lay_dim["schedule_padding"]
-                      + lay_dim["text_size"]
-                      + lay_dim["text_padding"]
-                      + lay_dim["side_offset"]
-                      + increment*cell_height)]
-            draw.line(coords, fill="lightgrey", width=lay_dim["line_width"])
-            draw.text((coords[0], coords[1] + cell_height/2),
-                      text=day,
-                      fill="black",
-                      font=ImageFont.truetype(self.font, lay_dim["text_size"]),
-                      anchor="lm")
-        increment += 1
-        coords[1] = (lay_dim["schedule_padding"]
-                     + lay_dim["text_size"]
-                     + lay_dim["text_padding"]
-                     + lay_dim["side_offset"]
-                     + increment*cell_height)
-        coords[3] = coords[1]
-        draw.line(coords, fill="lightgrey", width=lay_dim["line_width"])
-
-        return (base_origin, (cell_width, cell_height))
-
-    def draw_lesson_horizontal(self,
-                               draw: ImageDraw.ImageDraw,
-                               lesson: Lesson,
-                               coordinates: Tuple[int, int],
-                               dimensions: Tuple[int, int]) -> None:
-        """
-        Draws a lesson horizontally on given coordinates with given width and height.
+        selected_days = [day for char, day in zip(self.settings["days_in_week"], days_in_week) if char == "1"]
+        for increment in range(len(selected_days) + 1):
+            y = (lay_dim["schedule_padding"]
+                 + lay_dim["text_size"]
+                 + lay_dim["text_padding"]
+                 + lay_dim["side_offset"]
+                 + increment*cell_height)
+            coords = (lay_dim["schedule_padding"], y, image_size[0] - lay_dim["schedule_padding"], y)
+            primitives.append(Line(coords, "lightgrey", lay_dim["line_width"]))
+            if increment < len(selected_days):
+                primitives.append(Text((coords[0], coords[1] + cell_height/2),
+                                       selected_days[increment],
+                                       "black",
+                                       self.font,
+                                       lay_dim["text_size"],
+                                       "lm"))
+
+        return tuple(primitives), (base_origin, (cell_width, cell_height))
+
+    def compute_lesson_placement(self,
+                                 lesson: Lesson,
+                                 coordinates: Tuple[float, float],
+                                 dimensions: Tuple[float, float],
+                                 general_size: int) -> LessonPlacement:
+        """
+        Lays out a lesson to the primitives of its sprite.
+
+        The sprite has a margin around the lesson, so that texts protruding out of the lesson are
+        kept. The lesson is placed in the sprite with the same subpixel offset it has in the image.
+
+        Args:
+            lesson (Lesson): Lesson to be laid out.
+            coordinates (Tuple[float, float]): Coordinates of the upper left corner of the lesson.
+            dimensions (Tuple[float, float]): Width and height of the lesson.
+            general_size (int): Length of the diagonal of the image.
+
+        Returns:
+            LessonPlacement: The placement of the lesson.
+        """
+        origin = (math.floor(coordinates[0]), math.floor(coordinates[1]))
+        subpixel_offset = (coordinates[0] - origin[0], coordinates[1] - origin[1])
+        margin = int(max(dimensions)
+                     * config.LSSN_UPPER_PART_RATIO
+                     * config.LSSN_NAME_TEXT_RATIO
+                     * (1 + config.LSSN_TEXT_OUTLINE_WIDTH_FACTOR)) + 2
+        sprite_size = (int(subpixel_offset[0] + dimensions[0]) + 1 + 2*margin,
+                       int(subpixel_offset[1] + dimensions[1]) + 1 + 2*margin)
+        sprite_coordinates = (margin + subpixel_offset[0], margin + subpixel_offset[1])
+        if self.settings["schedule_orientation"] == "horizontal":
+            primitives = self.compute_lesson_horizontal(lesson, sprite_coordinates, dimensions, general_size)
+        else:
+            primitives = self.compute_lesson_vertical(lesson, sprite_coordinates, dimensions, general_size)
+        return LessonPlacement(origin, margin, sprite_size, primitives)
+
+    def get_lesson_sprite(self, placement: LessonPlacement) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Returns the rendered lesson and the position where it is to be pasted.
+
+        The lesson is rendered to a sprite only if a lesson with the same primitives has not been
+        rendered before. Otherwise the cached sprite is used.
+
+        Args:
+            placement (LessonPlacement): The placement of the lesson.
+
+        Returns:
+            Tuple[Image.Image, Tuple[int, int]]: The sprite and the coordinates of its upper left
+                corner in the image.
+        """
+        key = (placement.margin, placement.sprite_size, placement.primitives, self.rasterizer.outline_mode)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.render_lesson(placement)
+            self.sprites.put(key, sprite)
+
+        sprite_image, sprite_offset = sprite
+        return sprite_image, (placement.origin[0] + sprite_offset[0], placement.origin[1] + sprite_offset[1])
+
+    def render_lesson(self, placement: LessonPlacement) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Renders the lesson to a transparent sprite cropped to its visible part.
+
+        Args:
+            placement (LessonPlacement): The placement of the lesson.
+
+        Returns:
+            Tuple[Image.Image, Tuple[int, int]]: The sprite and its offset from the pixel the
+                lesson starts in.
+        """
+        sprite = Image.new("RGBA", placement.sprite_size, (0, 0, 0, 0))
+        self.rasterizer.rasterize(sprite, placement.primitives)
+
+        visible_box = sprite.getchannel("A").getbbox()
+        if visible_box is None:
+            return sprite.crop((0, 0, 1, 1)), (0, 0)
+        return sprite.crop(visible_box), (visible_box[0] - placement.margin, visible_box[1] - placement.margin)
+
+    def compute_lesson_horizontal(self,
+                                  lesson: Lesson,
+                                  coordinates: Tuple[float, float],
+                                  dimensions: Tuple[float, float],
+                                  general_size: int) -> Tuple[Primitive, ...]:
+        """
+        Lays out a lesson horizontally on given coordinates with given width and height.
 
         Args:
-            draw (ImageDraw): Agent to be drawn with.
-            lesson (Lesson): Lesson to be drawn.
-            coordinates (Tuple[int, int]): Coordinates where the upper right corner is to be drawn.
-            dimensions (Tuple[int, int]): Width and height of the lesson.
+            lesson (Lesson): Lesson to be laid out.
+            coordinates (Tuple[float, float]): Coordinates where the upper right corner is to be drawn.
+            dimensions (Tuple[float, float]): Width and height of the lesson.
+            general_size (int): Length of the diagonal of the image.
+
+        Returns:
+            Tuple[Primitive, ...]: The primitives of the lesson.
         """
-        general_size = int(math.sqrt(self.settings["schedule_height"]**2 + self.settings["schedule_width"]**2))
         lay_dim = {"outline_width": int(general_size * config.LSSN_OUTLINE_WIDTH_FACTOR),
                    "text_size": int(dimensions[1]*config.LSSN_UPPER_PART_RATIO*config.LSSN_NAME_TEXT_RATIO),
                    "text_padding": int(general_size*config.LSSN_TEXT_PADDING_FACTOR)}
         lay_dim["text_outline_width"] = int(max(lay_dim["text_size"]*config.LSSN_TEXT_OUTLINE_WIDTH_FACTOR, 1))
 
         darker_color = tuple(int(component*config.COLOR_DARKENING_FACTOR) for component in lesson.color)
-        draw.rectangle([coordinates[0], coordinates[1], coordinates[0] + dimensions[0], coordinates[1] + dimensions[1]],
-                       fill=lesson.color,
-                       outline=darker_color,
-                       width=lay_dim["outline_width"])
-        draw.rectangle([coordinates[0], coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1], coordinates[0] + dimensions[0], coordinates[1] + dimensions[1]],
-                       fill="white",
-                       outline=lesson.color,
-                       width=lay_dim["outline_width"])
-        draw.line([coordinates[0]+lay_dim["outline_width"],
-                   coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1] + (lay_dim["outline_width"]-1)//2,
-                   coordinates[0] + dimensions[0] - lay_dim["outline_width"],
-                   coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1] + (lay_dim["outline_width"]-1)//2],
-                  fill="white",
-                  width=lay_dim["outline_width"])
-
-        text_font = ImageFont.truetype(self.font, max(lay_dim["text_size"], 1))
-        while text_font.getlength(lesson.name) > dimensions[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"] and lay_dim["text_size"] > 1:
-            lay_dim["text_size"] -= 1
-            text_font = ImageFont.truetype(self.font, lay_dim["text_size"])
-
-        mid_x = coordinates[0] + dimensions[0]/2
-        mid_y = coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1]/2
-        for dx in range(-lay_dim["text_outline_width"], lay_dim["text_outline_width"] + 1):
-            for dy in range(-lay_dim["text_outline_width"], lay_dim["text_outline_width"] + 1):
-                draw.text((mid_x + dx, mid_y + dy),
-                          lesson.name,
-                          fill="white",
-                          font=text_font,
-                          anchor="mm")
-        draw.text((mid_x, mid_y),
-                  lesson.name,
-                  fill="black",
-                  font=text_font,
-                  anchor="mm")
+        primitives = [
+            Rectangle((coordinates[0], coordinates[1], coordinates[0] + dimensions[0], coordinates[1] + dimensions[1]),
+                      lesson.color,
+                      darker_color,
+                      lay_dim["outline_width"]),
+            Rectangle((coordinates[0], coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1], coordinates[0] + dimensions[0], coordinates[1] + dimensions[1]),
+                      "white",
+                      lesson.color,
+                      lay_dim["outline_width"]),
+            Line((coordinates[0]+lay_dim["outline_width"],
+                  coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1] + (lay_dim["outline_width"]-1)//2,
+                  coordinates[0] + dimensions[0] - lay_dim["outline_width"],
+                  coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1] + (lay_dim["outline_width"]-1)//2),
+                 "white",
+                 lay_dim["outline_width"])]
+
+        text_width = dimensions[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"]
+        lay_dim["text_size"] = self.text_fitter.fit(self.font, (lesson.name,), lay_dim["text_size"], text_width)
+        primitives.append(OutlinedText((coordinates[0] + dimensions[0]/2, coordinates[1] + config.LSSN_UPPER_PART_RATIO*dimensions[1]/2),
+                                       lesson.name,
+                                       self.font,
+                                       lay_dim["text_size"],
+                                       lay_dim["text_outline_width"]))
         lay_dim["text_size"] = int(dimensions[1]*(1-config.LSSN_UPPER_PART_RATIO)*config.LSSN_INFO_TEXT_RATIO)
-        text_font = ImageFont.truetype(self.font, max(1, lay_dim["text_size"]))
-        while text_font.getlength(lesson.instructor + "  " + lesson.place) > dimensions[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"] and lay_dim["text_size"] > 1:
-            lay_dim["text_size"] -= 1
-            text_font = ImageFont.truetype(self.font, lay_dim["text_size"])
-        draw.text((coordinates[0] + lay_dim["outline_width"] + lay_dim["text_padding"],
-                   coordinates[1] + (1 + config.LSSN_UPPER_PART_RATIO)/2*dimensions[1] - lay_dim["outline_width"]/2),
-                   text=lesson.instructor,
-                   font=text_font,
-                   fill="black",
-                   anchor="lm")
-        draw.text((coordinates[0] + dimensions[0] - lay_dim["outline_width"] - lay_dim["text_padding"],
-                   coordinates[1] + (1 + config.LSSN_UPPER_PART_RATIO)/2*dimensions[1] - lay_dim["outline_width"]/2),
-                   text=lesson.place,
-                   font=text_font,
-                   fill="black",
-                   anchor="rm")
-
-    def draw_vertical(self, draw: ImageDraw.ImageDraw) -> None:
-        """
-        Draws the schedule vertically.
-
-        Draws the background of the schedule. Then draws the lessons of the schedule that take place
-        in the days that are set in the settings to be shown. If a lesson, partially or wholly,
-        takes place outside of the set times of the schedule, only the part of the lesson that
-        protrude into the set times is drawn.
+        lay_dim["text_size"] = self.text_fitter.fit(self.font,
+                                                    (lesson.instructor + "  " + lesson.place,),
+                                                    lay_dim["text_size"],
+                                                    text_width)
+        primitives.append(Text((coordinates[0] + lay_dim["outline_width"] + lay_dim["text_padding"],
+                                coordinates[1] + (1 + config.LSSN_UPPER_PART_RATIO)/2*dimensions[1] - lay_dim["outline_width"]/2),
+                               lesson.instructor,
+                               "black",
+                               self.font,
+                               lay_dim["text_size"],
+                               "lm"))
+        primitives.append(Text((coordinates[0] + dimensions[0] - lay_dim["outline_width"] - lay_dim["text_padding"],
+                                coordinates[1] + (1 + config.LSSN_UPPER_PART_RATIO)/2*dimensions[1] - lay_dim["outline_width"]/2),
+                               lesson.place,
+                               "black",
+                               self.font,
+                               lay_dim["text_size"],
+                               "rm"))
+        return tuple(primitives)
+
+    def compute_vertical_layout(self,
+                                background_geometry: Tuple[Tuple[float, float], Tuple[float, float]]
+                                ) -> List[Tuple[Lesson, Tuple[float, float], Tuple[float, float]]]:
+        """
+        Computes the layout of the vertical schedule.
+
+        Places the lessons of the schedule that take place in the days that are set in the settings
+        to be shown. If a lesson, partially or wholly, takes place outside of the set times of the
+        schedule, only the part of the lesson that protrude into the set times is placed.
+        Overlapping lessons split the column of their day.
 
         Args:
-            draw (ImageDraw.ImageDraw): Drawing object.
-        """
-        base_origin, cell_dimension = self.draw_vertical_background(draw)
+            background_geometry (Tuple[Tuple[float, float], Tuple[float, float]]): Origin of the
+                base of the schedule and dimensions of its cells.
 
-        hours_in_day = int(self.settings["day_end"][:2])*60 \
-                       + int(self.settings["day_end"][3:5]) \
-                       - int(self.settings["day_start"][:2])*60 \
-                       - int(self.settings["day_start"][3:5])
-        hours_in_day = hours_in_day / 60
+        Returns:
+            List[Tuple[Lesson, Tuple[float, float], Tuple[float, float]]]: The lessons to be
+                drawn with the coordinates of their upper left corners and their dimensions.
+        """
+        layout = []
+        base_origin, cell_dimension = background_geometry
+        day_start, day_end = self.compute_day_range()
+        hours_in_day = (day_end - day_start) / 60
+        days_before = self.compute_days_before()
 
-        valid_lessons = (lssn for lssn in self.active_schedule.lessons if self.settings["days_in_week"][lssn.day.value] == "1" )
-        for lesson in valid_lessons:
-            time_delta = lesson.start_time.hour * 60 \
-                        + lesson.start_time.minute \
-                        - int(self.settings["day_start"][:2])*60 \
-                        - int(self.settings["day_start"][3:5])
-            days_before = sum((int(char) for char in self.settings["days_in_week"][:lesson.day.value]))
+        for lesson, (column, column_count) in self.get_shown_lessons():
+            time_delta = lesson.start_minute - day_start
 
-            duration = lesson.end_time.hour * 60 + lesson.end_time.minute - lesson.start_time.hour * 60 - lesson.start_time.minute
+            duration = lesson.end_minute - lesson.start_minute
             lesson_height = int(cell_dimension[1]*duration/60.0)
 
-            x_offset = days_before * cell_dimension[0]
+            lesson_width = cell_dimension[0]
+            x_offset = days_before[lesson.day.value] * cell_dimension[0]
+            if column_count > 1:
+                lesson_width = int(cell_dimension[0]/column_count)
+                x_offset += column*lesson_width
             y_offset = int(time_delta / 60 * cell_dimension[1])
             if y_offset + lesson_height > 0 and y_offset < hours_in_day * cell_dimension[1]:
                 if y_offset < 0:
@@ -341,46 +629,51 @@ class SchedulePainter():
                     y_offset = 0
                 elif y_offset + lesson_height > hours_in_day * cell_dimension[1]:
                     lesson_height = hours_in_day * cell_dimension[1] - y_offset
-                self.draw_lesson_vertical(draw,
-                                          lesson,
-                                          (base_origin[0] + x_offset, base_origin[1] + y_offset),
-                                          (cell_dimension[0], lesson_height))
+                layout.append((lesson,
+                               (base_origin[0] + x_offset, base_origin[1] + y_offset),
+                               (lesson_width, lesson_height)))
+        return layout
 
-    def draw_vertical_background(self, draw: ImageDraw.ImageDraw) -> Tuple[Tuple[int, int], Tuple[float, float]]:
+    def compute_vertical_background(self) -> Tuple[Tuple[Primitive, ...],
+                                                   Tuple[Tuple[int, int], Tuple[float, float]]]:
         """
-        Draws background lines and time and day labels of the vertical schedule.
+        Lays out background lines and time and day labels of the vertical schedule.
 
-        Draws the name of the schedule to the top right-hand corner. Then draws horizontal lines and
-        time labels. Finally it draws vertical lines and day labels.
+        Places the name of the schedule to the top right-hand corner. Then places horizontal lines
+        and time labels. Finally it places vertical lines and day labels.
 
         Returns:
-            Tuple[Tuple[int, int], Tuple[float, float]]: Tuple of two tuples. The first tuple
+            Tuple[Tuple[Primitive, ...], Tuple[Tuple[int, int], Tuple[float, float]]]: The
+                primitives of the background and a tuple of two tuples. The first tuple
                 contains coordinates of the origin of the base of the schedule, ie. rectangle where
                 the actual lessons are to be drawn. The second tuple contains width and height of
                 the cells of the schedule.
         """
         lay_dim = self.compute_schedule_layout_dimensions()
+        image_size = self.get_image_size()
+        primitives = []
 
         start_hour = int(self.settings["day_start"][0:2])
         end_hour = int(self.settings["day_end"][0:2])
         if end_hour <= start_hour:
             end_hour += 24
 
-        draw.text((lay_dim["schedule_padding"], lay_dim["schedule_padding"]),
-                  text=self.active_schedule.name,
-                  fill="black",
-                  font=ImageFont.truetype(self.bold_font, lay_dim["text_size"]),
-                  anchor="lt")
+        primitives.append(Text((lay_dim["schedule_padding"], lay_dim["schedule_padding"]),
+                               self.active_schedule.name,
+                               "black",
+                               self.bold_font,
+                               lay_dim["text_size"],
+                               "lt"))
 
         times = [f"{i%24}:00" for i in range(start_hour, end_hour + 1)]
-        time_text_length = max((ImageFont.truetype(self.font, lay_dim["text_size"]).getlength(time) for time in times))
+        time_text_length = max((self.fonts.get(self.font, lay_dim["text_size"]).getlength(time) for time in times))
 
-        cell_width = (self.settings["schedule_width"]
+        cell_width = (image_size[0]
                       - 2*lay_dim["schedule_padding"]
                       - time_text_length
                       - lay_dim["text_padding"]
                       - 2*lay_dim["side_offset"])/float(self.settings["days_in_week"].count("1"))
-        cell_height = (self.settings["schedule_height"]
+        cell_height = (image_size[1]
                        - 2*lay_dim["schedule_padding"]
                        - lay_dim["text_size"]
                        - lay_dim["text_padding"]
@@ -390,122 +683,109 @@ class SchedulePainter():
                        lay_dim["schedule_padding"] + lay_dim["top_side_offset"] + lay_dim["text_size"] + lay_dim["text_padding"])
 
         for increment, hour in enumerate(times):
-            coords = [lay_dim["schedule_padding"] + time_text_length + lay_dim["text_padding"],
-                      (lay_dim["schedule_padding"]
-                       + lay_dim["top_side_offset"]
-                       + lay_dim["text_size"]
-                       + lay_dim["text_padding"]
-                       + increment*cell_height),
-                       self.settings["schedule_width"] - lay_dim["schedule_padding"],
-                       (lay_dim["schedule_padding"]
-                       + lay_dim["top_side_offset"]
-                       + lay_dim["text_size"]
-                       + lay_dim["text_padding"]
-                       + increment*cell_height)]
-            draw.line(coords, fill="lightgrey", width=lay_dim["line_width"])
-            draw.text((lay_dim["schedule_padding"] + time_text_length/2, coords[1]),
-                      text=hour,
-                      fill="black",
-                      font=ImageFont.truetype(self.font, lay_dim["text_size"]),
-                      anchor="mm")
+            y = (lay_dim["schedule_padding"]
+                 + lay_dim["top_side_offset"]
+                 + lay_dim["text_size"]
+                 + lay_dim["text_padding"]
+                 + increment*cell_height)
+            coords = (lay_dim["schedule_padding"] + time_text_length + lay_dim["text_padding"],
+                      y,
+                      image_size[0] - lay_dim["schedule_padding"],
+                      y)
+            primitives.append(Line(coords, "lightgrey", lay_dim["line_width"]))
+            primitives.append(Text((lay_dim["schedule_padding"] + time_text_length/2, coords[1]),
+                                   hour,
+                                   "black",
+                                   self.font,
+                                   lay_dim["text_size"],
+                                   "mm"))
 
         days_in_week = ["Po", "Út", "St", "Čt", "Pá", "So", "Ne"]
-        for increment, day in enumerate((day for char, day in zip(self.settings["days_in_week"], days_in_week) if char == "1")):
-            coords = [(lay_dim["schedule_padding"]
-                       + time_text_length
-                       + lay_dim["text_padding"]
-                       + lay_dim["side_offset"]
-                       + increment*cell_width),
-                      lay_dim["schedule_padding"],
-                      (lay_dim["schedule_padding"]
-                       + time_text_length
-                       + lay_dim["text_padding"]
-                       + lay_dim["side_offset"]
-                       + increment*cell_width),
-                      self.settings["schedule_height"] - lay_dim["schedule_padding"]]
-            draw.line(coords, fill="lightgrey", width=lay_dim["line_width"])
-            draw.text((coords[0] + cell_width/2, coords[1] + lay_dim["top_side_offset"] + lay_dim["text_size"]/2),
-                      text=day,
-                      fill="black",
-                      font=ImageFont.truetype(self.font, lay_dim["text_size"]),
-                      anchor="mm")
-        increment += 1
-        coords[0] = lay_dim["schedule_padding"] + time_text_length + lay_dim["text_padding"] + lay_dim["side_offset"] + increment*cell_width
-        coords[2] = coords[0]
-        draw.line(coords, fill="lightgrey", width=lay_dim["line_width"])
-
-        return (base_origin, (cell_width, cell_height))
-
-    def draw_lesson_vertical(self, draw: ImageDraw.ImageDraw, lesson: Lesson, coord: Tuple[int, int], dim: Tuple[int, int]) -> None:
-        """
-        Draws a lesson vertically on given coordinates with given width and height.
+        selected_days = [day for char, day in zip(self.settings["days_in_week"], days_in_week) if char == "1"]
+        for increment in range(len(selected_days) + 1):
+            x = (lay_dim["schedule_padding"]
+                 + time_text_length
+                 + lay_dim["text_padding"]
+                 + lay_dim["side_offset"]
+                 + increment*cell_width)
+            coords = (x, lay_dim["schedule_padding"], x, image_size[1] - lay_dim["schedule_padding"])
+            primitives.append(Line(coords, "lightgrey", lay_dim["line_width"]))
+            if increment < len(selected_days):
+                primitives.append(Text((coords[0] + cell_width/2, coords[1] + lay_dim["top_side_offset"] + lay_dim["text_size"]/2),
+                                       selected_days[increment],
+                                       "black",
+                                       self.font,
+                                       lay_dim["text_size"],
+                                       "mm"))
+
+        return tuple(primitives), (base_origin, (cell_width, cell_height))
+
+    def compute_lesson_vertical(self,
+                                lesson: Lesson,
+                                coord: Tuple[float, float],
+                                dim: Tuple[float, float],
+                                general_size: int) -> Tuple[Primitive, ...]:
+        """
+        Lays out a lesson vertically on given coordinates with given width and height.
 
         Args:
-            draw (ImageDraw): Agent to be drawn with.
-            lesson (Lesson): Lesson to be drawn.
-            coordinates (Tuple[int, int]): Coordinates where the upper right corner is to be drawn.
-            dimensions (Tuple[int, int]): Width and height of the lesson.
+            lesson (Lesson): Lesson to be laid out.
+            coord (Tuple[float, float]): Coordinates where the upper right corner is to be drawn.
+            dim (Tuple[float, float]): Width and height of the lesson.
+            general_size (int): Length of the diagonal of the image.
+
+        Returns:
+            Tuple[Primitive, ...]: The primitives of the lesson.
         """
-        general_size = int(math.sqrt(self.settings["schedule_height"]**2 + self.settings["schedule_width"]**2))
         lay_dim = {"outline_width": int(general_size * config.LSSN_OUTLINE_WIDTH_FACTOR),
                    "text_size": int(dim[0]*config.LSSN_UPPER_PART_RATIO*config.LSSN_NAME_TEXT_RATIO),
                    "text_padding": int(general_size*config.LSSN_TEXT_PADDING_FACTOR)}
         lay_dim["text_outline_width"] = int(max(lay_dim["text_size"]*config.LSSN_TEXT_OUTLINE_WIDTH_FACTOR, 1))
 
         darker_color = tuple(int(component*config.COLOR_DARKENING_FACTOR) for component in lesson.color)
-        draw.rectangle([coord[0], coord[1], coord[0] + dim[0], coord[1] + dim[1]],
-                       fill=lesson.color,
-                       outline=darker_color,
-                       width=lay_dim["outline_width"])
-        draw.rectangle([coord[0], coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1], coord[0] + dim[0], coord[1] + dim[1]],
-                       fill="white",
-                       outline=lesson.color,
-                       width=lay_dim["outline_width"])
-        draw.line([coord[0] + lay_dim["outline_width"],
-                   coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1] + (lay_dim["outline_width"]-1)//2,
-                   coord[0] + dim[0] - lay_dim["outline_width"],
-                   coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1] + (lay_dim["outline_width"]-1)//2],
-                  fill="white",
-                  width=lay_dim["outline_width"])
-
-        text_font = ImageFont.truetype(self.font, max(1, lay_dim["text_size"]))
-        while text_font.getlength(lesson.name) > dim[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"] and lay_dim["text_size"] > 1:
-            lay_dim["text_size"] -= 1
-            text_font = ImageFont.truetype(self.font, lay_dim["text_size"])
-
-        mid_x = coord[0] + dim[0]/2
-        mid_y = coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1]/2
-        for dx in range(-lay_dim["text_outline_width"], lay_dim["text_outline_width"] + 1):
-            for dy in range(-lay_dim["text_outline_width"], lay_dim["text_outline_width"] + 1):
-                draw.text((mid_x + dx, mid_y + dy),
-                          lesson.name,
-                          fill="white",
-                          font=text_font,
-                          anchor="mm")
-        draw.text((mid_x, mid_y),
-                  lesson.name,
-                  fill="black",
-                  font=text_font,
-                  anchor="mm")
+        primitives = [
+            Rectangle((coord[0], coord[1], coord[0] + dim[0], coord[1] + dim[1]),
+                      lesson.color,
+                      darker_color,
+                      lay_dim["outline_width"]),
+            Rectangle((coord[0], coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1], coord[0] + dim[0], coord[1] + dim[1]),
+                      "white",
+                      lesson.color,
+                      lay_dim["outline_width"]),
+            Line((coord[0] + lay_dim["outline_width"],
+                  coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1] + (lay_dim["outline_width"]-1)//2,
+                  coord[0] + dim[0] - lay_dim["outline_width"],
+                  coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1] + (lay_dim["outline_width"]-1)//2),
+                 "white",
+                 lay_dim["outline_width"])]
+
+        text_width = dim[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"]
+        lay_dim["text_size"] = self.text_fitter.fit(self.font, (lesson.name,), lay_dim["text_size"], text_width)
+        primitives.append(OutlinedText((coord[0] + dim[0]/2, coord[1] + config.LSSN_UPPER_PART_RATIO*dim[1]/2),
+                                       lesson.name,
+                                       self.font,
+                                       lay_dim["text_size"],
+                                       lay_dim["text_outline_width"]))
         lay_dim["text_size"] = int((dim[1]*(1-config.LSSN_UPPER_PART_RATIO)-lay_dim["text_padding"])/2*config.LSSN_INFO_TEXT_RATIO)
-        text_font = ImageFont.truetype(self.font, max(lay_dim["text_size"], 1))
-        while (text_font.getlength(lesson.instructor) > dim[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"]
-               or text_font.getlength(lesson.place) > dim[0] - 2*lay_dim["outline_width"] - 2*lay_dim["text_padding"]
-               and lay_dim["text_size"] > 1):
-            lay_dim["text_size"] -= 1
-            text_font = ImageFont.truetype(self.font, lay_dim["text_size"])
-        draw.text((coord[0] + dim[0]/2,
-                   coord[1] + (2/3 * config.LSSN_UPPER_PART_RATIO + 1/3)*dim[1] - lay_dim["outline_width"]/3),
-                   text=lesson.instructor,
-                   font=text_font,
-                   fill="black",
-                   anchor="mm")
-        draw.text((coord[0] + dim[0]/2,
-                   coord[1] + (1/3 * config.LSSN_UPPER_PART_RATIO + 2/3)*dim[1] - lay_dim["outline_width"]/3),
-                   text=lesson.place,
-                   font=text_font,
-                   fill="black",
-                   anchor="mm")
+        lay_dim["text_size"] = self.text_fitter.fit(self.font,
+                                                    (lesson.instructor, lesson.place),
+                                                    lay_dim["text_size"],
+                                                    text_width)
+        primitives.append(Text((coord[0] + dim[0]/2,
+                                coord[1] + (2/3 * config.LSSN_UPPER_PART_RATIO + 1/3)*dim[1] - lay_dim["outline_width"]/3),
+                               lesson.instructor,
+                               "black",
+                               self.font,
+                               lay_dim["text_size"],
+                               "mm"))
+        primitives.append(Text((coord[0] + dim[0]/2,
+                                coord[1] + (1/3 * config.LSSN_UPPER_PART_RATIO + 2/3)*dim[1] - lay_dim["outline_width"]/3),
+                               lesson.place,
+                               "black",
+                               self.font,
+                               lay_dim["text_size"],
+                               "mm"))
+        return tuple(primitives)
 
     def get_image(self) -> Image:
         """
@@ -515,3 +795,16 @@ class SchedulePainter():
             (Image): Image to be returned.
         """
         return self.image
+
+def get_sprite_box(sprite_image: Image.Image, position: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    """
+    Returns the rectangle covered by a sprite pasted at given position.
+
+    Args:
+        sprite_image (Image.Image): The sprite.
+        position (Tuple[int, int]): Coordinates of the upper left corner of the sprite.
+
+    Returns:
+        Tuple[int, int, int, int]: The covered rectangle.
+    """
+    return (position[0], position[1], position[0] + sprite_image.width, position[1] + sprite_image.height)
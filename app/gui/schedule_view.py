@@ -0,0 +1,54 @@
+"""Contains a class for the view showing the schedule in the main window."""
+import tkinter as tk
+from typing import Optional
+from typing import Tuple
+
+from PIL import Image, ImageTk
+
+class ScheduleView():
+    """
+    View of the rendered schedule.
+
+    Keeps one canvas and one photo image for the whole life of the window. If the size of the
+    shown image does not change, its pixels are updated in place, a redrawn region only in its
+    box. The photo image is allocated again only when the size changes.
+    """
+
+    def __init__(self, parent_window: tk.Tk):
+        self.frame = tk.Frame(parent_window)
+        self.canvas = tk.Canvas(self.frame, width=1, height=1, background="white")
+        self.image_item = self.canvas.create_image(0, 0, anchor="nw")
+        self.tk_image: Optional[ImageTk.PhotoImage] = None
+
+    def show(self) -> None:
+        """Places the view to the window."""
+        self.frame.pack(pady=10, padx=10, fill="both", expand=True)
+        self.canvas.place(relx=0.5, rely=0.5, anchor="center")
+
+    def hide(self) -> None:
+        """Removes the view from the window without destroying it."""
+        self.frame.pack_forget()
+
+    def display(self, image: Image.Image, box: Optional[Tuple[int, int, int, int]]=None) -> None:
+        """
+        Shows the image on the canvas.
+
+        A region is copied to the photo image through a photo image of its own size, as the photo
+        images of Pillow can only be pasted into whole.
+
+        Args:
+            image (Image.Image): Image of the schedule in the size of the canvas or its region.
+            box (Optional[Tuple[int, int, int, int]]): Box of the region in the shown image, None
+                if the image is whole.
+        """
+        if box is not None and self.tk_image is not None:
+            region = ImageTk.PhotoImage(image)
+            self.canvas.tk.call(str(self.tk_image), "copy", str(region), "-to", box[0], box[1])
+            return
+        if self.tk_image is not None and (self.tk_image.width(), self.tk_image.height()) == image.size:
+            self.tk_image.paste(image)
+            return
+
+        self.tk_image = ImageTk.PhotoImage(image)
+        self.canvas.configure(width=image.width, height=image.height)
+        self.canvas.itemconfigure(self.image_item, image=self.tk_image)
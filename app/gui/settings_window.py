@@ -3,8 +3,7 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 
-from app.utils import utilities
-from app.utils import config
+from app.utils.settings_service import get_settings_service
 
 class SettingsWindow():
     """Settings window."""
@@ -16,7 +15,7 @@ class SettingsWindow():
         self.window.focus_set()
         self.window.grab_set()
         self.window.transient(parent_window)
-        self.settings = utilities.load_settings(config.SETTINGS_PATH)
+        self.settings = dict(get_settings_service().get())
 
         self.widget_variables = {"width": tk.StringVar(value=str(self.settings["schedule_width"])),
                                  "height": tk.StringVar(value=str(self.settings["schedule_height"])),
@@ -128,7 +127,9 @@ class SettingsWindow():
         Saves the inputs to the settings.json file.
 
         Checks whether the inputs are correct. If not, it shows a warning dialog window. If yes it
-        saves the inputs to the settings.json file and closes the settings window.
+        saves the inputs to the settings.json file through the settings service, which notifies
+        its subscribers, and closes the settings window. The window stays open if the settings
+        service rejects the settings or cannot write them.
         """
         if not str.isdigit(self.widget_variables["width"].get())  or not str.isdigit(self.widget_variables["height"].get()):
             messagebox.showwarning(title="Nesprávné rozměry", message="Rozměry rozvrhu musí být zadány jako celá kladná čísla.")
@@ -154,7 +155,14 @@ class SettingsWindow():
                 self.settings["days_in_week"] += "1"
             else:
                 self.settings["days_in_week"] += "0"
-        utilities.update_settings(self.settings)
+        try:
+            get_settings_service().update(self.settings)
+        except ValueError as e:
+            messagebox.showwarning(title="Nesprávné nastavení", message=str(e))
+            return
+        except OSError as e:
+            messagebox.showerror(title="Chyba ukládání", message=f"Nastavení nejde uložit: {e}")
+            return
 
         self.close()
 
@@ -0,0 +1,87 @@
+"""Contains a class caching rendered lessons."""
+from collections import OrderedDict
+from typing import Optional
+from typing import Tuple
+
+from PIL import Image
+
+from app.utils import config
+
+class SpriteCache():
+    """
+    Cache of rendered lessons.
+
+    Keeps the lessons rendered to RGBA images together with the offset of the image from the
+    position of the lesson. When the memory taken by the images exceeds the budget, the least
+    recently used images are evicted.
+    """
+
+    def __init__(self, memory_budget: int=config.SPRITE_CACHE_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.sprites: OrderedDict[Tuple, Tuple[Image.Image, Tuple[int, int]]] = OrderedDict()
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        """
+        Returns the sprite stored under the key.
+
+        Args:
+            key (Tuple): Key of the sprite.
+
+        Returns:
+            Optional[Tuple[Image.Image, Tuple[int, int]]]: The image and its offset or None if the
+                sprite is not in the cache.
+        """
+        if key in self.sprites:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return self.sprites[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple, sprite: Tuple[Image.Image, Tuple[int, int]]) -> None:
+        """
+        Stores the sprite under the key and evicts old sprites if the budget is exceeded.
+
+        Args:
+            key (Tuple): Key of the sprite.
+            sprite (Tuple[Image.Image, Tuple[int, int]]): The image and its offset.
+        """
+        if key in self.sprites:
+            self.memory_used -= self.get_sprite_memory(self.sprites.pop(key))
+        self.sprites[key] = sprite
+        self.memory_used += self.get_sprite_memory(sprite)
+        while self.memory_used > self.memory_budget and len(self.sprites) > 1:
+            self.memory_used -= self.get_sprite_memory(self.sprites.popitem(last=False)[1])
+
+    @staticmethod
+    def get_sprite_memory(sprite: Tuple[Image.Image, Tuple[int, int]]) -> int:
+        """
+        Returns the number of bytes taken by the pixels of the sprite.
+
+        Args:
+            sprite (Tuple[Image.Image, Tuple[int, int]]): The image and its offset.
+
+        Returns:
+            int: Number of bytes.
+        """
+        return sprite[0].width * sprite[0].height * 4
+
+    def clear(self) -> None:
+        """Removes all the sprites from the cache and resets the counters."""
+        self.sprites.clear()
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_hit_rate(self) -> float:
+        """
+        Returns the ratio of the cache hits to all the requests.
+
+        Returns:
+            float: The hit rate. Zero if there were no requests.
+        """
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
@@ -0,0 +1,95 @@
+"""Contains a class for fitting texts into boxes of given width."""
+from collections import OrderedDict
+from typing import Tuple
+
+from app.utils import config
+from app.gui.font_cache import FontCache
+
+class TextFitter():
+    """
+    Finds the largest font size with which texts fit into a box.
+
+    The size is first estimated from a single measurement, because the length of a text grows
+    roughly linearly with the font size. The estimate is then refined with a binary search.
+    Results are memoized by the texts, the font, the maximal size and the width of the box.
+    """
+
+    def __init__(self, fonts: FontCache, max_size: int=config.TEXT_FIT_CACHE_SIZE):
+        self.fonts = fonts
+        self.max_size = max_size
+        self.sizes: OrderedDict[Tuple[Tuple[str, ...], str, int, float], int] = OrderedDict()
+
+    def fit(self, font: str, texts: Tuple[str, ...], max_font_size: int, width: float) -> int:
+        """
+        Returns the largest font size with which all the texts fit into the given width.
+
+        Args:
+            font (str): Path or name of the font file.
+            texts (Tuple[str, ...]): Texts which have to fit.
+            max_font_size (int): The largest size that can be returned.
+            width (float): Width of the box the texts have to fit into.
+
+        Returns:
+            int: The font size. It is never smaller than 1, even if the texts do not fit.
+        """
+        max_font_size = max(max_font_size, 1)
+        key = (texts, font, max_font_size, width)
+        if key in self.sizes:
+            self.sizes.move_to_end(key)
+            return self.sizes[key]
+
+        size = self.compute_size(font, texts, max_font_size, width)
+        self.sizes[key] = size
+        if len(self.sizes) > self.max_size:
+            self.sizes.popitem(last=False)
+        return size
+
+    def compute_size(self, font: str, texts: Tuple[str, ...], max_font_size: int, width: float) -> int:
+        """
+        Computes the largest font size with which all the texts fit into the given width.
+
+        Args:
+            font (str): Path or name of the font file.
+            texts (Tuple[str, ...]): Texts which have to fit.
+            max_font_size (int): The largest size that can be returned.
+            width (float): Width of the box the texts have to fit into.
+
+        Returns:
+            int: The font size.
+        """
+        max_length = self.measure(font, texts, max_font_size)
+        if max_length <= width or max_font_size == 1:
+            return max_font_size
+
+        estimate = min(max(int(max_font_size * width / max_length), 1), max_font_size - 1)
+        if self.measure(font, texts, estimate) <= width:
+            low, high = estimate, max_font_size
+        else:
+            low, high = 0, estimate
+
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.measure(font, texts, middle) <= width:
+                low = middle
+            else:
+                high = middle
+        return max(low, 1)
+
+    def measure(self, font: str, texts: Tuple[str, ...], size: int) -> float:
+        """
+        Returns the length of the longest of the texts.
+
+        Args:
+            font (str): Path or name of the font file.
+            texts (Tuple[str, ...]): Texts to be measured.
+            size (int): Size of the font.
+
+        Returns:
+            float: Length of the longest text in pixels.
+        """
+        loaded_font = self.fonts.get(font, size)
+        return max(loaded_font.getlength(text) for text in texts)
+
+    def clear(self) -> None:
+        """Removes all the memoized sizes."""
+        self.sizes.clear()
@@ -0,0 +1,92 @@
+"""Contains functions for drawing texts with an outline."""
+import math
+from typing import Tuple
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from app.utils import utilities
+
+def draw_outlined_text(draw: ImageDraw.ImageDraw,
+                       position: Tuple[float, float],
+                       text: str,
+                       font: ImageFont.FreeTypeFont,
+                       outline_width: int,
+                       mode: utilities.OutlineMode) -> None:
+    """
+    Draws a black text with a white outline centered on given position.
+
+    Args:
+        draw (ImageDraw.ImageDraw): Drawing object.
+        position (Tuple[float, float]): Coordinates of the middle of the text.
+        text (str): Text to be drawn.
+        font (ImageFont.FreeTypeFont): Font of the text.
+        outline_width (int): Width of the outline in pixels.
+        mode (utilities.OutlineMode): Way the outline is drawn. LOOP draws the text once for every
+            offset in a square around the position, STROKE uses the stroke of the font and MASK
+            dilates the mask of the text once and fills it.
+    """
+    if mode == utilities.OutlineMode.LOOP:
+        for dx in range(-outline_width, outline_width + 1):
+            for dy in range(-outline_width, outline_width + 1):
+                draw.text((position[0] + dx, position[1] + dy),
+                          text,
+                          fill="white",
+                          font=font,
+                          anchor="mm")
+    elif mode == utilities.OutlineMode.STROKE:
+        draw.text(position,
+                  text,
+                  fill="white",
+                  font=font,
+                  anchor="mm",
+                  stroke_width=outline_width,
+                  stroke_fill="white")
+    elif mode == utilities.OutlineMode.MASK:
+        left, top, right, bottom = font.getbbox(text, anchor="mm")
+        origin = (math.floor(position[0] + left) - outline_width - 1,
+                  math.floor(position[1] + top) - outline_width - 1)
+        mask = Image.new("L",
+                         (math.ceil(right - left) + 2*outline_width + 3,
+                          math.ceil(bottom - top) + 2*outline_width + 3),
+                         0)
+        ImageDraw.Draw(mask).text((position[0] - origin[0], position[1] - origin[1]),
+                                  text,
+                                  fill=255,
+                                  font=font,
+                                  anchor="mm")
+        draw.bitmap(origin, dilate_mask(mask, outline_width), fill="white")
+    else:
+        raise ValueError
+
+    draw.text(position,
+              text,
+              fill="black",
+              font=font,
+              anchor="mm")
+
+def dilate_mask(mask: Image.Image, radius: int) -> Image.Image:
+    """
+    Dilates a mask by a square with the side 2*radius + 1.
+
+    The square is split into horizontal and vertical parts. Every part is dilated by taking the
+    maximum of the mask and its shifted copies. The covered distance roughly triples in every
+    step, so only a logarithmic number of passes over the mask is needed. The mask has to have
+    an empty border at least radius pixels wide.
+
+    Args:
+        mask (Image.Image): Mask in mode "L".
+        radius (int): Radius of the dilation.
+
+    Returns:
+        Image.Image: The dilated mask.
+    """
+    for axis in (0, 1):
+        reach = 0
+        while reach < radius:
+            shift = min(2*reach + 1, radius - reach)
+            offset = (shift, 0) if axis == 0 else (0, shift)
+            mask = ImageChops.lighter(mask,
+                                      ImageChops.lighter(ImageChops.offset(mask, *offset),
+                                                         ImageChops.offset(mask, -offset[0], -offset[1])))
+            reach += shift
+    return mask
@@ -0,0 +1,79 @@
+"""Launch code rendering all the schedules of a folder to images from the command line."""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+from typing import Optional
+
+from app.gui.batch_render import IMAGE_FORMATS
+from app.gui.batch_render import RenderResult
+from app.gui.batch_render import render_folder
+from app.utils import config
+from app.utils import utilities
+
+def print_progress(finished: int, total: int, result: RenderResult) -> None:
+    """
+    Prints the result of one schedule file.
+
+    Args:
+        finished (int): Number of the finished files.
+        total (int): Number of all the files.
+        result (RenderResult): The result.
+    """
+    prefix = f"[{finished}/{total}] {result.schedule_file.name}"
+    if result.status == utilities.RenderStatus.RENDERED:
+        print(f"{prefix} -> {result.output_file.name}: {result.seconds:.2f} s")
+    elif result.status == utilities.RenderStatus.SKIPPED:
+        print(f"{prefix}: aktuální, přeskočeno")
+    else:
+        print(f"{prefix}: chyba: {result.error}", file=sys.stderr)
+
+def main(arguments: Optional[List[str]]=None) -> int:
+    """
+    Renders the schedules of a folder given by the command line arguments.
+
+    Args:
+        arguments (Optional[List[str]]): The arguments, sys.argv is used if None.
+
+    Returns:
+        int: Exit code, 1 if some file could not be rendered.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.render",
+                                     description="Vykreslí všechny rozvrhy ze složky do obrázků.")
+    parser.add_argument("folder", type=Path, nargs="?", default=config.SCHEDULE_FOLDER_PATH,
+                        help="složka s rozvrhy")
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="složka pro obrázky, výchozí je složka s rozvrhy")
+    parser.add_argument("-f", "--format", choices=sorted(IMAGE_FORMATS), default="png",
+                        help="formát obrázků")
+    parser.add_argument("-s", "--settings", type=Path, default=config.SETTINGS_PATH,
+                        help="soubor s nastavením rozvrhů")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="počet procesů, výchozí je počet procesorů, 0 vykresluje bez procesů")
+    parser.add_argument("--force", action="store_true",
+                        help="vykreslí i obrázky, které jsou aktuální")
+    parsed = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    try:
+        results = render_folder(parsed.folder,
+                                parsed.output if parsed.output is not None else parsed.folder,
+                                parsed.format,
+                                parsed.settings,
+                                parsed.processes,
+                                parsed.force,
+                                print_progress)
+    except (OSError, ValueError) as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        return 1
+
+    counts = {status: sum(result.status == status for result in results) for status in utilities.RenderStatus}
+    print(f"Vykresleno {counts[utilities.RenderStatus.RENDERED]}, "
+          f"přeskočeno {counts[utilities.RenderStatus.SKIPPED]}, "
+          f"chyb {counts[utilities.RenderStatus.FAILED]} "
+          f"za {time.perf_counter() - start:.2f} s.")
+    return 1 if counts[utilities.RenderStatus.FAILED] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,470 @@
+"""Contains a writer saving the changed schedules in the background."""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.schedule import ScheduleChange
+from app.src.schedule_journal import ScheduleJournal
+from app.src.schedule_journal import encode_change
+from app.src.schedule_journal import get_journal_path
+from app.src import schedule_format
+from app.utils import config
+
+class AutosaveTask():
+    """Changes of one schedule waiting to be written."""
+
+    def __init__(self, schedule: Schedule, file_path: Optional[Path]):
+        self.schedule = schedule
+        self.file_path = file_path
+        self.journaled = file_path is not None
+        self.journal: Optional[ScheduleJournal] = None
+        self.records: List[bytes] = []
+        self.change_count = 0
+        self.first_change: Optional[float] = None
+        self.last_change: Optional[float] = None
+        self.forced = False
+        self.compact = False
+        self.new_path: Optional[Path] = None
+        self.closed = False
+        self.removed = False
+
+    def get_deadline(self, delay: float, max_delay: float) -> Optional[float]:
+        """
+        Returns the time when the changes should be written.
+
+        Args:
+            delay (float): Time in seconds without changes after which the changes are written.
+            max_delay (float): Maximal time in seconds the first change waits.
+
+        Returns:
+            Optional[float]: The monotonic time or None if there is nothing to write.
+        """
+        if self.forced:
+            return 0.0
+        if self.first_change is None:
+            return None
+        return min(self.last_change + delay, self.first_change + max_delay)
+
+class AutosaveBatch(NamedTuple):
+    """Changes of one schedule taken from its task to be written."""
+    task: AutosaveTask
+    records: List[bytes]
+    snapshot: Optional[Tuple[str, List[Lesson]]]
+    change_count: int
+    compact: bool
+    new_path: Optional[Path]
+
+class AutosaveWriter():
+    """
+    Saves the changed schedules to the schedule folder on a background thread.
+
+    The writer follows the changes of the watched schedules. Changes coming one after another are
+    merged and written together after a while without changes, but not later than the maximal
+    delay after the first of them. Changes of schedules loaded from a file of the folder are
+    appended to the journal of the file, other schedules are saved whole to a temporary file
+    renamed to the schedule file. The thread of the user interface only encodes the changes, it
+    never waits for the disk: the journals are opened, moved and closed by the writer too.
+    """
+
+    def __init__(self,
+                 folder: Path=config.SCHEDULE_FOLDER_PATH,
+                 delay: float=config.AUTOSAVE_DELAY,
+                 max_delay: float=config.AUTOSAVE_MAX_DELAY):
+        self.folder = Path(folder)
+        self.delay = delay
+        self.max_delay = max_delay
+        self.condition = threading.Condition()
+        self.tasks: Dict[int, AutosaveTask] = {}
+        self.closed_tasks: List[AutosaveTask] = []
+        self.writing_count = 0
+        self.last_saved_time: Optional[float] = None
+        self.last_error: Optional[Tuple[str, Exception]] = None
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name="autosave", daemon=True)
+        self.thread.start()
+
+    def watch(self, schedule: Schedule, file_path: Optional[Path]=None) -> None:
+        """
+        Starts saving the changes of a schedule.
+
+        Args:
+            schedule (Schedule): The schedule.
+            file_path (Optional[Path]): The file the schedule was loaded from, its changes are
+                appended to the journal of the file. If None, the whole schedule is saved to the
+                folder under its name.
+        """
+        with self.condition:
+            if id(schedule) in self.tasks:
+                return
+            self.tasks[id(schedule)] = AutosaveTask(schedule, None if file_path is None else Path(file_path))
+        schedule.subscribe(self.on_change)
+
+    def unwatch(self, schedule: Schedule, remove: bool=False) -> None:
+        """
+        Stops saving the changes of a schedule without waiting for the writer.
+
+        The writer writes the waiting changes of the schedule and closes its journal.
+
+        Args:
+            schedule (Schedule): The schedule.
+            remove (bool): If True, the waiting changes are dropped and the writer deletes the file
+                of the schedule with its journal instead.
+        """
+        schedule.unsubscribe(self.on_change)
+        with self.condition:
+            task = self.tasks.pop(id(schedule), None)
+            if task is None:
+                return
+            task.closed = True
+            task.forced = True
+            if remove:
+                task.removed = True
+                task.records = []
+                task.change_count = 0
+            self.closed_tasks.append(task)
+            self.condition.notify_all()
+
+    def is_watched(self, schedule: Schedule) -> bool:
+        """
+        Says whether the changes of a schedule are saved.
+
+        Args:
+            schedule (Schedule): The schedule.
+
+        Returns:
+            bool: True if the schedule is watched.
+        """
+        with self.condition:
+            return id(schedule) in self.tasks
+
+    def on_change(self, change: ScheduleChange) -> None:
+        """
+        Remembers a change of a watched schedule.
+
+        Args:
+            change (ScheduleChange): The change.
+        """
+        now = time.monotonic()
+        with self.condition:
+            task = self.tasks.get(id(change.schedule))
+            if task is None:
+                return
+            if task.journaled:
+                task.records.append(encode_change(change))
+            task.change_count += 1
+            if task.first_change is None:
+                task.first_change = now
+            task.last_change = now
+            self.condition.notify_all()
+
+    def save(self, schedule: Schedule) -> None:
+        """
+        Requests saving of a watched schedule without waiting for it.
+
+        The journal of the schedule is compacted, a schedule without a journal is saved whole.
+
+        Args:
+            schedule (Schedule): The schedule.
+        """
+        with self.condition:
+            task = self.tasks.get(id(schedule))
+            if task is None:
+                return
+            task.forced = True
+            task.compact = True
+            self.condition.notify_all()
+
+    def move(self, schedule: Schedule, file_path: Path) -> None:
+        """
+        Requests moving of the file of a watched schedule with its journal without waiting for it.
+
+        The writer moves the files after it writes the waiting changes to them. A schedule which
+        has not been saved yet is saved to the new path.
+
+        Args:
+            schedule (Schedule): The schedule.
+            file_path (Path): The new path to the file.
+        """
+        with self.condition:
+            task = self.tasks.get(id(schedule))
+            if task is None:
+                return
+            task.new_path = Path(file_path)
+            task.forced = True
+            self.condition.notify_all()
+
+    def flush(self, schedule: Optional[Schedule]=None, wait: bool=False) -> None:
+        """
+        Requests writing of the waiting changes.
+
+        Args:
+            schedule (Optional[Schedule]): The schedule whose changes are written. If None, the
+                changes of all the schedules are written.
+            wait (bool): If True, waits until the changes are written. Only threads other than
+                the one of the user interface should wait.
+        """
+        with self.condition:
+            for key, task in self.tasks.items():
+                if (schedule is None or key == id(schedule)) and task.first_change is not None:
+                    task.forced = True
+            self.condition.notify_all()
+            if wait:
+                self.condition.wait_for(lambda: self.writing_count == 0
+                                        and not self.closed_tasks
+                                        and not any(task.forced for task in self.tasks.values()))
+
+    def stop(self) -> None:
+        """Writes all the waiting changes, closes the journals and waits until the thread stops."""
+        with self.condition:
+            schedules = [task.schedule for task in self.tasks.values()]
+        for schedule in schedules:
+            self.unwatch(schedule)
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def get_queue_depth(self) -> int:
+        """
+        Returns the number of changes waiting to be written.
+
+        Returns:
+            int: The number of changes.
+        """
+        with self.condition:
+            return sum(task.change_count for task in list(self.tasks.values()) + self.closed_tasks)
+
+    def get_last_saved_time(self) -> Optional[float]:
+        """
+        Returns the time when the last changes were written.
+
+        Returns:
+            Optional[float]: The time in seconds since the epoch or None if nothing has been written.
+        """
+        with self.condition:
+            return self.last_saved_time
+
+    def get_last_error(self) -> Optional[Tuple[str, Exception]]:
+        """
+        Returns the last error of writing.
+
+        Returns:
+            Optional[Tuple[str, Exception]]: Name of the schedule and the error or None if there
+                has been no error.
+        """
+        with self.condition:
+            return self.last_error
+
+    def run(self) -> None:
+        """Writes the changes of the schedules when their time comes until the writer is stopped."""
+        while True:
+            with self.condition:
+                batches = self.take_due_batches()
+                while not batches and not self.stopped:
+                    deadlines = [deadline for deadline in (task.get_deadline(self.delay, self.max_delay)
+                                                           for task in self.tasks.values())
+                                 if deadline is not None]
+                    timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                    self.condition.wait(timeout)
+                    batches = self.take_due_batches()
+                if not batches:
+                    return
+                self.writing_count += 1
+
+            for batch in batches:
+                self.write(batch)
+
+            with self.condition:
+                self.writing_count -= 1
+                self.condition.notify_all()
+
+    def take_due_batches(self) -> List[AutosaveBatch]:
+        """
+        Takes the changes whose time has come from the tasks, the condition must be held.
+
+        The closed tasks come first, so a schedule watched again uses its files only after its
+        closed task has released them. A schedule saved whole is copied here under its lock, so the
+        writer never reads a schedule while it is being changed.
+
+        Returns:
+            List[AutosaveBatch]: The changes of the tasks.
+        """
+        now = time.monotonic()
+        batches = []
+        for task in self.closed_tasks + list(self.tasks.values()):
+            deadline = task.get_deadline(self.delay, self.max_delay)
+            if deadline is None or deadline > now:
+                continue
+            snapshot = None
+            if not task.journaled and not task.removed and (task.change_count or task.compact):
+                snapshot = take_snapshot(task.schedule)
+            batches.append(AutosaveBatch(task, task.records, snapshot, task.change_count, task.compact, task.new_path))
+            task.records = []
+            task.change_count = 0
+            task.first_change = None
+            task.last_change = None
+            task.forced = False
+            task.compact = False
+            task.new_path = None
+        self.closed_tasks = []
+        return batches
+
+    def write(self, batch: AutosaveBatch) -> None:
+        """
+        Writes the changes of a schedule.
+
+        The journal is opened when it is needed for the first time. If the file of the schedule
+        has disappeared, the journal is given up and the schedule is saved whole. A journal which
+        failed is closed and opened again with the next write, which cuts off a damaged end.
+
+        Errors are remembered in last_error. The changes which have not been written are given back
+        to the task and written again later, the changes of a closed task are dropped.
+
+        Args:
+            batch (AutosaveBatch): The changes.
+        """
+        task = batch.task
+        records = batch.records
+        snapshot = batch.snapshot
+        compact = batch.compact
+        new_path = batch.new_path
+        try:
+            if task.removed:
+                self.close_journal(task)
+                if task.file_path is not None:
+                    task.file_path.unlink(missing_ok=True)
+                    get_journal_path(task.file_path).unlink(missing_ok=True)
+                return
+
+            if task.journaled and task.journal is None and (records or compact):
+                try:
+                    task.journal = ScheduleJournal(task.schedule, task.file_path, follow=False)
+                except FileNotFoundError:
+                    with self.condition:
+                        task.journaled = False
+                    records = []
+                    compact = False
+                    snapshot = take_snapshot(task.schedule)
+
+            if task.journal is not None:
+                if records:
+                    appended_count = task.journal.appended_count
+                    try:
+                        task.journal.append_batch(records)
+                    finally:
+                        if task.journal.appended_count != appended_count:
+                            records = []
+                if compact:
+                    task.journal.compact()
+                    compact = False
+            if snapshot is not None:
+                name, lessons = snapshot
+                file_path = task.file_path if task.file_path is not None else self.folder / f"{name}.txt"
+                schedule_format.write_file_atomically(file_path, schedule_format.encode_lessons(name, lessons))
+                with self.condition:
+                    task.file_path = file_path
+                snapshot = None
+            if new_path is not None:
+                self.move_files(task, new_path)
+                new_path = None
+            if task.closed:
+                self.close_journal(task)
+        except (OSError, ValueError) as e:
+            try:
+                self.close_journal(task)
+            except (OSError, ValueError):
+                pass
+            with self.condition:
+                self.last_error = (task.schedule.name, e)
+                if not task.closed:
+                    self.give_back(task, batch, records, snapshot is not None, compact, new_path)
+            return
+        with self.condition:
+            self.last_saved_time = time.time()
+
+    def give_back(self,
+                  task: AutosaveTask,
+                  batch: AutosaveBatch,
+                  records: List[bytes],
+                  resave: bool,
+                  compact: bool,
+                  new_path: Optional[Path]) -> None:
+        """
+        Returns the changes which have not been written to their task, the condition must be held.
+
+        The records are put before the records of the newer changes. A move requested since the
+        batch was taken wins over the move of the batch.
+
+        Args:
+            task (AutosaveTask): The task.
+            batch (AutosaveBatch): The batch taken from the task.
+            records (List[bytes]): The records which have not been written.
+            resave (bool): If True, the whole schedule has not been saved.
+            compact (bool): If True, the journal has not been compacted.
+            new_path (Optional[Path]): The path the file has not been moved to.
+        """
+        task.records[:0] = records
+        if records:
+            task.change_count += len(records)
+        elif resave:
+            task.change_count += batch.change_count
+        task.compact = task.compact or compact
+        if task.new_path is None:
+            task.new_path = new_path
+        if records or resave or compact or new_path is not None:
+            now = time.monotonic()
+            if task.first_change is None:
+                task.first_change = now
+            if task.last_change is None:
+                task.last_change = now
+
+    def move_files(self, task: AutosaveTask, new_path: Path) -> None:
+        """
+        Moves the file of a schedule and its journal, the journal is closed first.
+
+        Args:
+            task (AutosaveTask): The task of the schedule.
+            new_path (Path): The new path to the file.
+        """
+        self.close_journal(task)
+        old_path = task.file_path
+        if old_path is not None and old_path != new_path:
+            if old_path.exists():
+                os.replace(old_path, new_path)
+            if get_journal_path(old_path).exists():
+                os.replace(get_journal_path(old_path), get_journal_path(new_path))
+        with self.condition:
+            task.file_path = new_path
+
+    def close_journal(self, task: AutosaveTask) -> None:
+        """
+        Closes the journal of a schedule if it is open.
+
+        Args:
+            task (AutosaveTask): The task of the schedule.
+        """
+        journal = task.journal
+        task.journal = None
+        if journal is not None:
+            journal.close()
+
+def take_snapshot(schedule: Schedule) -> Tuple[str, List[Lesson]]:
+    """
+    Copies the name and the lessons of a schedule under its lock.
+
+    Args:
+        schedule (Schedule): The schedule.
+
+    Returns:
+        Tuple[str, List[Lesson]]: The name and the lessons.
+    """
+    with schedule.lock:
+        return schedule.name, list(schedule.lessons)
@@ -0,0 +1,161 @@
+"""Contains an index of the lessons of one day."""
+import bisect
+import math
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app.src.lesson import Lesson
+
+MINUTES_IN_DAY = 24 * 60
+
+def get_lesson_interval(lesson: Lesson) -> Tuple[int, int]:
+    """
+    Returns the start and the end of a lesson in minutes after midnight.
+
+    Args:
+        lesson (Lesson): The lesson.
+
+    Returns:
+        Tuple[int, int]: The start and the end.
+    """
+    return lesson.start_minute, lesson.end_minute
+
+class DayIndex():
+    """
+    Index of the lessons of one day.
+
+    Keeps the lessons sorted by their start and end together with the sorted durations of the
+    lessons. A lesson ending after a moment has to start less than the longest duration before it,
+    so lessons overlapping an interval are found by two binary searches. Busy intervals of the day
+    are merged lazily and kept until the day changes.
+    """
+
+    def __init__(self):
+        self.intervals: List[Tuple[int, int]] = []
+        self.lessons: List[Lesson] = []
+        self.durations: List[int] = []
+        self.busy_intervals: Optional[List[Tuple[int, int]]] = None
+
+    def add(self, lesson: Lesson) -> None:
+        """
+        Adds a lesson to the index.
+
+        Lessons with the same start and end are kept in the order they were added.
+
+        Args:
+            lesson (Lesson): The lesson.
+        """
+        interval = get_lesson_interval(lesson)
+        position = bisect.bisect_right(self.intervals, interval)
+        self.intervals.insert(position, interval)
+        self.lessons.insert(position, lesson)
+        bisect.insort(self.durations, interval[1] - interval[0])
+        self.busy_intervals = None
+
+    def remove(self, lesson: Lesson) -> None:
+        """
+        Removes a lesson from the index.
+
+        The lesson must not have been changed since it was added.
+
+        Args:
+            lesson (Lesson): The lesson.
+
+        Raises:
+            ValueError: If the lesson is not in the index.
+        """
+        interval = get_lesson_interval(lesson)
+        start = bisect.bisect_left(self.intervals, interval)
+        end = bisect.bisect_right(self.intervals, interval)
+        for position in range(start, end):
+            if self.lessons[position] is lesson:
+                del self.intervals[position]
+                del self.lessons[position]
+                del self.durations[bisect.bisect_left(self.durations, interval[1] - interval[0])]
+                self.busy_intervals = None
+                return
+        raise ValueError("Hodina není v rozvrhu dne.")
+
+    def get_lessons(self) -> List[Lesson]:
+        """
+        Returns the lessons in the order of their start.
+
+        Returns:
+            List[Lesson]: The lessons.
+        """
+        return list(self.lessons)
+
+    def get_first_lesson(self) -> Optional[Lesson]:
+        """
+        Returns the lesson starting first.
+
+        Returns:
+            Optional[Lesson]: The lesson or None if the day is empty.
+        """
+        return self.lessons[0] if self.lessons else None
+
+    def get_overlapping(self, start: int, end: int) -> List[Lesson]:
+        """
+        Returns the lessons overlapping the interval [start, end).
+
+        Args:
+            start (int): Start of the interval in minutes after midnight.
+            end (int): End of the interval in minutes after midnight.
+
+        Returns:
+            List[Lesson]: The overlapping lessons in the order of their start.
+        """
+        if not self.lessons:
+            return []
+        first = bisect.bisect_right(self.intervals, (start - self.durations[-1], math.inf))
+        last = bisect.bisect_left(self.intervals, (end, -math.inf))
+        return [self.lessons[position] for position in range(first, last)
+                if self.intervals[position][1] > start]
+
+    def get_busy_intervals(self) -> List[Tuple[int, int]]:
+        """
+        Returns the disjoint intervals taken by the lessons.
+
+        Returns:
+            List[Tuple[int, int]]: The intervals sorted by their start.
+        """
+        if self.busy_intervals is None:
+            self.busy_intervals = []
+            for lesson_start, lesson_end in self.intervals:
+                if lesson_end <= lesson_start:
+                    continue
+                if self.busy_intervals and lesson_start <= self.busy_intervals[-1][1]:
+                    if lesson_end > self.busy_intervals[-1][1]:
+                        self.busy_intervals[-1] = (self.busy_intervals[-1][0], lesson_end)
+                else:
+                    self.busy_intervals.append((lesson_start, lesson_end))
+        return self.busy_intervals
+
+    def get_free_gaps(self, minimal_length: int, start: int=0, end: int=MINUTES_IN_DAY) -> List[Tuple[int, int]]:
+        """
+        Returns the free gaps between the lessons in the interval [start, end).
+
+        Args:
+            minimal_length (int): Minimal length of the gaps in minutes.
+            start (int): Start of the interval in minutes after midnight.
+            end (int): End of the interval in minutes after midnight.
+
+        Returns:
+            List[Tuple[int, int]]: Starts and ends of the gaps in minutes after midnight.
+        """
+        busy_intervals = self.get_busy_intervals()
+        gaps = []
+        gap_start = start
+        position = bisect.bisect_right(busy_intervals, (start, math.inf))
+        if position > 0 and busy_intervals[position - 1][1] > start:
+            gap_start = busy_intervals[position - 1][1]
+        for busy_start, busy_end in busy_intervals[position:]:
+            if busy_start >= end:
+                break
+            if busy_start > gap_start and busy_start - gap_start >= minimal_length:
+                gaps.append((gap_start, busy_start))
+            gap_start = busy_end
+        if end - gap_start >= minimal_length and gap_start < end:
+            gaps.append((gap_start, end))
+        return gaps
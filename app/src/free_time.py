@@ -0,0 +1,126 @@
+"""Contains functions for finding the time when the owners of many schedules are free."""
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from app.src.schedule import Schedule
+from app.src.day_index import MINUTES_IN_DAY
+from app.utils import config
+from app.utils import utilities
+
+class FreeSlot(NamedTuple):
+    """Interval of a day when enough of the owners of the schedules are free."""
+    day: utilities.Day
+    start: int
+    end: int
+    free_count: int
+
+def build_occupancy_matrix(schedules: Sequence[Schedule],
+                           granularity: int=config.FREE_TIME_GRANULARITY) -> np.ndarray:
+    """
+    Builds the matrix of the time taken in the schedules.
+
+    The matrix is unpacked from the cached bitmask occupancies of the schedules at once.
+
+    Args:
+        schedules (Sequence[Schedule]): The schedules.
+        granularity (int): Length of one time bin in minutes.
+
+    Returns:
+        np.ndarray: Boolean matrix with shape (schedules, days, time bins), True where the time is
+            taken.
+    """
+    bin_count = MINUTES_IN_DAY // granularity
+    byte_count = (bin_count + 7) // 8
+    data = b"".join(mask.to_bytes(byte_count, "little")
+                    for schedule in schedules
+                    for mask in schedule.get_occupancy(granularity).masks)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")
+    return bits.reshape(len(schedules), len(utilities.Day), byte_count * 8)[:, :, :bin_count].astype(bool)
+
+def find_free_slots(occupancy_matrix: np.ndarray,
+                    quorum: Optional[int]=None,
+                    granularity: int=config.FREE_TIME_GRANULARITY,
+                    start: int=0,
+                    end: int=MINUTES_IN_DAY,
+                    minimal_length: int=0) -> List[FreeSlot]:
+    """
+    Finds the intervals when at least quorum of the owners of the schedules are free.
+
+    Only the time bins lying wholly in the interval [start, end) of every day are searched.
+
+    Args:
+        occupancy_matrix (np.ndarray): Matrix built by build_occupancy_matrix.
+        quorum (Optional[int]): Minimal number of free owners. If None, everybody has to be free.
+        granularity (int): Length of one time bin of the matrix in minutes.
+        start (int): Start of the searched interval of every day in minutes after midnight.
+        end (int): End of the searched interval of every day in minutes after midnight.
+        minimal_length (int): Minimal length of the found intervals in minutes.
+
+    Returns:
+        List[FreeSlot]: The found intervals ordered by the days and their start.
+    """
+    schedule_count, day_count, bin_count = occupancy_matrix.shape
+    if quorum is None:
+        quorum = schedule_count
+    free_counts = schedule_count - occupancy_matrix.sum(axis=0, dtype=np.int32)
+
+    selected = np.zeros((day_count, bin_count + 2), dtype=np.int8)
+    first_bin = -(-start // granularity)
+    last_bin = min(end // granularity, bin_count)
+    if first_bin < last_bin:
+        selected[:, first_bin + 1:last_bin + 1] = free_counts[:, first_bin:last_bin] >= quorum
+    changes = np.diff(selected, axis=1)
+    run_starts = np.argwhere(changes == 1)
+    run_ends = np.argwhere(changes == -1)
+
+    slots = []
+    for (day, run_start), (_, run_end) in zip(run_starts, run_ends):
+        if (run_end - run_start) * granularity >= minimal_length:
+            slots.append(FreeSlot(utilities.Day(int(day)),
+                                  int(run_start) * granularity,
+                                  int(run_end) * granularity,
+                                  int(free_counts[day, run_start:run_end].min())))
+    return slots
+
+def find_common_free_time(schedules: Sequence[Schedule],
+                          quorum: Optional[int]=None,
+                          granularity: int=config.FREE_TIME_GRANULARITY,
+                          start: int=0,
+                          end: int=MINUTES_IN_DAY,
+                          minimal_length: int=0) -> List[FreeSlot]:
+    """
+    Finds the intervals when at least quorum of the owners of the schedules are free.
+
+    Args:
+        schedules (Sequence[Schedule]): The schedules.
+        quorum (Optional[int]): Minimal number of free owners. If None, everybody has to be free.
+        granularity (int): Length of one time bin in minutes.
+        start (int): Start of the searched interval of every day in minutes after midnight.
+        end (int): End of the searched interval of every day in minutes after midnight.
+        minimal_length (int): Minimal length of the found intervals in minutes.
+
+    Returns:
+        List[FreeSlot]: The found intervals ordered by the days and their start.
+    """
+    return find_free_slots(build_occupancy_matrix(schedules, granularity),
+                           quorum,
+                           granularity,
+                           start,
+                           end,
+                           minimal_length)
+
+def format_minutes(minutes: int) -> str:
+    """
+    Formats minutes after midnight as a time of the day.
+
+    Args:
+        minutes (int): Minutes after midnight, the end of the day is 24:00.
+
+    Returns:
+        str: String in format "HH:MM".
+    """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
@@ -1,12 +1,24 @@
 """Contains a class for the lessons."""
+import sys
 from datetime import time
+from typing import Any
+from typing import Dict
 from typing import Tuple
-from typing import List
 
 from app.utils import utilities
 
 class Lesson:
-    """Lesson data structer."""
+    """
+    Lesson data structer.
+
+    The lesson keeps no __dict__. The start and the end are kept as minutes after midnight and the
+    color as a packed 0xRRGGBB integer, the times and the color are available as time objects and
+    a tuple through properties. The texts are interned when the lesson is created, so lessons with
+    the same place or instructor share one string.
+    """
+
+    __slots__ = ("name", "place", "instructor", "day", "start_minute", "end_minute", "packed_color")
+
     def __init__(self,
                  name: str="",
                  place: str="",
@@ -15,21 +27,130 @@ class Lesson:
                  start_time: time=time(8, 0),
                  end_time: time=time(9, 0),
                  color: Tuple[int, int, int]=(255, 0, 0)):
-        self.name = name
-        self.place = place
-        self.instructor = instructor
+        self.name = sys.intern(name)
+        self.place = sys.intern(place)
+        self.instructor = sys.intern(instructor)
         self.day = day
         self.start_time = start_time
         self.end_time = end_time
         self.color = color
 
+    @classmethod
+    def from_minutes(cls,
+                     name: str,
+                     place: str,
+                     instructor: str,
+                     day: utilities.Day,
+                     start_minute: int,
+                     end_minute: int,
+                     packed_color: int) -> "Lesson":
+        """
+        Creates a lesson from the times in minutes and the packed color without converting them.
+
+        Args:
+            name (str): Name of the lesson.
+            place (str): Place of the lesson.
+            instructor (str): Instructor of the lesson.
+            day (utilities.Day): Day of the lesson.
+            start_minute (int): Start of the lesson in minutes after midnight.
+            end_minute (int): End of the lesson in minutes after midnight.
+            packed_color (int): Color of the lesson as 0xRRGGBB.
+
+        Returns:
+            Lesson: The lesson.
+        """
+        lesson = cls.__new__(cls)
+        lesson.name = sys.intern(name)
+        lesson.place = sys.intern(place)
+        lesson.instructor = sys.intern(instructor)
+        lesson.day = day
+        lesson.start_minute = start_minute
+        lesson.end_minute = end_minute
+        lesson.packed_color = packed_color
+        return lesson
+
+    @property
+    def start_time(self) -> time:
+        """Start of the lesson."""
+        return time(self.start_minute // 60, self.start_minute % 60)
+
+    @start_time.setter
+    def start_time(self, start_time: time) -> None:
+        self.start_minute = start_time.hour * 60 + start_time.minute
+
+    @property
+    def end_time(self) -> time:
+        """End of the lesson."""
+        return time(self.end_minute // 60, self.end_minute % 60)
+
+    @end_time.setter
+    def end_time(self, end_time: time) -> None:
+        self.end_minute = end_time.hour * 60 + end_time.minute
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        """Color of the lesson as red, green and blue."""
+        return (self.packed_color >> 16, (self.packed_color >> 8) & 0xFF, self.packed_color & 0xFF)
+
+    @color.setter
+    def color(self, color: Tuple[int, int, int]) -> None:
+        self.packed_color = (color[0] << 16) | (color[1] << 8) | color[2]
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares the lesson with another one by their values.
+
+        Lessons are mutable, so they are not hashable.
+
+        Args:
+            other (object): The other lesson.
+
+        Returns:
+            bool: True if all the attributes of the lessons are equal.
+        """
+        if not isinstance(other, Lesson):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute in self.__slots__)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Returns the state of the lesson to be pickled.
+
+        The state is the dictionary of the attributes lessons had before they kept the times in
+        minutes and the color packed, so the pickles stay readable by older versions.
+
+        Returns:
+            Dict[str, Any]: The name, the place, the instructor, the day, the start and end times
+                and the color of the lesson.
+        """
+        return {"name": self.name,
+                "place": self.place,
+                "instructor": self.instructor,
+                "day": self.day,
+                "start_time": self.start_time,
+                "end_time": self.end_time,
+                "color": self.color}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restores the lesson from the pickled state.
+
+        Lessons pickled by older versions have the same dictionary of attributes. The times and
+        the color are converted by their properties and the texts are interned.
+
+        Args:
+            state (Dict[str, Any]): The pickled attributes of the lesson.
+        """
+        for attribute, value in state.items():
+            setattr(self, attribute, sys.intern(value) if isinstance(value, str) else value)
+
     def get_hex_color(self) -> str:
         """Returns color of the lesson in the hexadecimal format.
-        
+
         Returns:
             str: String in format "#RRGGBB".
         """
-        return f"#{self.color[0]:02X}{self.color[1]:02X}{self.color[2]:02X}"
+        return f"#{self.packed_color:06X}"
 
     def set_hex_color(self, color: str):
         """
@@ -38,36 +159,4 @@ class Lesson:
         Args:
             color (str): String in format "#RRGGBB".
         """
-        self.color=(int(color[1:3], 16),
-                    int(color[3:5], 16),
-                    int(color[5:7], 16))
-
-    def has_collision(self, lesson_list: List["Lesson"])-> Tuple[bool, bool]:
-        """
-        Says whether a lesson is in collision with other lessons.
-        
-        Args:
-            lesson_list (List): List of lessons to compare to.
-
-        Returns: 
-            Tuple[bool, bool]: Two boolean values. First says whether the passed lesson has
-                collision. Second reports whether the lesson is first.
-        """
-        collision = False
-        first = False
-        number_of_collisions = 0
-        for index, lesson in enumerate(lesson_list):
-            if lesson is not self:
-                if (lesson.day == self.day
-                    and self.end_time > lesson.start_time
-                    and self.start_time < lesson.end_time):
-                    collision = True
-                    number_of_collisions += 1
-                    if self.start_time < lesson.start_time:
-                        first = True
-                    elif self.start_time == lesson.start_time:
-                        first = lesson_list.index(self) < index
-
-        if number_of_collisions >= 2:
-            raise Exception("V rozvrhu je hodina s více kolizemi.")
-        return collision, first
+        self.packed_color = int(color[1:7], 16)
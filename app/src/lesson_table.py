@@ -0,0 +1,410 @@
+"""
+Contains a columnar table of lessons for very large schedules.
+
+The lessons are kept in parallel typed arrays instead of objects, one array per attribute, and
+the texts are kept once in a table of strings. A table can be saved to a file whose arrays are
+mapped to memory when it is loaded, so they are not copied. All the numbers are little endian.
+
+    magic            4 bytes, b"RZVT"
+    version          unsigned 16-bit integer
+    reserved         unsigned 16-bit integer
+    lesson count     unsigned 32-bit integer
+    string count     unsigned 32-bit integer
+    name             unsigned 16-bit length and the name of the schedule in UTF-8
+    columns          for every column the values of all the lessons, each column starts at
+                     a multiple of 8 bytes:
+                         day as unsigned 8-bit integer, start and end as unsigned 16-bit minutes
+                         after midnight, color as unsigned 32-bit integer 0xRRGGBB, name, place and
+                         instructor as unsigned 32-bit indices to the strings
+    strings          for every string unsigned 16-bit length and the string in UTF-8
+"""
+import struct
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from app.src.day_index import MINUTES_IN_DAY
+from app.src.lesson import Lesson
+from app.src.overlap_layout import compute_interval_columns
+from app.utils import utilities
+
+TABLE_MAGIC = b"RZVT"
+TABLE_VERSION = 1
+
+TABLE_HEADER = struct.Struct("<4sHHII")
+COLUMN_ALIGNMENT = 8
+
+COLUMNS = (("days", np.dtype("<u1")),
+           ("starts", np.dtype("<u2")),
+           ("ends", np.dtype("<u2")),
+           ("colors", np.dtype("<u4")),
+           ("names", np.dtype("<u4")),
+           ("places", np.dtype("<u4")),
+           ("instructors", np.dtype("<u4")))
+
+DAYS = list(utilities.Day)
+
+class LessonTable():
+    """
+    Lessons stored in parallel typed arrays.
+
+    The table behaves as a list of lessons, the lessons are created from the arrays when they are
+    accessed. The arrays may be longer than the number of the lessons to leave room for appending.
+    Lessons of a day or of a time window are selected by vectorized comparisons of the arrays in
+    the order of the day, the start and the end, the order is cached until the table changes.
+    """
+
+    def __init__(self, capacity: int=0):
+        self.count = 0
+        self.days = np.zeros(capacity, dtype=COLUMNS[0][1])
+        self.starts = np.zeros(capacity, dtype=COLUMNS[1][1])
+        self.ends = np.zeros(capacity, dtype=COLUMNS[2][1])
+        self.colors = np.zeros(capacity, dtype=COLUMNS[3][1])
+        self.names = np.zeros(capacity, dtype=COLUMNS[4][1])
+        self.places = np.zeros(capacity, dtype=COLUMNS[5][1])
+        self.instructors = np.zeros(capacity, dtype=COLUMNS[6][1])
+        self.strings: List[str] = []
+        self.string_indexes: Dict[str, int] = {}
+        self.order: Optional[np.ndarray] = None
+        self.change_count = 0
+
+    @classmethod
+    def from_lessons(cls, lessons: Iterable[Lesson]) -> "LessonTable":
+        """
+        Creates a table of lessons.
+
+        Args:
+            lessons (Iterable[Lesson]): The lessons.
+
+        Returns:
+            LessonTable: The table.
+        """
+        lessons = list(lessons)
+        table = cls(len(lessons))
+        for lesson in lessons:
+            table.append(lesson)
+        return table
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Lesson]:
+        return iter(self.get_lessons(np.arange(self.count)))
+
+    def __getitem__(self, index: int) -> Lesson:
+        return self.get_lesson(self.get_position(index))
+
+    def __setitem__(self, index: int, lesson: Lesson) -> None:
+        self.store(self.get_position(index), lesson)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["order"] = None
+        for column, _ in COLUMNS:
+            state[column] = np.array(state[column][:self.count])
+        return state
+
+    def append(self, lesson: Lesson) -> None:
+        """
+        Appends a lesson to the end of the table.
+
+        The arrays are reallocated with double length when they are full.
+
+        Args:
+            lesson (Lesson): The lesson.
+        """
+        if self.count == len(self.days):
+            self.resize(max(2 * self.count, 16))
+        self.count += 1
+        self.store(self.count - 1, lesson)
+
+    def pop(self, index: int=-1) -> Lesson:
+        """
+        Removes a lesson from the table.
+
+        Args:
+            index (int): Index of the lesson.
+
+        Returns:
+            Lesson: The removed lesson.
+        """
+        position = self.get_position(index)
+        lesson = self.get_lesson(position)
+        for column, _ in COLUMNS:
+            array = getattr(self, column)
+            array[position:self.count - 1] = array[position + 1:self.count]
+        self.count -= 1
+        self.order = None
+        self.change_count += 1
+        return lesson
+
+    def get_position(self, index: int) -> int:
+        """
+        Returns the position of a lesson in the arrays.
+
+        Args:
+            index (int): Index of the lesson, negative indices count from the end.
+
+        Raises:
+            IndexError: If there is no lesson with the index.
+
+        Returns:
+            int: The position.
+        """
+        position = index + self.count if index < 0 else index
+        if not 0 <= position < self.count:
+            raise IndexError("Hodina s tímto indexem v rozvrhu není.")
+        return position
+
+    def store(self, position: int, lesson: Lesson) -> None:
+        """
+        Stores a lesson to a position of the arrays.
+
+        Args:
+            position (int): The position.
+            lesson (Lesson): The lesson.
+        """
+        self.days[position] = lesson.day.value
+        self.starts[position] = lesson.start_minute
+        self.ends[position] = lesson.end_minute
+        self.colors[position] = lesson.packed_color
+        self.names[position] = self.get_string_index(lesson.name)
+        self.places[position] = self.get_string_index(lesson.place)
+        self.instructors[position] = self.get_string_index(lesson.instructor)
+        self.order = None
+        self.change_count += 1
+
+    def resize(self, capacity: int) -> None:
+        """
+        Moves the arrays to new arrays with given length.
+
+        Args:
+            capacity (int): The length of the new arrays.
+        """
+        for column, dtype in COLUMNS:
+            array = np.zeros(capacity, dtype=dtype)
+            array[:self.count] = getattr(self, column)[:self.count]
+            setattr(self, column, array)
+
+    def get_string_index(self, string: str) -> int:
+        """
+        Returns the index of a string in the table of strings, a new string is added.
+
+        Args:
+            string (str): The string.
+
+        Returns:
+            int: The index.
+        """
+        index = self.string_indexes.get(string)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(string)
+            self.string_indexes[string] = index
+        return index
+
+    def get_lesson(self, position: int) -> Lesson:
+        """
+        Creates the lesson stored at a position of the arrays.
+
+        Args:
+            position (int): The position.
+
+        Returns:
+            Lesson: The lesson.
+        """
+        return Lesson.from_minutes(self.strings[self.names[position]],
+                                   self.strings[self.places[position]],
+                                   self.strings[self.instructors[position]],
+                                   DAYS[self.days[position]],
+                                   int(self.starts[position]),
+                                   int(self.ends[position]),
+                                   int(self.colors[position]))
+
+    def get_lessons(self, positions: np.ndarray) -> List[Lesson]:
+        """
+        Creates the lessons stored at positions of the arrays.
+
+        Args:
+            positions (np.ndarray): The positions.
+
+        Returns:
+            List[Lesson]: The lessons in the order of the positions.
+        """
+        strings = self.strings
+        return [Lesson.from_minutes(strings[name], strings[place], strings[instructor], DAYS[day], start, end, color)
+                for name, place, instructor, day, start, end, color
+                in zip(self.names[positions].tolist(),
+                       self.places[positions].tolist(),
+                       self.instructors[positions].tolist(),
+                       self.days[positions].tolist(),
+                       self.starts[positions].tolist(),
+                       self.ends[positions].tolist(),
+                       self.colors[positions].tolist())]
+
+    def get_order(self) -> np.ndarray:
+        """
+        Returns the positions of the lessons sorted by the day, the start and the end.
+
+        Lessons with the same day, start and end are kept in the order of the table.
+
+        Returns:
+            np.ndarray: The positions.
+        """
+        if self.order is None:
+            self.order = np.lexsort((self.ends[:self.count], self.starts[:self.count], self.days[:self.count]))
+        return self.order
+
+    def select(self,
+               days: Optional[Iterable[utilities.Day]]=None,
+               start: Optional[int]=None,
+               end: Optional[int]=None) -> np.ndarray:
+        """
+        Selects the lessons taking place in given days and overlapping a time window.
+
+        Args:
+            days (Optional[Iterable[utilities.Day]]): The days, all the days if None.
+            start (Optional[int]): The lessons end after this time in minutes after midnight.
+            end (Optional[int]): The lessons start before this time in minutes after midnight.
+
+        Returns:
+            np.ndarray: Positions of the lessons sorted by the day, the start and the end.
+        """
+        mask = np.ones(self.count, dtype=bool)
+        if days is not None:
+            mask &= np.isin(self.days[:self.count], [day.value for day in days])
+        if start is not None:
+            mask &= self.ends[:self.count] > start
+        if end is not None:
+            mask &= self.starts[:self.count] < end
+        order = self.get_order()
+        return order[mask[order]]
+
+    def get_intervals(self, positions: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Returns the starts and the ends of the lessons stored at positions of the arrays.
+
+        Args:
+            positions (np.ndarray): The positions.
+
+        Returns:
+            List[Tuple[int, int]]: Starts and ends in minutes after midnight.
+        """
+        return list(zip(self.starts[positions].tolist(), self.ends[positions].tolist()))
+
+    def get_day_layout(self, day: utilities.Day, start: int, end: int) -> List[Tuple[Lesson, Tuple[int, int]]]:
+        """
+        Returns the lessons of a day overlapping a time window with their columns.
+
+        The columns are assigned to all the lessons of the day, only the lessons in the window are
+        created.
+
+        Args:
+            day (utilities.Day): The day.
+            start (int): Start of the window in minutes after midnight.
+            end (int): End of the window in minutes after midnight.
+
+        Returns:
+            List[Tuple[Lesson, Tuple[int, int]]]: The lessons sorted by their start with their
+                column index and column count.
+        """
+        positions = self.select([day])
+        columns = compute_interval_columns(self.get_intervals(positions))
+        shown = np.flatnonzero((self.ends[positions] > start) & (self.starts[positions] < end))
+        return list(zip(self.get_lessons(positions[shown]), (columns[index] for index in shown.tolist())))
+
+def save_table(file_path: Path, name: str, table: LessonTable) -> None:
+    """
+    Saves a table of lessons to a file.
+
+    Args:
+        file_path (Path): Path to the file.
+        name (str): Name of the schedule.
+        table (LessonTable): The table.
+    """
+    from app.src.schedule_format import encode_string # the format module depends on this one
+    parts = [TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, 0, table.count, len(table.strings)),
+             encode_string(name)]
+    length = sum(len(part) for part in parts)
+    for column, dtype in COLUMNS:
+        padding = -length % COLUMN_ALIGNMENT
+        data = getattr(table, column)[:table.count].astype(dtype, copy=False).tobytes()
+        parts += [bytes(padding), data]
+        length += padding + len(data)
+    parts += [encode_string(string) for string in table.strings]
+    with open(file_path, "wb") as file:
+        file.write(b"".join(parts))
+
+def load_table(file_path: Path, memory_map: bool=True) -> Tuple[str, LessonTable]:
+    """
+    Loads a table of lessons from a file.
+
+    If the file is mapped to memory, the arrays of the table are views of the file, they are read
+    by the operating system only when they are accessed. Changes of the lessons are kept in memory
+    and they are not written to the file.
+
+    Args:
+        file_path (Path): Path to the file.
+        memory_map (bool): If True, the file is mapped to memory instead of being read.
+
+    Raises:
+        ValueError: If the file is not a table of lessons in a supported version or its values
+            are out of their ranges.
+
+    Returns:
+        Tuple[str, LessonTable]: Name of the schedule and the table.
+    """
+    from app.src.schedule_format import decode_string # the format module depends on this one
+    if memory_map and Path(file_path).stat().st_size:
+        data = np.memmap(file_path, dtype=np.uint8, mode="c")
+    else:
+        data = np.fromfile(file_path, dtype=np.uint8)
+    try:
+        magic, version, _, count, string_count = TABLE_HEADER.unpack(data[:TABLE_HEADER.size].tobytes())
+        if magic != TABLE_MAGIC:
+            raise ValueError("Soubor neobsahuje tabulku hodin.")
+        if version != TABLE_VERSION:
+            raise ValueError(f"Nepodporovaná verze tabulky hodin: {version}.")
+        name, offset = decode_string(data, TABLE_HEADER.size)
+
+        table = LessonTable()
+        for column, dtype in COLUMNS:
+            offset += -offset % COLUMN_ALIGNMENT
+            length = count * dtype.itemsize
+            if offset + length > len(data):
+                raise ValueError("Soubor s tabulkou hodin je zkrácený.")
+            setattr(table, column, data[offset:offset + length].view(dtype))
+            offset += length
+        table.count = count
+        for _ in range(string_count):
+            string, offset = decode_string(data, offset)
+            table.get_string_index(string)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError("Soubor s tabulkou hodin je poškozený.") from e
+    if len(table.strings) != string_count or not is_table_valid(table):
+        raise ValueError("Soubor s tabulkou hodin je poškozený.")
+    return name, table
+
+def is_table_valid(table: LessonTable) -> bool:
+    """
+    Checks that the days, the times and the string indices of the lessons are in their ranges.
+
+    Args:
+        table (LessonTable): The table.
+
+    Returns:
+        bool: True if all the values can be turned to lessons.
+    """
+    if not table.count:
+        return True
+    string_indices = (table.names, table.places, table.instructors)
+    return (int(table.days.max()) < len(DAYS)
+            and max(int(indices.max()) for indices in string_indices) < len(table.strings)
+            and int(table.ends.max()) <= MINUTES_IN_DAY
+            and not np.any(table.starts > table.ends))
@@ -0,0 +1,194 @@
+"""Contains a bitset representation of the time taken by a schedule."""
+import functools
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from app.src.lesson import Lesson
+from app.src.day_index import MINUTES_IN_DAY
+from app.src.day_index import get_lesson_interval
+from app.utils import config
+from app.utils import utilities
+
+class Occupancy():
+    """
+    Time taken by lessons stored as one integer bitmask per day.
+
+    Every bit stands for one slot of the day, the slots are given number of minutes long. A slot
+    is taken if any lesson takes place in it at least partially. Lessons ending before they start
+    (over midnight) are not counted.
+    """
+
+    def __init__(self, masks: Tuple[int, ...]=(0,)*7, granularity: int=config.OCCUPANCY_GRANULARITY):
+        if MINUTES_IN_DAY % granularity:
+            raise ValueError("Délka dne musí být násobkem délky úseku.")
+        self.masks = tuple(masks)
+        self.granularity = granularity
+
+    @classmethod
+    def from_lessons(cls, lessons: Iterable[Lesson], granularity: int=config.OCCUPANCY_GRANULARITY) -> "Occupancy":
+        """
+        Builds the occupancy of lessons.
+
+        Args:
+            lessons (Iterable[Lesson]): The lessons.
+            granularity (int): Length of one slot in minutes.
+
+        Returns:
+            Occupancy: The occupancy.
+        """
+        masks = [0] * 7
+        for lesson in lessons:
+            masks[lesson.day.value] |= get_interval_mask(get_lesson_interval(lesson), granularity)
+        return cls(tuple(masks), granularity)
+
+    def get_slot_count(self) -> int:
+        """
+        Returns the number of slots of one day.
+
+        Returns:
+            int: The number of slots.
+        """
+        return MINUTES_IN_DAY // self.granularity
+
+    def collides(self, lesson: Lesson) -> bool:
+        """
+        Says whether a lesson takes place at a taken time.
+
+        Args:
+            lesson (Lesson): The lesson.
+
+        Returns:
+            bool: True if the lesson collides.
+        """
+        return bool(self.masks[lesson.day.value]
+                    & get_interval_mask(get_lesson_interval(lesson), self.granularity))
+
+    def get_intervals(self, day: utilities.Day) -> List[Tuple[int, int]]:
+        """
+        Returns the taken intervals of a day.
+
+        Args:
+            day (utilities.Day): The day.
+
+        Returns:
+            List[Tuple[int, int]]: Starts and ends of the intervals in minutes after midnight.
+        """
+        return [(start * self.granularity, end * self.granularity)
+                for start, end in get_mask_runs(self.masks[day.value])]
+
+    def get_free_intervals(self, day: utilities.Day) -> List[Tuple[int, int]]:
+        """
+        Returns the free intervals of a day.
+
+        Args:
+            day (utilities.Day): The day.
+
+        Returns:
+            List[Tuple[int, int]]: Starts and ends of the intervals in minutes after midnight.
+        """
+        free_mask = self.masks[day.value] ^ ((1 << self.get_slot_count()) - 1)
+        return [(start * self.granularity, end * self.granularity)
+                for start, end in get_mask_runs(free_mask)]
+
+    def __or__(self, other: "Occupancy") -> "Occupancy":
+        """Returns the time taken in any of the two occupancies."""
+        self.check_granularity(other)
+        return Occupancy(tuple(mask | other_mask for mask, other_mask in zip(self.masks, other.masks)),
+                         self.granularity)
+
+    def __and__(self, other: "Occupancy") -> "Occupancy":
+        """Returns the time taken in both of the occupancies."""
+        self.check_granularity(other)
+        return Occupancy(tuple(mask & other_mask for mask, other_mask in zip(self.masks, other.masks)),
+                         self.granularity)
+
+    def __eq__(self, other: object) -> bool:
+        """Says whether two occupancies take the same slots."""
+        if not isinstance(other, Occupancy):
+            return NotImplemented
+        return self.masks == other.masks and self.granularity == other.granularity
+
+    def __hash__(self) -> int:
+        """Returns the hash of the masks and the granularity."""
+        return hash((self.masks, self.granularity))
+
+    def __repr__(self) -> str:
+        """Returns the masks and the granularity of the occupancy."""
+        return f"Occupancy({self.masks!r}, {self.granularity!r})"
+
+    def check_granularity(self, other: "Occupancy") -> None:
+        """
+        Checks that two occupancies can be combined.
+
+        Args:
+            other (Occupancy): The other occupancy.
+
+        Raises:
+            ValueError: If the occupancies have different granularities.
+        """
+        if self.granularity != other.granularity:
+            raise ValueError("Obsazenosti mají různou délku úseku.")
+
+def union(occupancies: Iterable[Occupancy]) -> Occupancy:
+    """
+    Returns the time taken in any of the occupancies.
+
+    Args:
+        occupancies (Iterable[Occupancy]): At least one occupancy.
+
+    Returns:
+        Occupancy: The union.
+    """
+    return functools.reduce(lambda first, second: first | second, occupancies)
+
+def intersection(occupancies: Iterable[Occupancy]) -> Occupancy:
+    """
+    Returns the time taken in all of the occupancies.
+
+    Args:
+        occupancies (Iterable[Occupancy]): At least one occupancy.
+
+    Returns:
+        Occupancy: The intersection.
+    """
+    return functools.reduce(lambda first, second: first & second, occupancies)
+
+def get_interval_mask(interval: Tuple[int, int], granularity: int) -> int:
+    """
+    Returns the mask of the slots an interval reaches into.
+
+    Args:
+        interval (Tuple[int, int]): Start and end in minutes after midnight.
+        granularity (int): Length of one slot in minutes.
+
+    Returns:
+        int: The mask, zero for empty intervals.
+    """
+    start_slot = interval[0] // granularity
+    end_slot = -(-interval[1] // granularity)
+    if end_slot <= start_slot:
+        return 0
+    return ((1 << (end_slot - start_slot)) - 1) << start_slot
+
+def get_mask_runs(mask: int) -> List[Tuple[int, int]]:
+    """
+    Returns the runs of set bits of a mask.
+
+    Every step skips a whole run, so the work depends on the number of runs, not on the number of
+    bits.
+
+    Args:
+        mask (int): The mask.
+
+    Returns:
+        List[Tuple[int, int]]: The first bit of every run and the bit after it.
+    """
+    runs = []
+    while mask:
+        start = (mask & -mask).bit_length() - 1
+        after_run = (mask | (mask - 1)) + 1
+        end = (after_run & -after_run).bit_length() - 1
+        runs.append((start, end))
+        mask &= ~((1 << end) - 1)
+    return runs
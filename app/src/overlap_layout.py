@@ -0,0 +1,71 @@
+"""Contains the layout of overlapping lessons."""
+import heapq
+from typing import List
+from typing import Tuple
+
+from app.src.lesson import Lesson
+
+def compute_day_columns(lessons: List[Lesson]) -> List[Tuple[int, int]]:
+    """
+    Assigns columns to the lessons of one day sorted by their start.
+
+    Args:
+        lessons (List[Lesson]): The lessons of one day sorted by their start.
+
+    Returns:
+        List[Tuple[int, int]]: Column index and column count of every lesson in the order of the
+            list.
+    """
+    return compute_interval_columns([(lesson.start_minute, lesson.end_minute) for lesson in lessons])
+
+def compute_interval_columns(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Assigns columns to the intervals of the lessons of one day sorted by their start.
+
+    The intervals are swept in their order. An interval takes the lowest column freed by the
+    intervals that ended before it started. Intervals connected by overlaps form a group and all
+    the intervals of the group get the number of columns the group needed. Runs in O(n log n).
+
+    Args:
+        intervals (List[Tuple[int, int]]): Starts and ends of the lessons in minutes after
+            midnight sorted by the start.
+
+    Returns:
+        List[Tuple[int, int]]: Column index and column count of every interval in the order of the
+            list.
+    """
+    columns = [(0, 1)] * len(intervals)
+    group: List[Tuple[int, int]] = []
+    group_columns = 0
+    active: List[Tuple] = []
+    free_columns: List[int] = []
+    for index, (start, end) in enumerate(intervals):
+        while active and active[0][0] <= start:
+            heapq.heappush(free_columns, heapq.heappop(active)[1])
+        if not active:
+            close_group(group, group_columns, columns)
+            group_columns = 0
+            free_columns.clear()
+
+        if free_columns:
+            column = heapq.heappop(free_columns)
+        else:
+            column = group_columns
+            group_columns += 1
+        heapq.heappush(active, (end, column))
+        group.append((index, column))
+    close_group(group, group_columns, columns)
+    return columns
+
+def close_group(group: List[Tuple[int, int]], column_count: int, columns: List[Tuple[int, int]]) -> None:
+    """
+    Stores the columns of a finished group of overlapping lessons and empties the group.
+
+    Args:
+        group (List[Tuple[int, int]]): Indices of the lessons of the group and their columns.
+        column_count (int): Number of columns the group needed.
+        columns (List[Tuple[int, int]]): Column index and count of every lesson to store to.
+    """
+    for index, column in group:
+        columns[index] = (column, column_count)
+    group.clear()
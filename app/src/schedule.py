@@ -1,14 +1,147 @@
 """Contains a class for the schedules."""
-import pickle
+import threading
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
 
 from app.src.lesson import Lesson
+from app.src.lesson_table import LessonTable
+from app.src.day_index import DayIndex
+from app.src.day_index import MINUTES_IN_DAY
+from app.src.occupancy import Occupancy
+from app.src.overlap_layout import compute_day_columns
+from app.utils import config
+from app.utils import utilities
+
+class ScheduleChange(NamedTuple):
+    """Change of a schedule announced to its subscribers."""
+    schedule: "Schedule"
+    kind: utilities.ChangeKind
+    index: int
+    lesson: Optional[Lesson]
+    name: Optional[str]
 
 class Schedule:
-    """Data structer for the schedules"""
-    def __init__(self, name):
+    """
+    Data structer for the schedules
+
+    The lessons are kept in a list of lessons or, for very large schedules, in a columnar
+    LessonTable. The indexes of the days of a schedule with a table are built only for the days
+    which are asked for and they are dropped when the lessons of the day change.
+
+    The schedule is changed only on the main thread. A thread reading the schedule while it may be
+    changed (eg. the painter rendering on a worker) must hold its lock, which every change holds.
+    """
+    def __init__(self, name, lessons: Optional[LessonTable]=None):
         self.name = name
-        self.lessons: List[Lesson] = []
+        self.lessons: Union[List[Lesson], LessonTable] = [] if lessons is None else lessons
+        self.dirty_days: Set[utilities.Day] = set()
+        self.day_indexes: Dict[utilities.Day, DayIndex] = {}
+        self.occupancies: Dict[int, Occupancy] = {}
+        self.subscribers: List[Callable[[ScheduleChange], None]] = []
+        self.lock = threading.RLock()
+        self.build_day_indexes()
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state of the schedule to be pickled.
+
+        The indexes of the days and the cached occupancies are not pickled, they are built again
+        when the schedule is loaded. The changed days, the subscribers and the lock are not
+        pickled either.
+
+        Returns:
+            dict: The pickled attributes of the schedule.
+        """
+        state = self.__dict__.copy()
+        state.pop("day_indexes", None)
+        state.pop("dirty_days", None)
+        state.pop("occupancies", None)
+        state.pop("subscribers", None)
+        state.pop("lock", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the schedule from the pickled state.
+
+        Schedules saved by older versions of the application lack some of the attributes, so
+        they are created empty. The changed days pickled by older versions are forgotten.
+
+        Args:
+            state (dict): The pickled attributes of the schedule.
+        """
+        self.__dict__.update(state)
+        self.dirty_days = set()
+        self.occupancies = {}
+        self.subscribers = []
+        self.lock = threading.RLock()
+        self.build_day_indexes()
+
+    def build_day_indexes(self) -> None:
+        """Builds the indexes of the days from the lessons, a schedule with a table builds them lazily."""
+        self.day_indexes = {}
+        if self.is_columnar():
+            return
+        self.day_indexes = {day: DayIndex() for day in utilities.Day}
+        for lesson in self.lessons:
+            self.day_indexes[lesson.day].add(lesson)
+
+    def is_columnar(self) -> bool:
+        """
+        Says whether the lessons are kept in a LessonTable.
+
+        Returns:
+            bool: True if the lessons are kept in a table.
+        """
+        return isinstance(self.lessons, LessonTable)
+
+    def get_day_index(self, day: utilities.Day) -> DayIndex:
+        """
+        Returns the index of a day, the index is built if the schedule has a table.
+
+        Args:
+            day (utilities.Day): The day.
+
+        Returns:
+            DayIndex: The index.
+        """
+        with self.lock:
+            if day not in self.day_indexes:
+                day_index = DayIndex()
+                for lesson in self.lessons.get_lessons(self.lessons.select([day])):
+                    day_index.add(lesson)
+                self.day_indexes[day] = day_index
+            return self.day_indexes[day]
+
+    def index_lesson(self, lesson: Lesson) -> None:
+        """
+        Adds a lesson to the index of its day.
+
+        Args:
+            lesson (Lesson): The lesson.
+        """
+        if self.is_columnar():
+            self.day_indexes.pop(lesson.day, None)
+        else:
+            self.day_indexes[lesson.day].add(lesson)
+
+    def unindex_lesson(self, lesson: Lesson) -> None:
+        """
+        Removes a lesson from the index of its day.
+
+        Args:
+            lesson (Lesson): The lesson, it must be the object in the lessons list.
+        """
+        if self.is_columnar():
+            self.day_indexes.pop(lesson.day, None)
+        else:
+            self.day_indexes[lesson.day].remove(lesson)
 
     def add_lesson(self, lesson: Lesson) -> None:
         """
@@ -17,7 +150,12 @@ class Schedule:
         Args:
             lesson (Lesson): Lesson to be added.
         """
-        self.lessons.append(lesson)
+        with self.lock:
+            self.lessons.append(lesson)
+            self.index_lesson(lesson)
+            self.occupancies.clear()
+            self.dirty_days.add(lesson.day)
+        self.notify(ScheduleChange(self, utilities.ChangeKind.ADD, len(self.lessons) - 1, lesson, None))
 
     def edit_lesson(self, index: int, new_lesson: Lesson) -> None:
         """
@@ -27,7 +165,14 @@ class Schedule:
             index (int): Index of the lesson in the lessons list to be edited.
             new_lesson (Lesson): New lesson which replaces the old lesson.
         """
-        self.lessons[index] = new_lesson
+        with self.lock:
+            old_lesson = self.lessons[index]
+            self.unindex_lesson(old_lesson)
+            self.lessons[index] = new_lesson
+            self.index_lesson(new_lesson)
+            self.occupancies.clear()
+            self.dirty_days.update((old_lesson.day, new_lesson.day))
+        self.notify(ScheduleChange(self, utilities.ChangeKind.EDIT, index, new_lesson, None))
 
     def remove_lesson(self, index: int) -> None:
         """
@@ -36,17 +181,141 @@ class Schedule:
         Args:
             lesson (Lesson): Lesson to be removed.
         """
-        self.lessons.pop(index)
+        with self.lock:
+            lesson = self.lessons.pop(index)
+            self.unindex_lesson(lesson)
+            self.occupancies.clear()
+            self.dirty_days.add(lesson.day)
+        self.notify(ScheduleChange(self, utilities.ChangeKind.REMOVE, index, None, None))
+
+    def get_lessons_on_day(self, day: utilities.Day) -> List[Lesson]:
+        """
+        Returns the lessons of a day in the order of their start.
+
+        Args:
+            day (utilities.Day): The day.
+
+        Returns:
+            List[Lesson]: The lessons.
+        """
+        return self.get_day_index(day).get_lessons()
+
+    def get_overlapping_lessons(self, day: utilities.Day, start: int, end: int) -> List[Lesson]:
+        """
+        Returns the lessons of a day overlapping the interval [start, end).
+
+        Args:
+            day (utilities.Day): The day.
+            start (int): Start of the interval in minutes after midnight.
+            end (int): End of the interval in minutes after midnight.
+
+        Returns:
+            List[Lesson]: The lessons in the order of their start.
+        """
+        return self.get_day_index(day).get_overlapping(start, end)
+
+    def get_day_layout(self, day: utilities.Day, start: int, end: int) -> List[Tuple[Lesson, Tuple[int, int]]]:
+        """
+        Returns the lessons of a day overlapping a time window with their columns.
+
+        The columns are assigned to all the lessons of the day, so lessons outside the window
+        still split the columns of the lessons they overlap.
+
+        Args:
+            day (utilities.Day): The day.
+            start (int): Start of the window in minutes after midnight.
+            end (int): End of the window in minutes after midnight.
+
+        Returns:
+            List[Tuple[Lesson, Tuple[int, int]]]: The lessons in the order of their start with
+                their column index and column count.
+        """
+        if self.is_columnar():
+            return self.lessons.get_day_layout(day, start, end)
+        day_lessons = self.get_lessons_on_day(day)
+        return [(lesson, columns) for lesson, columns in zip(day_lessons, compute_day_columns(day_lessons))
+                if lesson.end_minute > start and lesson.start_minute < end]
+
+    def get_lessons_key(self) -> Tuple:
+        """
+        Returns a key of the lessons which differs whenever the lessons change.
+
+        The key of a list of lessons contains the values of the lessons, the key of a table
+        contains the number of its changes, so the lessons are not created for it.
+
+        Returns:
+            Tuple: The key.
+        """
+        if self.is_columnar():
+            return (id(self.lessons), self.lessons.change_count)
+        return tuple((lesson.name,
+                      lesson.place,
+                      lesson.instructor,
+                      lesson.day,
+                      lesson.start_minute,
+                      lesson.end_minute,
+                      lesson.packed_color) for lesson in self.lessons)
+
+    def get_free_gaps(self,
+                      day: utilities.Day,
+                      minimal_length: int,
+                      start: int=0,
+                      end: int=MINUTES_IN_DAY) -> List[Tuple[int, int]]:
+        """
+        Returns the free gaps of at least given length between the lessons of a day.
+
+        Args:
+            day (utilities.Day): The day.
+            minimal_length (int): Minimal length of the gaps in minutes.
+            start (int): Start of the searched interval in minutes after midnight.
+            end (int): End of the searched interval in minutes after midnight.
+
+        Returns:
+            List[Tuple[int, int]]: Starts and ends of the gaps in minutes after midnight.
+        """
+        return self.get_day_index(day).get_free_gaps(minimal_length, start, end)
+
+    def get_occupancy(self, granularity: int=config.OCCUPANCY_GRANULARITY) -> Occupancy:
+        """
+        Returns the time taken by the lessons as bitmasks of the days.
+
+        The occupancy is cached until the lessons of the schedule change.
+
+        Args:
+            granularity (int): Length of one slot of the occupancy in minutes.
+
+        Returns:
+            Occupancy: The occupancy.
+        """
+        if granularity not in self.occupancies:
+            self.occupancies[granularity] = Occupancy.from_lessons(self.lessons, granularity)
+        return self.occupancies[granularity]
+
+    def pop_dirty_days(self) -> Set[utilities.Day]:
+        """
+        Returns the days changed since the last call and forgets them.
+
+        A day is changed if a lesson taking place on it was added, edited or removed. The painter
+        does not need the days, it finds the changed lessons by comparing its plans, the days tell
+        the windows whether the schedule has to be drawn again at all.
+
+        Returns:
+            Set[utilities.Day]: The changed days.
+        """
+        with self.lock:
+            dirty_days = self.dirty_days
+            self.dirty_days = set()
+        return dirty_days
 
     def save_to_txt_file(self, filename: str) -> None:
         """
-        Saves the schedule to a TXT file.
-        
+        Saves the schedule to a file in the binary schedule format.
+
         Args:
             filename (str): Name of the file to save the schedule to.
         """
-        with open(filename, 'wb') as file:
-            pickle.dump(self, file)
+        from app.src import schedule_format # the format module depends on this one
+        schedule_format.save_file(self, filename)
 
     def rename(self, new_name: str):
         """
@@ -55,4 +324,34 @@ class Schedule:
         Args:
             new_name (str): Name to replace the old name of the schedule.
         """
-        self.name = new_name
+        with self.lock:
+            self.name = new_name
+        self.notify(ScheduleChange(self, utilities.ChangeKind.RENAME, -1, None, new_name))
+
+    def subscribe(self, callback: Callable[[ScheduleChange], None]) -> None:
+        """
+        Registers a function called with every change of the schedule.
+
+        Args:
+            callback (Callable[[ScheduleChange], None]): The function.
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ScheduleChange], None]) -> None:
+        """
+        Removes a registered function.
+
+        Args:
+            callback (Callable[[ScheduleChange], None]): The function.
+        """
+        self.subscribers.remove(callback)
+
+    def notify(self, change: ScheduleChange) -> None:
+        """
+        Calls all the subscribers with a change of the schedule.
+
+        Args:
+            change (ScheduleChange): The change.
+        """
+        for callback in list(self.subscribers):
+            callback(change)
@@ -0,0 +1,247 @@
+"""Contains a SQLite database of schedules for queries across all the schedules."""
+import sqlite3
+from pathlib import Path
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.schedule_index import ScheduleIndex
+from app.src import schedule_loader
+from app.src.day_index import get_lesson_interval
+from app.utils import config
+from app.utils import utilities
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    file_path TEXT UNIQUE,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS lessons (
+    id INTEGER PRIMARY KEY,
+    schedule_id INTEGER NOT NULL REFERENCES schedules(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    place TEXT NOT NULL,
+    instructor TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    color INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedules_name ON schedules (name);
+CREATE INDEX IF NOT EXISTS lessons_schedule ON lessons (schedule_id, position);
+CREATE INDEX IF NOT EXISTS lessons_time ON lessons (day, start_minute, end_minute);
+CREATE INDEX IF NOT EXISTS lessons_place ON lessons (place, day, start_minute);
+CREATE INDEX IF NOT EXISTS lessons_instructor ON lessons (instructor, day, start_minute);
+"""
+
+class LessonMatch(NamedTuple):
+    """Lesson found in the database with the name of its schedule."""
+    schedule_name: str
+    lesson: Lesson
+
+class ScheduleDatabase():
+    """
+    Keeps the schedules and their lessons in a SQLite database.
+
+    The lessons are indexed by their time, place and instructor, so they can be searched across all
+    the schedules without loading them. The schedules can be imported from the schedule folder,
+    only the files whose content hash differs from the database are loaded again.
+
+    The schedules imported from files are told apart by their file paths, so schedules of two files
+    may have the same name. The database is only a copy of the folder, a database of an older
+    version is emptied and imported again.
+    """
+
+    def __init__(self, path: Path=config.DATABASE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Nepodporovaná verze databáze rozvrhů: {version}.")
+        with self.connection:
+            if version < SCHEMA_VERSION:
+                self.connection.executescript("DROP TABLE IF EXISTS lessons; DROP TABLE IF EXISTS schedules;")
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Closes the database."""
+        self.connection.close()
+
+    def save_schedule(self,
+                      schedule: Schedule,
+                      file_path: Optional[str]=None,
+                      content_hash: Optional[str]=None) -> None:
+        """
+        Saves a schedule to the database.
+
+        A schedule with the same file path is replaced, a schedule without a file path replaces
+        the schedule with the same name which has no file path either.
+
+        Args:
+            schedule (Schedule): The schedule.
+            file_path (Optional[str]): Path to the file the schedule has been loaded from.
+            content_hash (Optional[str]): Hash of the content of the file.
+        """
+        with self.connection:
+            if file_path is None:
+                self.connection.execute("DELETE FROM schedules WHERE file_path IS NULL AND name = ?", (schedule.name,))
+            else:
+                self.connection.execute("DELETE FROM schedules WHERE file_path = ?", (file_path,))
+            schedule_id = self.connection.execute("INSERT INTO schedules (name, file_path, content_hash) VALUES (?, ?, ?)",
+                                                  (schedule.name, file_path, content_hash)).lastrowid
+            self.connection.executemany("INSERT INTO lessons (schedule_id, position, name, place, instructor, day, "
+                                        "start_minute, end_minute, color) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        ((schedule_id, position, lesson.name, lesson.place, lesson.instructor,
+                                          lesson.day.value, *get_lesson_interval(lesson),
+                                          lesson.packed_color)
+                                         for position, lesson in enumerate(schedule.lessons)))
+
+    def load_schedule(self, name: str) -> Optional[Schedule]:
+        """
+        Loads a schedule from the database, the first saved one if more schedules have the name.
+
+        Args:
+            name (str): Name of the schedule.
+
+        Returns:
+            Optional[Schedule]: The schedule or None if there is no schedule with the name.
+        """
+        row = self.connection.execute("SELECT id FROM schedules WHERE name = ? ORDER BY id", (name,)).fetchone()
+        if row is None:
+            return None
+        schedule = Schedule(name)
+        for lesson_row in self.connection.execute("SELECT name, place, instructor, day, start_minute, end_minute, "
+                                                  "color FROM lessons WHERE schedule_id = ? ORDER BY position",
+                                                  row):
+            schedule.add_lesson(create_lesson(lesson_row))
+        return schedule
+
+    def delete_schedule(self, name: str) -> None:
+        """
+        Deletes the schedules with a name and their lessons from the database.
+
+        Args:
+            name (str): Name of the schedule.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM schedules WHERE name = ?", (name,))
+
+    def get_schedule_names(self) -> List[str]:
+        """
+        Returns the names of the schedules in the database.
+
+        Returns:
+            List[str]: The names in alphabetical order, a name of more schedules only once.
+        """
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT name FROM schedules ORDER BY name")]
+
+    def import_folder(self, folder: Path=config.SCHEDULE_FOLDER_PATH) -> List[Tuple[Path, Exception]]:
+        """
+        Imports the schedules saved in a folder.
+
+        Only the files changed since the last import are loaded. Schedules imported from files
+        which have been removed are deleted. The import reads all the files of the folder, so it
+        should not run on the thread of the user interface.
+
+        Args:
+            folder (Path): The folder.
+
+        Returns:
+            List[Tuple[Path, Exception]]: Files which could not be imported with the errors.
+        """
+        schedule_index = ScheduleIndex(folder)
+        errors = schedule_index.refresh()
+        entries = {entry.file_path: entry for entry in schedule_index.get_entries()}
+        imported = {row[0]: row[1] for row in self.connection.execute("SELECT file_path, content_hash FROM schedules "
+                                                                      "WHERE file_path IS NOT NULL")}
+
+        with self.connection:
+            for file_path in set(imported) - set(entries):
+                self.connection.execute("DELETE FROM schedules WHERE file_path = ?", (file_path,))
+        changed = [Path(file_path) for file_path, entry in entries.items()
+                   if imported.get(file_path) != entry.content_hash]
+        report = schedule_loader.load_schedules(changed)
+        for file, schedule in report.schedules:
+            self.save_schedule(schedule, str(file), entries[str(file)].content_hash)
+        return errors + report.errors
+
+    def find_lessons(self,
+                     day: Optional[utilities.Day]=None,
+                     start: Optional[int]=None,
+                     end: Optional[int]=None,
+                     place: Optional[str]=None,
+                     instructor: Optional[str]=None) -> List[LessonMatch]:
+        """
+        Finds the lessons of all the schedules matching all the given conditions.
+
+        Args:
+            day (Optional[utilities.Day]): Day of the lessons.
+            start (Optional[int]): The lessons end after this time in minutes after midnight.
+            end (Optional[int]): The lessons start before this time in minutes after midnight.
+            place (Optional[str]): Place of the lessons.
+            instructor (Optional[str]): Instructor of the lessons.
+
+        Returns:
+            List[LessonMatch]: The lessons ordered by the day, the start and the schedule name.
+        """
+        conditions = []
+        parameters = []
+        for column, operator, value in (("lessons.day", "=", None if day is None else day.value),
+                                        ("lessons.end_minute", ">", start),
+                                        ("lessons.start_minute", "<", end),
+                                        ("lessons.place", "=", place),
+                                        ("lessons.instructor", "=", instructor)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute("SELECT schedules.name, lessons.name, lessons.place, lessons.instructor, "
+                                       "lessons.day, lessons.start_minute, lessons.end_minute, lessons.color "
+                                       "FROM lessons JOIN schedules ON schedules.id = lessons.schedule_id "
+                                       f"{where} ORDER BY lessons.day, lessons.start_minute, schedules.name",
+                                       parameters)
+        return [LessonMatch(row[0], create_lesson(row[1:])) for row in rows]
+
+    def find_schedules(self,
+                       day: Optional[utilities.Day]=None,
+                       start: Optional[int]=None,
+                       end: Optional[int]=None,
+                       place: Optional[str]=None,
+                       instructor: Optional[str]=None) -> List[str]:
+        """
+        Finds the schedules with a lesson matching all the given conditions.
+
+        Args:
+            day (Optional[utilities.Day]): Day of the lesson.
+            start (Optional[int]): The lesson ends after this time in minutes after midnight.
+            end (Optional[int]): The lesson starts before this time in minutes after midnight.
+            place (Optional[str]): Place of the lesson.
+            instructor (Optional[str]): Instructor of the lesson.
+
+        Returns:
+            List[str]: Names of the schedules in alphabetical order.
+        """
+        return sorted({match.schedule_name for match in self.find_lessons(day, start, end, place, instructor)})
+
+def create_lesson(row: Tuple) -> Lesson:
+    """
+    Creates a lesson from a row of the lessons table.
+
+    Args:
+        row (Tuple): The name, the place, the instructor, the day, the start, the end and the color.
+
+    Returns:
+        Lesson: The lesson.
+    """
+    name, place, instructor, day, start, end, color = row
+    return Lesson.from_minutes(name, place, instructor, utilities.Day(day), start, end, color)
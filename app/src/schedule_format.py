@@ -0,0 +1,438 @@
+"""
+Contains the file formats of the schedules.
+
+The schedules are saved in a compact binary format, version 1. All the numbers are little endian.
+
+    magic            4 bytes, b"RZVR"
+    version          unsigned 16-bit integer
+    name             unsigned 16-bit length and the name of the schedule in UTF-8
+    lesson count     unsigned 32-bit integer
+    string count     unsigned 32-bit integer
+    strings          for every string unsigned 16-bit length and the string in UTF-8
+    lessons          for every lesson 18 bytes:
+                         name, place and instructor as unsigned 32-bit indices to the strings,
+                         start and end as unsigned 16-bit minutes after the start of the week
+                         (Monday 00:00), color as unsigned 32-bit integer 0xRRGGBB
+
+Every string is saved only once. The name and the number of the lessons are at the start of the
+file, so they can be read without decoding the rest. The JSON variant keeps the same data readable
+by people:
+
+    {"format": "rozvrh", "version": 1, "name": "...",
+     "lessons": [{"name": "...", "place": "...", "instructor": "...", "day": 0,
+                  "start": "08:00", "end": "09:00", "color": "#FF0000"}]}
+
+Files saved by older versions of the application contain a pickled schedule. They can still be
+loaded and they can be converted by migrate_file and migrate_folder.
+"""
+import json
+import os
+import pickle
+import struct
+from datetime import time
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Sequence
+from typing import Tuple
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.day_index import MINUTES_IN_DAY
+from app.src.day_index import get_lesson_interval
+from app.utils import utilities
+
+MAGIC = b"RZVR"
+FORMAT_NAME = "rozvrh"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sH")
+LENGTH = struct.Struct("<H")
+COUNT = struct.Struct("<I")
+LESSON = struct.Struct("<IIIHHI")
+LESSON_TIMES = struct.Struct("<HHI")
+
+class ScheduleMetadata(NamedTuple):
+    """Data of a schedule file which can be read without decoding the lessons."""
+    name: str
+    lesson_count: int
+
+def encode_binary(schedule: Schedule) -> bytes:
+    """
+    Encodes a schedule in the binary format.
+
+    Args:
+        schedule (Schedule): The schedule.
+
+    Returns:
+        bytes: The encoded schedule.
+    """
+    return encode_lessons(schedule.name, schedule.lessons)
+
+def encode_lessons(name: str, lessons: Sequence[Lesson]) -> bytes:
+    """
+    Encodes a schedule given by its name and lessons in the binary format.
+
+    Args:
+        name (str): Name of the schedule.
+        lessons (Sequence[Lesson]): Lessons of the schedule.
+
+    Returns:
+        bytes: The encoded schedule.
+    """
+    string_indices: Dict[str, int] = {}
+    lesson_records = []
+    for lesson in lessons:
+        strings = [string_indices.setdefault(string, len(string_indices))
+                   for string in (lesson.name, lesson.place, lesson.instructor)]
+        start, end = get_week_minutes(lesson)
+        lesson_records.append(LESSON.pack(*strings, start, end, lesson.packed_color))
+
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION),
+             encode_string(name),
+             COUNT.pack(len(lessons)),
+             COUNT.pack(len(string_indices))]
+    parts += [encode_string(string) for string in string_indices]
+    parts += lesson_records
+    return b"".join(parts)
+
+def decode_binary(data: bytes) -> Schedule:
+    """
+    Decodes a schedule from the binary format.
+
+    Args:
+        data (bytes): The encoded schedule.
+
+    Raises:
+        ValueError: If the data are not a schedule in a supported version of the format.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    metadata, offset = decode_metadata(data)
+    try:
+        (string_count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        strings = []
+        for _ in range(string_count):
+            string, offset = decode_string(data, offset)
+            strings.append(string)
+        lesson_data = data[offset:offset + metadata.lesson_count * LESSON.size]
+        if len(lesson_data) != metadata.lesson_count * LESSON.size:
+            raise ValueError("Soubor s rozvrhem je zkrácený.")
+
+        schedule = Schedule(metadata.name)
+        for name, place, instructor, start, end, color in LESSON.iter_unpack(lesson_data):
+            schedule.add_lesson(Lesson.from_minutes(strings[name],
+                                                    strings[place],
+                                                    strings[instructor],
+                                                    utilities.Day(start // MINUTES_IN_DAY),
+                                                    start % MINUTES_IN_DAY,
+                                                    end % MINUTES_IN_DAY,
+                                                    color))
+    except (struct.error, IndexError) as e:
+        raise ValueError("Soubor s rozvrhem je poškozený.") from e
+    return schedule
+
+def decode_metadata(data: bytes) -> Tuple[ScheduleMetadata, int]:
+    """
+    Decodes the name and the number of the lessons from the start of the binary format.
+
+    Args:
+        data (bytes): The encoded schedule, only its start is needed.
+
+    Raises:
+        ValueError: If the data are not a schedule in a supported version of the format.
+
+    Returns:
+        Tuple[ScheduleMetadata, int]: The metadata and the offset of the data following them.
+    """
+    try:
+        magic, version = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Soubor neobsahuje rozvrh.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Nepodporovaná verze souboru s rozvrhem: {version}.")
+        name, offset = decode_string(data, HEADER.size)
+        (lesson_count,) = COUNT.unpack_from(data, offset)
+    except struct.error as e:
+        raise ValueError("Soubor s rozvrhem je poškozený.") from e
+    return ScheduleMetadata(name, lesson_count), offset + COUNT.size
+
+def encode_json(schedule: Schedule) -> bytes:
+    """
+    Encodes a schedule in the JSON format.
+
+    Args:
+        schedule (Schedule): The schedule.
+
+    Returns:
+        bytes: The encoded schedule in UTF-8.
+    """
+    lessons = [{"name": lesson.name,
+                "place": lesson.place,
+                "instructor": lesson.instructor,
+                "day": lesson.day.value,
+                "start": lesson.start_time.strftime("%H:%M"),
+                "end": lesson.end_time.strftime("%H:%M"),
+                "color": lesson.get_hex_color()}
+               for lesson in schedule.lessons]
+    document = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "name": schedule.name, "lessons": lessons}
+    return json.dumps(document, ensure_ascii=False, indent=4).encode("utf-8")
+
+def decode_json(data: bytes) -> Schedule:
+    """
+    Decodes a schedule from the JSON format.
+
+    Args:
+        data (bytes): The encoded schedule in UTF-8.
+
+    Raises:
+        ValueError: If the data are not a schedule in a supported version of the format.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    try:
+        document = json.loads(data.decode("utf-8"))
+        if document["format"] != FORMAT_NAME:
+            raise ValueError("Soubor neobsahuje rozvrh.")
+        if document["version"] != FORMAT_VERSION:
+            raise ValueError(f"Nepodporovaná verze souboru s rozvrhem: {document['version']}.")
+        schedule = Schedule(document["name"])
+        for item in document["lessons"]:
+            lesson = Lesson(item["name"],
+                            item["place"],
+                            item["instructor"],
+                            utilities.Day(item["day"]),
+                            time.fromisoformat(item["start"]),
+                            time.fromisoformat(item["end"]))
+            lesson.set_hex_color(item["color"])
+            schedule.add_lesson(lesson)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError("Soubor s rozvrhem je poškozený.") from e
+    return schedule
+
+def decode(data: bytes) -> Schedule:
+    """
+    Decodes a schedule in any of the formats, the format is recognized from the data.
+
+    Args:
+        data (bytes): The encoded schedule.
+
+    Raises:
+        ValueError: If the data are not a schedule.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    if data.startswith(MAGIC):
+        return decode_binary(data)
+    if data.lstrip().startswith(b"{"):
+        return decode_json(data)
+    return decode_pickle(data)
+
+def decode_pickle(data: bytes) -> Schedule:
+    """
+    Decodes a schedule pickled by older versions of the application.
+
+    Unpickling of damaged data may raise almost any exception, they are all reported as damaged
+    data like the errors of the other formats.
+
+    Args:
+        data (bytes): The pickled schedule.
+
+    Raises:
+        ValueError: If the data are not a schedule.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    try:
+        schedule = pickle.loads(data)
+        if not isinstance(schedule, Schedule):
+            raise TypeError("Soubor neobsahuje rozvrh.")
+    except Exception as e:
+        raise ValueError("Soubor neobsahuje rozvrh.") from e
+    return schedule
+
+def read_metadata(data: bytes) -> ScheduleMetadata:
+    """
+    Reads the name and the number of the lessons of an encoded schedule.
+
+    Only the start of a file in the binary format is decoded, other formats are decoded whole.
+
+    Args:
+        data (bytes): The encoded schedule.
+
+    Raises:
+        ValueError: If the data are not a schedule.
+
+    Returns:
+        ScheduleMetadata: The metadata.
+    """
+    if data.startswith(MAGIC):
+        return decode_metadata(data)[0]
+    schedule = decode(data)
+    return ScheduleMetadata(schedule.name, len(schedule.lessons))
+
+def save_file(schedule: Schedule, file_path: Path, json_format: bool=False) -> None:
+    """
+    Saves a schedule to a file, the old file is replaced at once.
+
+    Args:
+        schedule (Schedule): The schedule.
+        file_path (Path): Path to the file.
+        json_format (bool): If True, the JSON format is used instead of the binary one.
+    """
+    write_file_atomically(file_path, encode_json(schedule) if json_format else encode_binary(schedule))
+
+def write_file_atomically(file_path: Path, data: bytes) -> None:
+    """
+    Writes data to a temporary file, synchronizes it to the disk and renames it to the file.
+
+    The file contains either its old or its new content even if the writing is interrupted.
+
+    Args:
+        file_path (Path): Path to the file.
+        data (bytes): The data.
+    """
+    file_path = Path(file_path)
+    temporary_path = file_path.with_name(file_path.name + ".tmp")
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, file_path)
+
+def migrate_file(file_path: Path) -> bool:
+    """
+    Converts a file with a pickled schedule to the binary format.
+
+    Args:
+        file_path (Path): Path to the file.
+
+    Raises:
+        ValueError: If the file does not contain a schedule.
+
+    Returns:
+        bool: True if the file has been converted, False if it has not been pickled.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if data.startswith(MAGIC) or data.lstrip().startswith(b"{"):
+        return False
+    save_file(decode_pickle(data), file_path)
+    return True
+
+def migrate_folder(folder: Path) -> Tuple[List[Path], List[Tuple[Path, Exception]]]:
+    """
+    Converts all the files with pickled schedules in a folder to the binary format.
+
+    Args:
+        folder (Path): The folder.
+
+    Returns:
+        Tuple[List[Path], List[Tuple[Path, Exception]]]: The converted files and the files which
+            could not be converted with the errors.
+    """
+    migrated = []
+    errors = []
+    for file_path in sorted(Path(folder).glob("*.txt")):
+        try:
+            if migrate_file(file_path):
+                migrated.append(file_path)
+        except (OSError, ValueError) as e:
+            errors.append((file_path, e))
+    return migrated, errors
+
+def encode_lesson(lesson: Lesson) -> bytes:
+    """
+    Encodes one lesson with its strings, the strings are not shared with other lessons.
+
+    Args:
+        lesson (Lesson): The lesson.
+
+    Returns:
+        bytes: The name, the place and the instructor with their lengths followed by the start, the
+            end and the color packed as in the lesson records of the binary format.
+    """
+    start, end = get_week_minutes(lesson)
+    return b"".join((encode_string(lesson.name),
+                     encode_string(lesson.place),
+                     encode_string(lesson.instructor),
+                     LESSON_TIMES.pack(start, end, lesson.packed_color)))
+
+def decode_lesson(data: bytes, offset: int) -> Tuple[Lesson, int]:
+    """
+    Decodes one lesson encoded by encode_lesson.
+
+    Args:
+        data (bytes): The data.
+        offset (int): Offset of the lesson in the data.
+
+    Returns:
+        Tuple[Lesson, int]: The lesson and the offset of the data following it.
+    """
+    name, offset = decode_string(data, offset)
+    place, offset = decode_string(data, offset)
+    instructor, offset = decode_string(data, offset)
+    start, end, color = LESSON_TIMES.unpack_from(data, offset)
+    lesson = Lesson.from_minutes(name,
+                                 place,
+                                 instructor,
+                                 utilities.Day(start // MINUTES_IN_DAY),
+                                 start % MINUTES_IN_DAY,
+                                 end % MINUTES_IN_DAY,
+                                 color)
+    return lesson, offset + LESSON_TIMES.size
+
+def encode_string(string: str) -> bytes:
+    """
+    Encodes a string with its length.
+
+    Args:
+        string (str): The string.
+
+    Raises:
+        ValueError: If the encoded string is longer than 65535 bytes.
+
+    Returns:
+        bytes: The length and the string in UTF-8.
+    """
+    encoded = string.encode("utf-8")
+    if len(encoded) > 0xFFFF:
+        raise ValueError("Text v rozvrhu je příliš dlouhý.")
+    return LENGTH.pack(len(encoded)) + encoded
+
+def decode_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """
+    Decodes a string encoded with its length.
+
+    Args:
+        data (bytes): The data, or any other buffer of bytes such as an array mapped to a file.
+        offset (int): Offset of the length of the string.
+
+    Returns:
+        Tuple[str, int]: The string and the offset of the data following it.
+    """
+    (length,) = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    if offset + length > len(data):
+        raise struct.error("Text přesahuje konec souboru.")
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+def get_week_minutes(lesson: Lesson) -> Tuple[int, int]:
+    """
+    Returns the start and the end of a lesson in minutes after the start of the week.
+
+    Args:
+        lesson (Lesson): The lesson.
+
+    Returns:
+        Tuple[int, int]: The start and the end.
+    """
+    start, end = get_lesson_interval(lesson)
+    day_start = lesson.day.value * MINUTES_IN_DAY
+    return day_start + start, day_start + end
@@ -0,0 +1,351 @@
+"""Contains a generator of schedules without collisions from alternative lessons of courses."""
+import concurrent.futures
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.occupancy import Occupancy
+from app.utils import utilities
+
+class Course(NamedTuple):
+    """Course with alternative options, every option consists of lessons attended together."""
+    name: str
+    options: Tuple[Tuple[Lesson, ...], ...]
+
+class ScheduleGenerator():
+    """
+    Finds combinations of options of the courses without collisions.
+
+    Every option is turned to one bitmask of the whole week, so a collision of an option with the
+    already chosen options is a single AND. The search backtracks and always continues with the
+    course having the fewest options compatible with the chosen ones, a course without compatible
+    options cuts the branch immediately. The search can be split by the options of the first
+    course and run in several processes.
+    """
+
+    def __init__(self, courses: Sequence[Course]):
+        self.courses = list(courses)
+        self.slot_count = Occupancy().get_slot_count()
+        self.option_masks = [[get_week_mask(option) for option in course.options] for course in self.courses]
+
+    def generate(self, limit: Optional[int]=None) -> Iterator[Tuple[int, ...]]:
+        """
+        Yields the combinations without collisions.
+
+        Args:
+            limit (Optional[int]): Maximal number of yielded combinations. If None, all are yielded.
+
+        Yields:
+            Tuple[int, ...]: Index of the chosen option of every course.
+        """
+        for count, choice in enumerate(search_combinations(self.option_masks)):
+            if limit is not None and count >= limit:
+                return
+            yield choice
+
+    def find_all(self, limit: Optional[int]=None, processes: Optional[int]=1) -> List[Tuple[int, ...]]:
+        """
+        Finds the combinations without collisions, in parallel if demanded.
+
+        Args:
+            limit (Optional[int]): Maximal number of returned combinations. If None, all are
+                returned.
+            processes (Optional[int]): Number of processes. If None, all the CPU cores are used.
+                If 1, the search runs in this process.
+
+        Returns:
+            List[Tuple[int, ...]]: Index of the chosen option of every course for every
+                combination.
+        """
+        if processes == 1:
+            return list(self.generate(limit))
+
+        combinations = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            branches, first_options = self.split_search()
+            for branch_combinations in executor.map(find_branch_combinations,
+                                                    branches,
+                                                    first_options,
+                                                    [limit] * len(branches)):
+                combinations += branch_combinations
+        return combinations[:limit]
+
+    def find_best(self,
+                  objectives: Sequence[utilities.GeneratorObjective],
+                  processes: Optional[int]=1) -> Optional[Tuple[int, ...]]:
+        """
+        Finds the best combination without collisions.
+
+        The objectives are compared lexicographically. Branches that can not beat the best
+        combination found so far are cut.
+
+        Args:
+            objectives (Sequence[utilities.GeneratorObjective]): The objectives ordered by their
+                importance.
+            processes (Optional[int]): Number of processes. If None, all the CPU cores are used.
+                If 1, the search runs in this process.
+
+        Returns:
+            Optional[Tuple[int, ...]]: Index of the chosen option of every course or None if
+                there is no combination without collisions.
+        """
+        objectives = tuple(objectives)
+        if processes == 1:
+            best = search_best(self.option_masks, objectives, self.slot_count)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+                branches, first_options = self.split_search()
+                results = executor.map(find_branch_best,
+                                       branches,
+                                       first_options,
+                                       [objectives] * len(branches),
+                                       [self.slot_count] * len(branches))
+                best = min((result for result in results if result is not None), default=None)
+        return None if best is None else best[1]
+
+    def split_search(self) -> Tuple[List[List[List[int]]], List[Tuple[int, int]]]:
+        """
+        Splits the search by the options of the course with the fewest options.
+
+        Returns:
+            Tuple[List[List[List[int]]], List[Tuple[int, int]]]: The masks of the options for
+                every branch and the course and the option the branch starts with.
+        """
+        if not self.option_masks:
+            return [self.option_masks], [(-1, -1)]
+        course = min(range(len(self.option_masks)), key=lambda index: len(self.option_masks[index]))
+        first_options = [(course, option) for option in range(len(self.option_masks[course]))]
+        return [self.option_masks] * len(first_options), first_options
+
+    def build_schedule(self, choice: Tuple[int, ...], name: str) -> Schedule:
+        """
+        Creates a schedule from a combination of the options.
+
+        Args:
+            choice (Tuple[int, ...]): Index of the chosen option of every course.
+            name (str): Name of the schedule.
+
+        Returns:
+            Schedule: The schedule.
+        """
+        schedule = Schedule(name)
+        for course, option in zip(self.courses, choice):
+            for lesson in course.options[option]:
+                schedule.add_lesson(lesson)
+        return schedule
+
+def get_week_mask(lessons: Sequence[Lesson]) -> int:
+    """
+    Returns the bitmask of the time taken by lessons in the whole week.
+
+    Args:
+        lessons (Sequence[Lesson]): The lessons.
+
+    Returns:
+        int: The masks of the days of the occupancy of the lessons joined one after another.
+    """
+    occupancy = Occupancy.from_lessons(lessons)
+    return sum(mask << (day * occupancy.get_slot_count()) for day, mask in enumerate(occupancy.masks))
+
+def search_combinations(option_masks: List[List[int]],
+                        first_option: Tuple[int, int]=(-1, -1)) -> Iterator[Tuple[int, ...]]:
+    """
+    Yields the combinations of the options without collisions.
+
+    Args:
+        option_masks (List[List[int]]): Week masks of the options of every course.
+        first_option (Tuple[int, int]): Course and option chosen before the search starts,
+            (-1, -1) if none.
+
+    Yields:
+        Tuple[int, ...]: Index of the chosen option of every course.
+    """
+    choice = [-1] * len(option_masks)
+    remaining = set(range(len(option_masks)))
+    occupied = 0
+    if first_option[0] >= 0:
+        choice[first_option[0]] = first_option[1]
+        remaining.remove(first_option[0])
+        occupied = option_masks[first_option[0]][first_option[1]]
+    yield from backtrack(option_masks, remaining, occupied, choice)
+
+def backtrack(option_masks: List[List[int]],
+              remaining: set,
+              occupied: int,
+              choice: List[int]) -> Iterator[Tuple[int, ...]]:
+    """
+    Yields the combinations completing the chosen options without collisions.
+
+    Args:
+        option_masks (List[List[int]]): Week masks of the options of every course.
+        remaining (set): Indices of the courses without a chosen option.
+        occupied (int): Week mask of the chosen options.
+        choice (List[int]): Chosen option of every course, -1 for the remaining courses.
+
+    Yields:
+        Tuple[int, ...]: Index of the chosen option of every course.
+    """
+    if not remaining:
+        yield tuple(choice)
+        return
+
+    course, compatible_options = choose_course(option_masks, remaining, occupied)
+    if not compatible_options:
+        return
+    remaining.remove(course)
+    for option in compatible_options:
+        choice[course] = option
+        yield from backtrack(option_masks, remaining, occupied | option_masks[course][option], choice)
+    choice[course] = -1
+    remaining.add(course)
+
+def choose_course(option_masks: List[List[int]], remaining: set, occupied: int) -> Tuple[int, List[int]]:
+    """
+    Chooses the remaining course with the fewest options compatible with the chosen ones.
+
+    Args:
+        option_masks (List[List[int]]): Week masks of the options of every course.
+        remaining (set): Indices of the courses without a chosen option.
+        occupied (int): Week mask of the chosen options.
+
+    Returns:
+        Tuple[int, List[int]]: The course and its compatible options. The list is empty if some
+            course has no compatible option.
+    """
+    best_course, best_options = -1, None
+    for course in sorted(remaining):
+        options = [option for option, mask in enumerate(option_masks[course]) if not mask & occupied]
+        if best_options is None or len(options) < len(best_options):
+            best_course, best_options = course, options
+            if not options:
+                break
+    return best_course, best_options
+
+def search_best(option_masks: List[List[int]],
+                objectives: Tuple[utilities.GeneratorObjective, ...],
+                slot_count: int,
+                first_option: Tuple[int, int]=(-1, -1)) -> Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """
+    Finds the best combination of the options without collisions.
+
+    Args:
+        option_masks (List[List[int]]): Week masks of the options of every course.
+        objectives (Tuple[utilities.GeneratorObjective, ...]): The objectives ordered by their
+            importance.
+        slot_count (int): Number of slots of one day in the masks.
+        first_option (Tuple[int, int]): Course and option chosen before the search starts,
+            (-1, -1) if none.
+
+    Returns:
+        Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]: The score and the combination or None
+            if there is no combination without collisions.
+    """
+    choice = [-1] * len(option_masks)
+    remaining = set(range(len(option_masks)))
+    occupied = 0
+    if first_option[0] >= 0:
+        choice[first_option[0]] = first_option[1]
+        remaining.remove(first_option[0])
+        occupied = option_masks[first_option[0]][first_option[1]]
+
+    best = None
+
+    def branch_and_bound(occupied: int) -> None:
+        nonlocal best
+        if best is not None and compute_score(occupied, objectives, slot_count, True) >= best[0]:
+            return
+        if not remaining:
+            score = compute_score(occupied, objectives, slot_count, False)
+            if best is None or score < best[0]:
+                best = (score, tuple(choice))
+            return
+
+        course, compatible_options = choose_course(option_masks, remaining, occupied)
+        if not compatible_options:
+            return
+        remaining.remove(course)
+        for option in compatible_options:
+            choice[course] = option
+            branch_and_bound(occupied | option_masks[course][option])
+        choice[course] = -1
+        remaining.add(course)
+
+    branch_and_bound(occupied)
+    return best
+
+def compute_score(occupied: int,
+                  objectives: Tuple[utilities.GeneratorObjective, ...],
+                  slot_count: int,
+                  lower_bound: bool) -> Tuple[int, ...]:
+    """
+    Computes the score of the week mask, lower scores are better.
+
+    Args:
+        occupied (int): Week mask of the chosen options.
+        objectives (Tuple[utilities.GeneratorObjective, ...]): The objectives.
+        slot_count (int): Number of slots of one day in the mask.
+        lower_bound (bool): If True, the lowest score any completion of the mask can have is
+            returned instead.
+
+    Returns:
+        Tuple[int, ...]: Score for every objective.
+    """
+    day_masks = [(occupied >> (day * slot_count)) & ((1 << slot_count) - 1) for day in range(len(utilities.Day))]
+    used_masks = [mask for mask in day_masks if mask]
+    score = []
+    for objective in objectives:
+        if objective == utilities.GeneratorObjective.FEWEST_DAYS:
+            score.append(len(used_masks))
+        elif objective == utilities.GeneratorObjective.FEWEST_GAPS:
+            if lower_bound:
+                score.append(0)
+            else:
+                score.append(sum(mask.bit_length() - (mask & -mask).bit_length() + 1 - mask.bit_count()
+                                 for mask in used_masks))
+        elif objective == utilities.GeneratorObjective.LATEST_START:
+            score.append(-min(((mask & -mask).bit_length() - 1 for mask in used_masks), default=slot_count))
+    return tuple(score)
+
+def find_branch_combinations(option_masks: List[List[int]],
+                             first_option: Tuple[int, int],
+                             limit: Optional[int]) -> List[Tuple[int, ...]]:
+    """
+    Finds the combinations of one branch of the search in a worker process.
+
+    Args:
+        option_masks (List[List[int]]): Week masks of the options of every course.
+        first_option (Tuple[int, int]): Course and option the branch starts with.
+        limit (Optional[int]): Maximal number of returned combinations.
+
+    Returns:
+        List[Tuple[int, ...]]: The combinations.
+    """
+    combinations = []
+    for choice in search_combinations(option_masks, first_option):
+        if limit is not None and len(combinations) >= limit:
+            break
+        combinations.append(choice)
+    return combinations
+
+def find_branch_best(option_masks: List[List[int]],
+                     first_option: Tuple[int, int],
+                     objectives: Tuple[utilities.GeneratorObjective, ...],
+                     slot_count: int) -> Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """
+    Finds the best combination of one branch of the search in a worker process.
+
+    Args:
+        option_masks (List[List[int]]): Week masks of the options of every course.
+        first_option (Tuple[int, int]): Course and option the branch starts with.
+        objectives (Tuple[utilities.GeneratorObjective, ...]): The objectives.
+        slot_count (int): Number of slots of one day in the masks.
+
+    Returns:
+        Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]: The score and the combination or None.
+    """
+    return search_best(option_masks, objectives, slot_count, first_option)
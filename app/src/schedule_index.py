@@ -0,0 +1,166 @@
+"""Contains an index of the schedules saved in a folder."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from app.src.schedule import Schedule
+from app.src.schedule_loader import load_file
+from app.src.schedule_loader import read_file
+from app.src import schedule_format
+from app.src import schedule_journal
+from app.utils import config
+
+INDEX_VERSION = 1
+
+class ScheduleEntry(NamedTuple):
+    """Metadata of a schedule saved in a file."""
+    name: str
+    file_path: str
+    modification_time: int
+    size: int
+    lesson_count: int
+    content_hash: str
+
+class ScheduleIndex():
+    """
+    Keeps the metadata of the schedules saved in a folder in an index file.
+
+    The list of the schedules can be shown from the index without loading the schedules. A file
+    is read again only when its modification time or size, or those of its journal, differ from
+    the index. If its content hash has not changed, the old metadata are kept without decoding the
+    file. Entries of removed files are dropped.
+    """
+
+    def __init__(self, folder: Path, index_path: Optional[Path]=None):
+        self.folder = Path(folder)
+        self.index_path = Path(index_path) if index_path is not None else self.folder / config.SCHEDULE_INDEX_FILE_NAME
+        self.entries: Dict[str, ScheduleEntry] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Reads the entries from the index file, a missing or damaged index is left empty."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] != INDEX_VERSION:
+                return
+            entries = [ScheduleEntry(**entry) for entry in data["entries"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self.entries = {entry.file_path: entry for entry in entries}
+
+    def save(self) -> None:
+        """Writes the entries to the index file, the old index is replaced at once."""
+        temporary_path = self.index_path.with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION,
+                       "entries": [entry._asdict() for entry in self.entries.values()]},
+                      f,
+                      ensure_ascii=False,
+                      indent=4)
+        os.replace(temporary_path, self.index_path)
+
+    def refresh(self) -> List[Tuple[Path, Exception]]:
+        """
+        Updates the entries of the changed, added and removed files and saves the index.
+
+        Returns:
+            List[Tuple[Path, Exception]]: Files which could not be read with the errors.
+        """
+        errors = []
+        entries = {}
+        for file in sorted(self.folder.glob("*.txt")):
+            file_path = str(file)
+            try:
+                modification_time, size = get_file_state(file)
+                entry = self.entries.get(file_path)
+                if entry is None or entry.modification_time != modification_time or entry.size != size:
+                    entry = read_entry(file, modification_time, size, entry)
+                entries[file_path] = entry
+            except Exception as e:
+                errors.append((file, e))
+
+        if entries != self.entries or not self.index_path.exists():
+            self.entries = entries
+            try:
+                self.save()
+            except OSError:
+                pass
+        return errors
+
+    def get_entries(self) -> List[ScheduleEntry]:
+        """
+        Returns the entries of the schedules.
+
+        Returns:
+            List[ScheduleEntry]: The entries ordered by the file names.
+        """
+        return list(self.entries.values())
+
+def get_file_state(file: Path) -> Tuple[int, int]:
+    """
+    Returns the modification time and the size of a schedule file together with its journal.
+
+    Args:
+        file (Path): The file.
+
+    Returns:
+        Tuple[int, int]: The latest modification time in nanoseconds and the total size.
+    """
+    stat = os.stat(file)
+    try:
+        journal_stat = os.stat(schedule_journal.get_journal_path(file))
+    except FileNotFoundError:
+        return stat.st_mtime_ns, stat.st_size
+    return max(stat.st_mtime_ns, journal_stat.st_mtime_ns), stat.st_size + journal_stat.st_size
+
+def read_entry(file: Path,
+               modification_time: int,
+               size: int,
+               old_entry: Optional[ScheduleEntry]=None) -> ScheduleEntry:
+    """
+    Reads the metadata of a schedule file.
+
+    Args:
+        file (Path): The file.
+        modification_time (int): Modification time of the file and its journal.
+        size (int): Size of the file and its journal.
+        old_entry (Optional[ScheduleEntry]): The previous entry of the file. If the content hash
+            is the same, its metadata are reused without decoding the file.
+
+    Returns:
+        ScheduleEntry: The entry.
+    """
+    data = read_file(file)
+    try:
+        journal_data = read_file(schedule_journal.get_journal_path(file))
+    except FileNotFoundError:
+        journal_data = b""
+    content_hash = hashlib.sha256(data + journal_data).hexdigest()
+    if old_entry is not None and old_entry.content_hash == content_hash:
+        return old_entry._replace(modification_time=modification_time, size=size)
+
+    if schedule_journal.read_records(journal_data, data)[0]:
+        schedule = load_file(file)
+        metadata = schedule_format.ScheduleMetadata(schedule.name, len(schedule.lessons))
+    else:
+        metadata = schedule_format.read_metadata(data)
+    return ScheduleEntry(metadata.name, str(file), modification_time, size, metadata.lesson_count, content_hash)
+
+def load_schedule(entry: ScheduleEntry) -> Schedule:
+    """
+    Loads the whole schedule of an entry.
+
+    Args:
+        entry (ScheduleEntry): The entry.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    return load_file(Path(entry.file_path))
@@ -0,0 +1,334 @@
+"""
+Contains an append-only journal of the changes of a schedule.
+
+The schedule file is a snapshot in the binary schedule format. The changes made after it was
+saved are appended to a journal file next to it, the name of the journal is the name of the
+schedule file followed by config.JOURNAL_SUFFIX. All the numbers are little endian.
+
+    magic            4 bytes, b"RZVJ"
+    version          unsigned 16-bit integer
+    snapshot length  unsigned 32-bit integer
+    snapshot CRC-32  unsigned 32-bit integer
+    records          for every change unsigned 32-bit length and CRC-32 of the record followed by
+                     the record: the kind of the change as unsigned 8-bit integer, the index of the
+                     lesson as signed 32-bit integer and the lesson encoded by encode_lesson for
+                     added and edited lessons or the name for renaming
+
+The journal belongs only to the snapshot with the same length and CRC-32, a journal of another
+snapshot is left from an interrupted compaction and it is ignored. Records following a damaged
+record are left from an interrupted write and they are ignored too.
+"""
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app.src.schedule import Schedule
+from app.src.schedule import ScheduleChange
+from app.src import schedule_format
+from app.utils import config
+from app.utils import utilities
+
+JOURNAL_MAGIC = b"RZVJ"
+JOURNAL_VERSION = 1
+
+JOURNAL_HEADER = struct.Struct("<4sHII")
+RECORD_HEADER = struct.Struct("<II")
+RECORD_KIND = struct.Struct("<Bi")
+
+class ScheduleJournal():
+    """
+    Appends the changes of a schedule to its journal.
+
+    The records are flushed to the operating system immediately, so they survive a crash of the
+    application. They are synchronized to the disk in batches. When the journal grows too long, it
+    is compacted: the whole schedule is saved as a new snapshot and the journal starts again empty.
+    Both files are replaced by renaming, so an interrupted compaction leaves either the old or the
+    new state.
+
+    If the journal does not follow the changes of the schedule itself, the records are appended by
+    append_batch, eg. from another thread, and the compacted schedule is read from the files
+    instead of the schedule in memory.
+    """
+
+    def __init__(self,
+                 schedule: Schedule,
+                 file_path: Path,
+                 sync_batch: int=config.JOURNAL_SYNC_BATCH,
+                 compaction_threshold: int=config.JOURNAL_COMPACTION_THRESHOLD,
+                 follow: bool=True):
+        self.schedule = schedule
+        self.file_path = Path(file_path)
+        self.journal_path = get_journal_path(self.file_path)
+        self.sync_batch = sync_batch
+        self.compaction_threshold = compaction_threshold
+        self.file: Optional[BinaryIO] = None
+        self.record_count = 0
+        self.unsynced_count = 0
+        self.appended_count = 0
+        self.follow = follow
+        self.open()
+        if self.follow:
+            self.schedule.subscribe(self.on_change)
+
+    def open(self) -> None:
+        """
+        Opens the journal for appending.
+
+        The schedule must be in the state of its snapshot with the journal replayed. If the
+        snapshot or the journal is missing or they do not belong together, the journal is compacted.
+        A damaged end of the journal is cut off.
+
+        A journal not following the schedule may be opened after the schedule has changed, so the
+        schedule in memory is never saved by it. A missing or foreign journal is replaced by an
+        empty journal of the snapshot, which is what the schedule was loaded from.
+
+        Raises:
+            FileNotFoundError: If the journal does not follow the schedule and the snapshot is
+                missing.
+        """
+        try:
+            with open(self.file_path, "rb") as snapshot_file:
+                snapshot_data = snapshot_file.read()
+        except FileNotFoundError:
+            if not self.follow:
+                raise
+            self.reset(schedule_format.encode_binary(self.schedule))
+            return
+        try:
+            with open(self.journal_path, "rb") as journal_file:
+                journal_data = journal_file.read()
+        except FileNotFoundError:
+            journal_data = b""
+
+        records, valid_length = read_records(journal_data, snapshot_data)
+        if valid_length == 0:
+            self.reset(schedule_format.encode_binary(self.schedule) if self.follow else snapshot_data)
+            return
+        self.file = open(self.journal_path, "r+b")
+        self.file.truncate(valid_length)
+        self.file.seek(valid_length)
+        self.record_count = len(records)
+        if self.record_count >= self.compaction_threshold:
+            self.compact()
+
+    def on_change(self, change: ScheduleChange) -> None:
+        """
+        Appends a change of the schedule to the journal.
+
+        Args:
+            change (ScheduleChange): The change.
+        """
+        self.append(encode_change(change))
+
+    def append(self, record: bytes) -> None:
+        """
+        Appends a record to the journal.
+
+        Args:
+            record (bytes): The record.
+        """
+        self.file.write(RECORD_HEADER.pack(len(record), zlib.crc32(record)) + record)
+        self.file.flush()
+        self.appended_count += 1
+        self.record_count += 1
+        self.unsynced_count += 1
+        if self.record_count >= self.compaction_threshold:
+            self.compact()
+        elif self.unsynced_count >= self.sync_batch:
+            self.sync()
+
+    def append_batch(self, records: List[bytes]) -> None:
+        """
+        Appends records to the journal at once and synchronizes them to the disk.
+
+        If the synchronization or the compaction fails, the records have already been appended,
+        which is told by appended_count.
+
+        Args:
+            records (List[bytes]): The records.
+        """
+        self.file.write(b"".join(RECORD_HEADER.pack(len(record), zlib.crc32(record)) + record for record in records))
+        self.file.flush()
+        self.appended_count += len(records)
+        self.record_count += len(records)
+        self.unsynced_count += len(records)
+        if self.record_count >= self.compaction_threshold:
+            self.compact()
+        else:
+            self.sync()
+
+    def sync(self) -> None:
+        """Synchronizes the appended records to the disk."""
+        if self.file is not None and self.unsynced_count:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.unsynced_count = 0
+
+    def compact(self) -> None:
+        """Saves the schedule as a new snapshot and starts a new empty journal."""
+        if self.follow:
+            self.reset(schedule_format.encode_binary(self.schedule))
+        else:
+            self.reset(schedule_format.encode_binary(self.read_schedule()))
+
+    def read_schedule(self) -> Schedule:
+        """
+        Reads the schedule from the snapshot and the journal.
+
+        Returns:
+            Schedule: The schedule.
+        """
+        if self.file is not None:
+            self.file.flush()
+        with open(self.file_path, "rb") as snapshot_file:
+            snapshot_data = snapshot_file.read()
+        schedule = schedule_format.decode(snapshot_data)
+        replay(schedule, self.file_path, snapshot_data)
+        return schedule
+
+    def reset(self, snapshot_data: bytes) -> None:
+        """
+        Replaces the snapshot and starts a new empty journal.
+
+        Args:
+            snapshot_data (bytes): Content of the new snapshot.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+        schedule_format.write_file_atomically(self.file_path, snapshot_data)
+        schedule_format.write_file_atomically(self.journal_path, encode_header(snapshot_data))
+        self.file = open(self.journal_path, "ab")
+        self.record_count = 0
+        self.unsynced_count = 0
+
+    def close(self) -> None:
+        """Synchronizes and closes the journal and stops following the changes of the schedule."""
+        if self.follow:
+            self.schedule.unsubscribe(self.on_change)
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+def get_journal_path(file_path: Path) -> Path:
+    """
+    Returns the path to the journal of a schedule file.
+
+    Args:
+        file_path (Path): Path to the schedule file.
+
+    Returns:
+        Path: Path to the journal.
+    """
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + config.JOURNAL_SUFFIX)
+
+def encode_header(snapshot_data: bytes) -> bytes:
+    """
+    Encodes the header of a journal belonging to a snapshot.
+
+    Args:
+        snapshot_data (bytes): Content of the snapshot.
+
+    Returns:
+        bytes: The header.
+    """
+    return JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, len(snapshot_data), zlib.crc32(snapshot_data))
+
+def encode_change(change: ScheduleChange) -> bytes:
+    """
+    Encodes a change of a schedule as a record of the journal.
+
+    Args:
+        change (ScheduleChange): The change.
+
+    Returns:
+        bytes: The record.
+    """
+    record = RECORD_KIND.pack(change.kind.value, change.index)
+    if change.kind in (utilities.ChangeKind.ADD, utilities.ChangeKind.EDIT):
+        record += schedule_format.encode_lesson(change.lesson)
+    elif change.kind == utilities.ChangeKind.RENAME:
+        record += schedule_format.encode_string(change.name)
+    return record
+
+def apply_record(schedule: Schedule, record: bytes) -> None:
+    """
+    Applies a record of the journal to a schedule.
+
+    Args:
+        schedule (Schedule): The schedule.
+        record (bytes): The record.
+    """
+    kind, index = RECORD_KIND.unpack_from(record)
+    kind = utilities.ChangeKind(kind)
+    if kind == utilities.ChangeKind.ADD:
+        schedule.add_lesson(schedule_format.decode_lesson(record, RECORD_KIND.size)[0])
+    elif kind == utilities.ChangeKind.EDIT:
+        schedule.edit_lesson(index, schedule_format.decode_lesson(record, RECORD_KIND.size)[0])
+    elif kind == utilities.ChangeKind.REMOVE:
+        schedule.remove_lesson(index)
+    else:
+        schedule.rename(schedule_format.decode_string(record, RECORD_KIND.size)[0])
+
+def read_records(journal_data: bytes, snapshot_data: bytes) -> Tuple[List[bytes], int]:
+    """
+    Reads the undamaged records of a journal belonging to a snapshot.
+
+    Args:
+        journal_data (bytes): Content of the journal.
+        snapshot_data (bytes): Content of the snapshot.
+
+    Returns:
+        Tuple[List[bytes], int]: The records and the length of the undamaged part of the journal.
+            The length is 0 if the journal does not belong to the snapshot.
+    """
+    if not journal_data.startswith(encode_header(snapshot_data)):
+        return [], 0
+
+    records = []
+    offset = JOURNAL_HEADER.size
+    while offset + RECORD_HEADER.size <= len(journal_data):
+        length, checksum = RECORD_HEADER.unpack_from(journal_data, offset)
+        record = journal_data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+        if len(record) != length or zlib.crc32(record) != checksum:
+            break
+        records.append(record)
+        offset += RECORD_HEADER.size + length
+    return records, offset
+
+def replay(schedule: Schedule, file_path: Path, snapshot_data: bytes) -> int:
+    """
+    Applies the journal of a schedule file to the schedule decoded from its snapshot.
+
+    Args:
+        schedule (Schedule): The schedule decoded from the snapshot.
+        file_path (Path): Path to the schedule file.
+        snapshot_data (bytes): Content of the snapshot.
+
+    Raises:
+        ValueError: If a record does not fit the schedule.
+
+    Returns:
+        int: Number of the applied records.
+    """
+    try:
+        with open(get_journal_path(file_path), "rb") as journal_file:
+            journal_data = journal_file.read()
+    except FileNotFoundError:
+        return 0
+
+    records, _ = read_records(journal_data, snapshot_data)
+    try:
+        for record in records:
+            apply_record(schedule, record)
+    except (struct.error, IndexError, ValueError) as e:
+        raise ValueError("Deník změn rozvrhu je poškozený.") from e
+    return len(records)
@@ -0,0 +1,207 @@
+"""Contains functions for loading many schedule files at once."""
+import concurrent.futures
+from pathlib import Path
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from app.src.lesson_table import LessonTable
+from app.src.schedule import Schedule
+from app.src import schedule_format
+from app.src import schedule_journal
+from app.utils import config
+
+class LoadResult(NamedTuple):
+    """Result of loading of one schedule file, either the schedule or the error is set."""
+    file: Path
+    schedule: Optional[Schedule]
+    error: Optional[Exception]
+
+class LoadReport(NamedTuple):
+    """Schedules loaded from many files and the errors of the files which could not be loaded."""
+    schedules: List[Tuple[Path, Schedule]]
+    errors: List[Tuple[Path, Exception]]
+
+def read_file(file: Path) -> bytes:
+    """
+    Reads the content of a schedule file.
+
+    Args:
+        file (Path): The file.
+
+    Returns:
+        bytes: The content.
+    """
+    with open(file, "rb") as schedule_file:
+        return schedule_file.read()
+
+def decode_schedule(data: bytes) -> Schedule:
+    """
+    Decodes a schedule from the content of its file in any of the schedule formats.
+
+    The lessons of a schedule with at least COLUMNAR_LESSON_THRESHOLD lessons are moved to a
+    LessonTable, which takes a fraction of the memory and filters the days by arrays.
+
+    Args:
+        data (bytes): The content of the file.
+
+    Raises:
+        ValueError: If the content is not a schedule.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    schedule = schedule_format.decode(data)
+    if len(schedule.lessons) >= config.COLUMNAR_LESSON_THRESHOLD:
+        schedule = Schedule(schedule.name, LessonTable.from_lessons(schedule.lessons))
+    return schedule
+
+def load_file(file: Path) -> Schedule:
+    """
+    Reads and decodes a schedule file and applies its journal.
+
+    Args:
+        file (Path): The file.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    data = read_file(file)
+    schedule = decode_schedule(data)
+    schedule_journal.replay(schedule, file, data)
+    return schedule
+
+def replay_journal(file: Path, data: bytes, schedule: Schedule) -> Schedule:
+    """
+    Applies the journal of a schedule file to the schedule decoded from it.
+
+    Args:
+        file (Path): The file.
+        data (bytes): The content of the file.
+        schedule (Schedule): The decoded schedule.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    schedule_journal.replay(schedule, file, data)
+    return schedule
+
+def iterate_schedules(files: Sequence[Path],
+                      threads: int=config.LOADER_THREAD_COUNT,
+                      processes: int=0) -> Iterator[LoadResult]:
+    """
+    Loads schedule files concurrently and yields the results as they are completed.
+
+    The files are read by a pool of threads. They are decoded in the threads too, or in a pool of
+    processes if processes is positive. The journals of the files are applied in the threads.
+
+    Args:
+        files (Sequence[Path]): The files.
+        threads (int): Number of threads reading the files.
+        processes (int): Number of processes decoding the files, 0 to decode them in the threads.
+
+    Yields:
+        LoadResult: The result of every file in the order of completion.
+    """
+    files = [Path(file) for file in files]
+    if not files:
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as thread_executor:
+        if processes <= 0:
+            futures = {thread_executor.submit(load_file, file): file for file in files}
+            for future in concurrent.futures.as_completed(futures):
+                yield get_result(futures[future], future)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as process_executor:
+            stages = {thread_executor.submit(read_file, file): ("read", file, b"") for file in files}
+            while stages:
+                done, _ = concurrent.futures.wait(stages, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    stage, file, data = stages.pop(future)
+                    if stage == "replay" or future.exception() is not None:
+                        yield get_result(file, future)
+                    elif stage == "read":
+                        decode_future = process_executor.submit(decode_schedule, future.result())
+                        stages[decode_future] = ("decode", file, future.result())
+                    else:
+                        replay_future = thread_executor.submit(replay_journal, file, data, future.result())
+                        stages[replay_future] = ("replay", file, b"")
+
+def get_result(file: Path, future: concurrent.futures.Future) -> LoadResult:
+    """
+    Turns a finished future of loading of a file to its result.
+
+    Args:
+        file (Path): The file.
+        future (concurrent.futures.Future): The finished future.
+
+    Returns:
+        LoadResult: The result.
+    """
+    error = future.exception()
+    if error is not None:
+        return LoadResult(file, None, error)
+    return LoadResult(file, future.result(), None)
+
+def load_schedules(files: Sequence[Path],
+                   threads: int=config.LOADER_THREAD_COUNT,
+                   processes: int=0) -> LoadReport:
+    """
+    Loads schedule files concurrently.
+
+    Args:
+        files (Sequence[Path]): The files.
+        threads (int): Number of threads reading the files.
+        processes (int): Number of processes decoding the files, 0 to decode them in the threads.
+
+    Returns:
+        LoadReport: The schedules in the order of the files and the errors.
+    """
+    order = {Path(file): position for position, file in enumerate(files)}
+    schedules = []
+    errors = []
+    for result in iterate_schedules(files, threads, processes):
+        if result.error is None:
+            schedules.append((result.file, result.schedule))
+        else:
+            errors.append((result.file, result.error))
+    schedules.sort(key=lambda item: order[item[0]])
+    errors.sort(key=lambda item: order[item[0]])
+    return LoadReport(schedules, errors)
+
+def load_folder(folder: Path, threads: int=config.LOADER_THREAD_COUNT, processes: int=0) -> LoadReport:
+    """
+    Loads all the schedules saved in a folder concurrently.
+
+    Args:
+        folder (Path): The folder.
+        threads (int): Number of threads reading the files.
+        processes (int): Number of processes decoding the files, 0 to decode them in the threads.
+
+    Returns:
+        LoadReport: The schedules ordered by the file names and the errors.
+    """
+    return load_schedules(sorted(Path(folder).glob("*.txt")), threads, processes)
+
+def format_errors(errors: Sequence[Tuple[Path, Exception]]) -> str:
+    """
+    Describes the errors of loading of schedule files in one message.
+
+    Args:
+        errors (Sequence[Tuple[Path, Exception]]): The files and their errors.
+
+    Returns:
+        str: The message with one line for every file.
+    """
+    lines = []
+    for file, error in errors:
+        if isinstance(error, ValueError):
+            lines.append(f"Soubor '{file}' je poškozený a nejde načíst.")
+        else:
+            lines.append(f"Při načítání rozvrhu ze souboru '{file}' došlo k neočekávané chybě: {error}")
+    return "\n".join(lines)
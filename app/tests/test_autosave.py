@@ -0,0 +1,146 @@
+"""Tests for AutosaveWriter class."""
+import time
+from datetime import time as day_time
+
+from app.src import schedule_format
+from app.src.autosave import AutosaveWriter
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.schedule_journal import ScheduleJournal
+from app.src.schedule_journal import get_journal_path
+from app.src.schedule_loader import load_file
+from app.utils.utilities import Day
+
+def create_lesson(hour: int) -> Lesson:
+    """Creates a lesson starting at given hour."""
+    return Lesson(f"Hodina {hour}", "A-1", "Dvořák", Day.THU, day_time(hour, 0), day_time(hour, 50))
+
+def test_save_whole_schedule(tmp_path):
+    """Tests that a schedule without a file is saved whole."""
+    writer = AutosaveWriter(tmp_path, delay=10.0, max_delay=10.0)
+    schedule = Schedule("Rozvrh")
+    writer.watch(schedule)
+    for hour in range(8, 11):
+        schedule.add_lesson(create_lesson(hour))
+    assert writer.get_queue_depth() == 3
+    assert writer.get_last_saved_time() is None
+
+    writer.flush(wait=True)
+    assert writer.get_queue_depth() == 0
+    assert writer.get_last_saved_time() is not None
+    saved = schedule_format.decode((tmp_path / "Rozvrh.txt").read_bytes())
+    assert [lesson.name for lesson in saved.lessons] == ["Hodina 8", "Hodina 9", "Hodina 10"]
+    writer.stop()
+
+def test_save_journaled_schedule(tmp_path):
+    """Tests that the changes of a saved schedule are appended to its journal."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.save_to_txt_file(file_path)
+    snapshot = file_path.read_bytes()
+
+    writer = AutosaveWriter(tmp_path, delay=10.0, max_delay=10.0)
+    writer.watch(schedule, file_path)
+    schedule.add_lesson(create_lesson(8))
+    schedule.edit_lesson(0, create_lesson(9))
+    writer.flush(schedule, wait=True)
+    assert file_path.read_bytes() == snapshot
+    assert [lesson.name for lesson in load_file(file_path).lessons] == ["Hodina 9"]
+
+    writer.save(schedule)
+    writer.flush(wait=True)
+    assert len(schedule_format.decode(file_path.read_bytes()).lessons) == 1
+    schedule.remove_lesson(0)
+    writer.stop()
+    assert not load_file(file_path).lessons
+    assert get_journal_path(file_path).exists()
+
+def test_journal_of_other_file(tmp_path):
+    """Tests that a schedule not loaded from a file of the folder never uses the journal of the file."""
+    file_path = tmp_path / "Rozvrh.txt"
+    saved = Schedule("Rozvrh")
+    saved.save_to_txt_file(file_path)
+    writer = AutosaveWriter(tmp_path, delay=10.0, max_delay=10.0)
+    writer.watch(saved, file_path)
+    saved.add_lesson(create_lesson(8))
+    writer.flush(wait=True)
+
+    other = Schedule("Rozvrh")
+    writer.watch(other)
+    other.add_lesson(create_lesson(10))
+    other.add_lesson(create_lesson(11))
+    writer.stop()
+    assert [lesson.name for lesson in load_file(file_path).lessons] == ["Hodina 10", "Hodina 11"]
+
+def test_move(tmp_path):
+    """Tests that the files of a renamed schedule are moved after its changes are written to them."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.save_to_txt_file(file_path)
+    writer = AutosaveWriter(tmp_path, delay=10.0, max_delay=10.0)
+    writer.watch(schedule, file_path)
+    schedule.add_lesson(create_lesson(8))
+    schedule.rename("Nový")
+    writer.move(schedule, tmp_path / "Nový.txt")
+    schedule.add_lesson(create_lesson(9))
+    writer.stop()
+
+    assert not file_path.exists()
+    assert not get_journal_path(file_path).exists()
+    moved = load_file(tmp_path / "Nový.txt")
+    assert moved.name == "Nový"
+    assert [lesson.name for lesson in moved.lessons] == ["Hodina 8", "Hodina 9"]
+
+def test_remove(tmp_path):
+    """Tests that a removed schedule drops its changes and its files are deleted."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.save_to_txt_file(file_path)
+    writer = AutosaveWriter(tmp_path, delay=10.0, max_delay=10.0)
+    writer.watch(schedule, file_path)
+    schedule.add_lesson(create_lesson(8))
+    writer.unwatch(schedule, remove=True)
+    writer.stop()
+    assert not file_path.exists()
+    assert not get_journal_path(file_path).exists()
+
+def test_write_error(tmp_path, monkeypatch):
+    """Tests that changes which failed to be written are written again and never twice."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.save_to_txt_file(file_path)
+    writer = AutosaveWriter(tmp_path, delay=10.0, max_delay=10.0)
+    writer.watch(schedule, file_path)
+    schedule.add_lesson(create_lesson(8))
+    writer.flush(wait=True)
+
+    def fail(*args):
+        raise OSError("Disk je plný.")
+    monkeypatch.setattr(ScheduleJournal, "append_batch", fail)
+    schedule.add_lesson(create_lesson(9))
+    writer.flush(wait=True)
+    assert writer.get_last_error()[0] == "Rozvrh"
+    assert writer.get_queue_depth() == 1
+
+    monkeypatch.undo()
+    schedule.add_lesson(create_lesson(10))
+    writer.stop()
+    assert [lesson.name for lesson in load_file(file_path).lessons] == ["Hodina 8", "Hodina 9", "Hodina 10"]
+
+def test_coalescing(tmp_path, monkeypatch):
+    """Tests that changes coming one after another are written at once."""
+    writer = AutosaveWriter(tmp_path, delay=0.2, max_delay=5.0)
+    writes = []
+    write = writer.write
+    monkeypatch.setattr(writer, "write", lambda *args: writes.append(args) or write(*args))
+    schedule = Schedule("Rozvrh")
+    writer.watch(schedule)
+    for hour in range(8, 13):
+        schedule.add_lesson(create_lesson(hour))
+
+    deadline = time.monotonic() + 5.0
+    while writer.get_last_saved_time() is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert len(writes) == 1
+    assert len(load_file(tmp_path / "Rozvrh.txt").lessons) == 5
+    writer.stop()
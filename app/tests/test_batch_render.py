@@ -0,0 +1,58 @@
+"""Tests for rendering of the schedules from the command line."""
+import subprocess
+import sys
+from datetime import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.gui.batch_render import render_folder
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.utils.utilities import Day
+from app.utils.utilities import RenderStatus
+
+SETTINGS_PATH = Path(__file__).parent / "test_settings.json"
+
+def create_schedule(name: str, place: str) -> Schedule:
+    """Creates a schedule with one lesson."""
+    schedule = Schedule(name)
+    schedule.add_lesson(Lesson("Fyzika", place, "Novák", Day.MON, time(8, 0), time(9, 30), (10, 20, 30)))
+    return schedule
+
+def get_statuses(results) -> dict:
+    """Returns the statuses of the results by the names of the schedule files."""
+    return {result.schedule_file.name: result.status for result in results}
+
+def test_render_folder(tmp_path):
+    """Tests that render_folder function renders only the changed schedules."""
+    folder = tmp_path / "schedules"
+    folder.mkdir()
+    create_schedule("Adam", "T-105").save_to_txt_file(folder / "Adam.txt")
+    create_schedule("Bára", "T-106").save_to_txt_file(folder / "Bára.txt")
+    (folder / "Cyril.txt").write_bytes(b"RZVR\x01\x00")
+    output = tmp_path / "images"
+
+    progress = []
+    results = render_folder(folder, output, "png", SETTINGS_PATH, 0,
+                            progress=lambda finished, total, result: progress.append((finished, total)))
+    assert get_statuses(results) == {"Adam.txt": RenderStatus.RENDERED,
+                                     "Bára.txt": RenderStatus.RENDERED,
+                                     "Cyril.txt": RenderStatus.FAILED}
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    with Image.open(output / "Adam.png") as image:
+        assert image.size == (800, 400)
+
+    create_schedule("Bára", "T-205").save_to_txt_file(folder / "Bára.txt")
+    results = render_folder(folder, output, "png", SETTINGS_PATH, 0)
+    assert get_statuses(results)["Adam.txt"] == RenderStatus.SKIPPED
+    assert get_statuses(results)["Bára.txt"] == RenderStatus.RENDERED
+
+    results = render_folder(folder, output, "pdf", SETTINGS_PATH, 1)
+    assert get_statuses(results)["Adam.txt"] == RenderStatus.RENDERED
+    assert (output / "Bára.pdf").read_bytes().startswith(b"%PDF")
+
+def test_no_tkinter():
+    """Tests that the command line rendering does not import tkinter."""
+    code = "import sys, app.render; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parents[2], check=False).returncode == 0
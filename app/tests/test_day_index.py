@@ -0,0 +1,58 @@
+"""Tests for DayIndex class."""
+import random
+from datetime import time
+
+from app.src.lesson import Lesson
+from app.src.day_index import DayIndex
+from app.utils.utilities import Day
+
+def create_lesson(start: int, end: int) -> Lesson:
+    """Creates a lesson taking place between given minutes of the day."""
+    return Lesson("", "", "", Day.MON, time(start // 60, start % 60), time(end // 60, end % 60))
+
+def test_get_overlapping():
+    """Tests get_overlapping function from DayIndex class against a full scan."""
+    generator = random.Random(0)
+    index = DayIndex()
+    lessons = []
+    for _ in range(300):
+        start = generator.randrange(6*60, 22*60)
+        lesson = create_lesson(start, min(start + generator.randrange(5, 180), 23*60 + 59))
+        lessons.append(lesson)
+        index.add(lesson)
+    for lesson in lessons[::3]:
+        index.remove(lesson)
+    lessons = [lesson for position, lesson in enumerate(lessons) if position % 3]
+
+    for _ in range(100):
+        start = generator.randrange(0, 24*60)
+        end = start + generator.randrange(1, 120)
+        expected = {id(lesson) for lesson in lessons
+                    if lesson.start_time.hour*60 + lesson.start_time.minute < end
+                    and lesson.end_time.hour*60 + lesson.end_time.minute > start}
+        assert {id(lesson) for lesson in index.get_overlapping(start, end)} == expected
+
+def test_get_lessons():
+    """Tests that DayIndex class keeps the lessons sorted by their start."""
+    index = DayIndex()
+    lesson1 = create_lesson(9*60, 10*60)
+    lesson2 = create_lesson(8*60, 9*60)
+    lesson3 = create_lesson(9*60, 10*60)
+    for lesson in (lesson1, lesson2, lesson3):
+        index.add(lesson)
+    assert index.get_lessons() == [lesson2, lesson1, lesson3]
+    assert index.get_first_lesson() is lesson2
+
+    index.remove(lesson3)
+    assert index.get_lessons() == [lesson2, lesson1]
+
+def test_get_free_gaps():
+    """Tests get_free_gaps function from DayIndex class."""
+    index = DayIndex()
+    assert index.get_free_gaps(60, 8*60, 16*60) == [(8*60, 16*60)]
+
+    for start, end in ((8*60, 9*60), (8*60 + 30, 10*60), (10*60 + 15, 11*60), (13*60, 17*60)):
+        index.add(create_lesson(start, end))
+    assert index.get_free_gaps(1, 8*60, 16*60) == [(10*60, 10*60 + 15), (11*60, 13*60)]
+    assert index.get_free_gaps(30, 7*60, 16*60) == [(7*60, 8*60), (11*60, 13*60)]
+    assert index.get_free_gaps(30, 8*60 + 45, 12*60) == [(11*60, 12*60)]
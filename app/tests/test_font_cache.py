@@ -0,0 +1,29 @@
+"""Tests for FontCache class."""
+from app.gui.font_cache import FontCache
+
+def test_get():
+    """Tests get function from FontCache class."""
+    cache = FontCache()
+    font = cache.get("arial.ttf", 12)
+    assert cache.get("arial.ttf", 12) is font
+    assert cache.get("arial.ttf", 13) is not font
+    assert cache.get_statistics() == (1, 2)
+
+def test_eviction():
+    """Tests that the least recently used font is evicted from FontCache."""
+    cache = FontCache(2)
+    cache.get("arial.ttf", 10)
+    cache.get("arial.ttf", 11)
+    cache.get("arial.ttf", 10)
+    cache.get("arial.ttf", 12)
+    assert ("arial.ttf", 10) in cache.fonts
+    assert ("arial.ttf", 11) not in cache.fonts
+    assert len(cache.fonts) == 2
+
+def test_clear():
+    """Tests clear function from FontCache class."""
+    cache = FontCache()
+    cache.get("arial.ttf", 10)
+    cache.clear()
+    assert not cache.fonts
+    assert cache.get_statistics() == (0, 0)
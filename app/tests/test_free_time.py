@@ -0,0 +1,67 @@
+"""Tests for the common free time finder."""
+import random
+import time as timer
+from datetime import time
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src import free_time
+from app.src.free_time import FreeSlot
+from app.utils.utilities import Day
+
+def create_schedule(intervals) -> Schedule:
+    """Creates a schedule with lessons taking place in given days and minutes."""
+    schedule = Schedule("Rozvrh")
+    for day, start, end in intervals:
+        schedule.add_lesson(Lesson("", "", "", day, time(start // 60, start % 60), time(end // 60, end % 60)))
+    return schedule
+
+def test_build_occupancy_matrix():
+    """Tests build_occupancy_matrix function."""
+    schedules = [create_schedule([(Day.MON, 8*60, 9*60)]), create_schedule([(Day.SUN, 23*60, 23*60 + 59)])]
+    matrix = free_time.build_occupancy_matrix(schedules, 5)
+    assert matrix.shape == (2, 7, 288)
+    assert matrix[0, 0].nonzero()[0].tolist() == list(range(96, 108))
+    assert matrix[1, 6].nonzero()[0].tolist() == list(range(276, 288))
+    assert matrix.sum() == 24
+
+def test_find_common_free_time():
+    """Tests find_common_free_time function with everybody and with a quorum."""
+    schedules = [create_schedule([(Day.MON, 8*60, 10*60)]),
+                 create_schedule([(Day.MON, 9*60, 11*60)]),
+                 create_schedule([(Day.MON, 12*60, 13*60)])]
+    slots = free_time.find_common_free_time(schedules, start=7*60, end=14*60)
+    assert [slot for slot in slots if slot.day == Day.MON] == [FreeSlot(Day.MON, 7*60, 8*60, 3),
+                                                               FreeSlot(Day.MON, 11*60, 12*60, 3),
+                                                               FreeSlot(Day.MON, 13*60, 14*60, 3)]
+    assert FreeSlot(Day.TUE, 7*60, 14*60, 3) in slots
+
+    slots = free_time.find_common_free_time(schedules, 2, start=7*60, end=14*60, minimal_length=90)
+    assert [slot for slot in slots if slot.day == Day.MON] == [FreeSlot(Day.MON, 7*60, 9*60, 2),
+                                                               FreeSlot(Day.MON, 10*60, 14*60, 2)]
+
+def test_find_common_free_time_many_schedules():
+    """Tests that the free time of a thousand schedules is found quickly and correctly."""
+    generator = random.Random(0)
+    schedules = []
+    for _ in range(1000):
+        intervals = []
+        for _ in range(20):
+            start = generator.randrange(8*12, 18*12) * 5
+            intervals.append((Day(generator.randrange(5)), start, start + generator.choice((45, 90))))
+        schedules.append(create_schedule(intervals))
+
+    start_time = timer.perf_counter()
+    slots = free_time.find_common_free_time(schedules, 990, start=8*60, end=20*60)
+    assert timer.perf_counter() - start_time < 1
+
+    def count_free(day, start, end):
+        return sum(1 for schedule in schedules if not schedule.get_overlapping_lessons(day, start, end))
+
+    assert slots
+    for slot in slots:
+        assert slot.free_count >= 990
+        assert count_free(slot.day, slot.start, slot.start + 5) >= slot.free_count
+        assert count_free(slot.day, slot.end - 5, slot.end) >= slot.free_count
+        if slot.start > 8*60:
+            assert count_free(slot.day, slot.start - 5, slot.start) < 990
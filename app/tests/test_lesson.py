@@ -1,4 +1,5 @@
 """Tests for Lesson class."""
+import pickle
 from datetime import time
 from app.src.lesson import Lesson
 from app.utils.utilities import Day
@@ -25,3 +26,37 @@ def test_set_hex_color():
 
     lesson.set_hex_color("#2DA0D4")
     assert lesson.color == (45, 160, 212)
+
+def test_compact_attributes():
+    """Test that Lesson class keeps the times in minutes and interns the texts."""
+    lesson = Lesson("".join(["Fyz", "ika"]), "T-105", "Novák", Day.TUE, time(9, 15), time(10, 45), (1, 2, 3))
+    other = Lesson("".join(["Fyz", "ik", "a"]), "T-105", "Novák", Day.TUE, time(9, 15), time(10, 45), (1, 2, 3))
+
+    assert not hasattr(lesson, "__dict__")
+    assert lesson.name is other.name
+    assert (lesson.start_minute, lesson.end_minute) == (555, 645)
+    assert (lesson.start_time, lesson.end_time) == (time(9, 15), time(10, 45))
+    assert lesson.packed_color == 0x010203 and lesson.color == (1, 2, 3)
+
+    lesson.end_time = time(11, 0)
+    assert lesson.end_minute == 660
+    copy = Lesson.from_minutes("Fyzika", "T-105", "Novák", Day.TUE, 555, 660, 0x010203)
+    assert copy.__getstate__() == lesson.__getstate__()
+
+def test_pickle():
+    """Test that Lesson class is pickled with the attributes of the older versions."""
+    lesson = Lesson("Fyzika", "T-105", "Novák", Day.TUE, time(9, 15), time(10, 45), (1, 2, 3))
+    assert pickle.loads(pickle.dumps(lesson)).__getstate__() == lesson.__getstate__()
+
+    legacy = Lesson.__new__(Lesson)
+    legacy.__setstate__({"name": "Fyzika", "place": "T-105", "instructor": "Novák", "day": Day.TUE,
+                         "start_time": time(9, 15), "end_time": time(10, 45), "color": (1, 2, 3)})
+    assert legacy.__getstate__() == lesson.__getstate__()
+
+def test_equality():
+    """Test that lessons are compared by their values."""
+    lesson = Lesson("Fyzika", "T-105", "Novák", Day.TUE, time(9, 15), time(10, 45), (1, 2, 3))
+    assert lesson == Lesson("Fyzika", "T-105", "Novák", Day.TUE, time(9, 15), time(10, 45), (1, 2, 3))
+    assert lesson != Lesson("Fyzika", "T-105", "Novák", Day.WED, time(9, 15), time(10, 45), (1, 2, 3))
+    assert lesson != Lesson("Fyzika", "T-105", "Novák", Day.TUE, time(9, 15), time(10, 45), (1, 2, 4))
+    assert lesson != "Fyzika"
@@ -0,0 +1,108 @@
+"""Tests for LessonTable class."""
+import pickle
+import random
+from datetime import time
+
+import pytest
+
+from app.src.lesson import Lesson
+from app.src.lesson_table import LessonTable
+from app.src.lesson_table import load_table
+from app.src.lesson_table import save_table
+from app.src.schedule import Schedule
+from app.utils.utilities import Day
+
+def create_lessons(count: int) -> list:
+    """Creates random lessons with a few repeated places and instructors."""
+    generator = random.Random(5)
+    lessons = []
+    for _ in range(count):
+        start = generator.randrange(6*60, 20*60)
+        end = start + generator.choice([45, 90, 120])
+        lessons.append(Lesson(f"Hodina {generator.randrange(10)}",
+                              f"T-{generator.randrange(5)}",
+                              f"Učitel {generator.randrange(4)}",
+                              Day(generator.randrange(7)),
+                              time(start // 60, start % 60),
+                              time(end // 60, end % 60),
+                              (generator.randrange(256), generator.randrange(256), generator.randrange(256))))
+    return lessons
+
+def test_list_operations():
+    """Tests that LessonTable class behaves as a list of lessons."""
+    lessons = create_lessons(40)
+    table = LessonTable.from_lessons(lessons)
+    assert len(table) == 40
+    assert len(table.strings) <= 19
+    assert [lesson.__getstate__() for lesson in table] == [lesson.__getstate__() for lesson in lessons]
+
+    table[3] = lessons[0]
+    assert table[3].__getstate__() == lessons[0].__getstate__()
+    assert table.pop(5).__getstate__() == lessons[5].__getstate__()
+    assert table[-1].__getstate__() == lessons[-1].__getstate__()
+    assert len(table) == 39
+    with pytest.raises(IndexError):
+        table[39]
+
+    copy = pickle.loads(pickle.dumps(table))
+    assert [lesson.__getstate__() for lesson in copy] == [lesson.__getstate__() for lesson in table]
+
+def test_select():
+    """Tests select function from LessonTable class against filtering of the lessons."""
+    lessons = create_lessons(500)
+    table = LessonTable.from_lessons(lessons)
+    for days, start, end in (([Day.MON], None, None), ([Day.TUE, Day.SUN], 9*60, 12*60), (None, 13*60, 13*60 + 1)):
+        expected = sorted((index for index, lesson in enumerate(lessons)
+                           if (days is None or lesson.day in days)
+                           and (start is None or lesson.end_minute > start)
+                           and (end is None or lesson.start_minute < end)),
+                          key=lambda index: (lessons[index].day.value, lessons[index].start_minute,
+                                             lessons[index].end_minute, index))
+        assert table.select(days, start, end).tolist() == expected
+
+def test_save_and_load(tmp_path):
+    """Tests save_table and load_table functions with and without mapping the file to memory."""
+    lessons = create_lessons(100)
+    table = LessonTable.from_lessons(lessons)
+    save_table(tmp_path / "rozvrh.table", "Fakulta", table)
+    for memory_map in (True, False):
+        name, loaded = load_table(tmp_path / "rozvrh.table", memory_map)
+        assert name == "Fakulta"
+        assert [lesson.__getstate__() for lesson in loaded] == [lesson.__getstate__() for lesson in lessons]
+        loaded.append(lessons[0])
+        loaded[0] = lessons[1]
+        assert len(loaded) == 101 and loaded[0].__getstate__() == lessons[1].__getstate__()
+    assert load_table(tmp_path / "rozvrh.table")[1][0].__getstate__() == lessons[0].__getstate__()
+
+    (tmp_path / "jiný.table").write_bytes(b"RZVR")
+    with pytest.raises(ValueError):
+        load_table(tmp_path / "jiný.table")
+
+@pytest.mark.parametrize("column, value", [("days", 7), ("places", 100), ("ends", 24*60 + 1), ("starts", 23*60)])
+def test_load_invalid_values(tmp_path, column, value):
+    """Tests that load_table function rejects a table with a day, a time or a string index out of range."""
+    table = LessonTable.from_lessons(create_lessons(10))
+    getattr(table, column)[3] = value
+    save_table(tmp_path / "rozvrh.table", "Fakulta", table)
+    with pytest.raises(ValueError):
+        load_table(tmp_path / "rozvrh.table")
+
+def test_columnar_schedule():
+    """Tests that a schedule with a table answers the same as a schedule with a list."""
+    lessons = create_lessons(300)
+    schedule = Schedule("Rozvrh")
+    for lesson in lessons:
+        schedule.add_lesson(lesson)
+    columnar = Schedule("Rozvrh", LessonTable.from_lessons(lessons))
+    assert columnar.is_columnar()
+
+    for changed in (schedule, columnar):
+        changed.edit_lesson(7, lessons[8])
+        changed.remove_lesson(10)
+    for day in Day:
+        assert ([lesson.__getstate__() for lesson in columnar.get_lessons_on_day(day)]
+                == [lesson.__getstate__() for lesson in schedule.get_lessons_on_day(day)])
+        assert columnar.get_free_gaps(day, 30) == schedule.get_free_gaps(day, 30)
+        assert ([(lesson.__getstate__(), columns) for lesson, columns in columnar.get_day_layout(day, 9*60, 15*60)]
+                == [(lesson.__getstate__(), columns) for lesson, columns in schedule.get_day_layout(day, 9*60, 15*60)])
+    assert columnar.get_occupancy().masks == schedule.get_occupancy().masks
@@ -0,0 +1,72 @@
+"""Tests for Occupancy class."""
+import random
+from datetime import time
+
+import pytest
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.occupancy import Occupancy
+from app.src.occupancy import get_mask_runs
+from app.src.occupancy import intersection
+from app.src.occupancy import union
+from app.utils.utilities import Day
+
+def create_lesson(day: Day, start: int, end: int) -> Lesson:
+    """Creates a lesson taking place between given minutes of the day."""
+    return Lesson("", "", "", day, time(start // 60, start % 60), time(end // 60, end % 60))
+
+def test_collides():
+    """Tests collides function from Occupancy class."""
+    occupancy = Occupancy.from_lessons([create_lesson(Day.MON, 8*60, 9*60 + 30),
+                                        create_lesson(Day.MON, 10*60, 11*60)])
+    assert occupancy.collides(create_lesson(Day.MON, 9*60, 10*60))
+    assert occupancy.collides(create_lesson(Day.MON, 10*60 + 59, 12*60))
+    assert not occupancy.collides(create_lesson(Day.MON, 9*60 + 30, 10*60))
+    assert not occupancy.collides(create_lesson(Day.TUE, 8*60, 12*60))
+
+    occupancy = Occupancy.from_lessons([create_lesson(Day.MON, 8*60, 9*60 + 30)], 15)
+    assert occupancy.collides(create_lesson(Day.MON, 9*60 + 40, 10*60)) is False
+    assert occupancy.collides(create_lesson(Day.MON, 9*60 + 25, 10*60))
+
+def test_get_intervals():
+    """Tests get_intervals and get_free_intervals functions from Occupancy class."""
+    occupancy = Occupancy.from_lessons([create_lesson(Day.WED, 8*60, 9*60),
+                                        create_lesson(Day.WED, 8*60 + 30, 10*60),
+                                        create_lesson(Day.WED, 12*60, 13*60)])
+    assert occupancy.get_intervals(Day.WED) == [(8*60, 10*60), (12*60, 13*60)]
+    assert occupancy.get_free_intervals(Day.WED) == [(0, 8*60), (10*60, 12*60), (13*60, 24*60)]
+    assert occupancy.get_intervals(Day.THU) == []
+    assert occupancy.get_free_intervals(Day.THU) == [(0, 24*60)]
+
+def test_get_mask_runs():
+    """Tests get_mask_runs function against a scan of the bits."""
+    generator = random.Random(0)
+    for _ in range(100):
+        mask = generator.getrandbits(200) & generator.getrandbits(200)
+        bits = [mask >> bit & 1 for bit in range(201)]
+        expected = [(bit, bit + bits[bit:].index(0)) for bit in range(200)
+                    if bits[bit] and (bit == 0 or not bits[bit - 1])]
+        assert get_mask_runs(mask) == expected
+
+def test_union_intersection():
+    """Tests union and intersection functions."""
+    occupancies = [Occupancy.from_lessons([create_lesson(Day.MON, start, start + 120)])
+                   for start in (8*60, 9*60, 9*60 + 30)]
+    assert union(occupancies).get_intervals(Day.MON) == [(8*60, 11*60 + 30)]
+    assert intersection(occupancies).get_intervals(Day.MON) == [(9*60 + 30, 10*60)]
+
+    with pytest.raises(ValueError):
+        union([Occupancy(granularity=1), Occupancy(granularity=5)])
+
+def test_schedule_occupancy():
+    """Tests that the occupancy of Schedule class is cached and invalidated."""
+    schedule = Schedule("Rozvrh")
+    schedule.add_lesson(create_lesson(Day.MON, 8*60, 9*60))
+    occupancy = schedule.get_occupancy()
+    assert schedule.get_occupancy() is occupancy
+
+    schedule.edit_lesson(0, create_lesson(Day.TUE, 8*60, 9*60))
+    assert schedule.get_occupancy() is not occupancy
+    assert schedule.get_occupancy().get_intervals(Day.TUE) == [(8*60, 9*60)]
+    assert schedule.get_occupancy().get_intervals(Day.MON) == []
@@ -0,0 +1,44 @@
+"""Tests for the layout of overlapping lessons."""
+import random
+
+from app.src.overlap_layout import compute_interval_columns
+
+def overlaps(interval1: tuple, interval2: tuple) -> bool:
+    """Says whether two intervals overlap."""
+    return interval1[0] < interval2[1] and interval2[0] < interval1[1]
+
+def test_compute_interval_columns():
+    """Tests compute_interval_columns function on small days."""
+    assert compute_interval_columns([]) == []
+
+    intervals = [(8*60, 10*60), (9*60, 11*60), (11*60, 12*60)]
+    assert compute_interval_columns(intervals) == [(0, 2), (1, 2), (0, 1)]
+
+    intervals = [(8*60, 12*60), (9*60, 10*60), (9*60, 10*60), (10*60, 11*60)]
+    assert compute_interval_columns(intervals) == [(0, 3), (1, 3), (2, 3), (1, 3)]
+
+def test_compute_interval_columns_many_lessons():
+    """Tests compute_interval_columns function on hundreds of heavily overlapping lessons."""
+    generator = random.Random(0)
+    intervals = []
+    for _ in range(200):
+        start = generator.randrange(7*60, 20*60)
+        intervals.append((start, start + generator.randrange(15, 240)))
+    intervals.sort(key=lambda interval: interval[0])
+    columns = compute_interval_columns(intervals)
+
+    for (column, column_count) in columns:
+        assert 0 <= column < column_count
+    for index1, interval1 in enumerate(intervals):
+        for index2 in range(index1 + 1, len(intervals)):
+            if overlaps(interval1, intervals[index2]):
+                assert columns[index1][0] != columns[index2][0]
+                assert columns[index1][1] == columns[index2][1]
+
+    most_overlaps = max(sum(1 for start, end in intervals if start <= moment < end) for moment, _ in intervals)
+    assert max(column_count for _, column_count in columns) == most_overlaps
+
+def test_compute_interval_columns_same_times():
+    """Tests that lessons with the same times are placed in the order of the list."""
+    intervals = [(8*60, 9*60)] * 300
+    assert compute_interval_columns(intervals) == [(index, 300) for index in range(300)]
@@ -0,0 +1,202 @@
+"""Tests for RenderScheduler class."""
+import threading
+import time
+
+from PIL import Image
+
+from app.gui.render_scheduler import RenderScheduler
+
+class FakeWindow():
+    """Window keeping the callbacks of after() until they are run by the test."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.count = 0
+
+    def after(self, delay, callback):
+        """Remembers the callback and returns its id."""
+        self.count += 1
+        timer = f"after#{self.count}"
+        self.callbacks[timer] = callback
+        return timer
+
+    def after_cancel(self, timer):
+        """Forgets the callback."""
+        self.callbacks.pop(timer, None)
+
+    def run_pending(self):
+        """Runs the callbacks registered so far."""
+        callbacks = list(self.callbacks.values())
+        self.callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    def run_until(self, condition, timeout=5.0):
+        """Runs the callbacks until the condition is met."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            self.run_pending()
+            time.sleep(0.001)
+
+class FakePainter():
+    """Painter drawing an image of the viewport size and remembering the sizes."""
+
+    def __init__(self):
+        self.size = None
+        self.image = None
+        self.dirty_box = None
+        self.sizes = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.error = None
+
+    def set_viewport_size(self, size):
+        """Sets the size of the image."""
+        self.size = size
+
+    def draw_dirty(self):
+        """Records the drawn size, waits until released, raises the set error and returns the set box."""
+        self.sizes.append(self.size)
+        self.started.set()
+        self.release.wait()
+        if self.error is not None:
+            raise self.error
+        if self.image is None or self.image.size != self.size:
+            self.image = Image.new("RGB", self.size, "white")
+            return (0, 0, *self.size)
+        dirty_box, self.dirty_box = self.dirty_box, None
+        return dirty_box
+
+    def get_image(self):
+        """Returns the image."""
+        return self.image
+
+def create_scheduler():
+    """Creates a scheduler with a fake window and painter, which remembers the shown images with their boxes and errors."""
+    window = FakeWindow()
+    painter = FakePainter()
+    frames = []
+    errors = []
+    scheduler = RenderScheduler(window, painter, lambda image, box: frames.append((image, box)), errors.append, delay=50)
+    return window, painter, scheduler, frames, errors
+
+def test_merge_requests():
+    """Tests that requests coming before the delay runs out are merged into the last one."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    scheduler.request((300, 200))
+    scheduler.request((400, 200))
+    scheduler.request((500, 300))
+    assert len(window.callbacks) == 1
+
+    window.run_until(lambda: frames and not scheduler.polling)
+    assert painter.sizes == [(500, 300)]
+    assert [(image.size, box) for image, box in frames] == [((500, 300), None)]
+    assert not errors
+    scheduler.close()
+
+def test_drop_replaced_request():
+    """Tests that the image of a request replaced while it was rendered is not shown."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    painter.release.clear()
+    scheduler.request((300, 200), 0)
+    window.run_pending()
+    assert painter.started.wait(5.0)
+
+    scheduler.request((400, 300), 0)
+    window.run_pending()
+    painter.release.set()
+    window.run_until(lambda: frames and not scheduler.polling)
+    assert painter.sizes == [(300, 200), (400, 300)]
+    assert [(image.size, box) for image, box in frames] == [((400, 300), None)]
+    scheduler.close()
+
+def test_dirty_regions():
+    """Tests that only the redrawn regions are shown and the regions of replaced requests are not lost."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    scheduler.request((300, 200), 0)
+    window.run_until(lambda: frames and not scheduler.polling)
+    frames.clear()
+
+    scheduler.request((300, 200), 0)
+    window.run_until(lambda: len(painter.sizes) == 2 and not scheduler.polling)
+    assert not frames
+
+    painter.started.clear()
+    painter.release.clear()
+    painter.dirty_box = (10, 20, 50, 60)
+    scheduler.request((300, 200), 0)
+    window.run_pending()
+    assert painter.started.wait(5.0)
+    scheduler.request((300, 200), 0)
+    window.run_pending()
+    painter.release.set()
+    window.run_until(lambda: len(painter.sizes) == 4 and not scheduler.polling)
+    painter.dirty_box = (100, 100, 120, 110)
+    scheduler.request((300, 200), 0)
+    window.run_until(lambda: len(frames) == 2 and not scheduler.polling)
+    assert [(image.size, box) for image, box in frames] == [((40, 40), (10, 20, 50, 60)),
+                                                            ((20, 10), (100, 100, 120, 110))]
+    scheduler.close()
+
+def test_cancel():
+    """Tests that no image requested before cancel is shown."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    painter.release.clear()
+    scheduler.request((300, 200), 0)
+    window.run_pending()
+    assert painter.started.wait(5.0)
+
+    scheduler.cancel()
+    painter.release.set()
+    window.run_until(lambda: not scheduler.polling)
+    assert not frames
+    scheduler.close()
+
+def test_render_error():
+    """Tests that an error of the rendering is reported once and the worker keeps running."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    painter.error = ValueError("chyba")
+    scheduler.request((300, 200), 0)
+    window.run_until(lambda: errors and not scheduler.polling)
+    scheduler.request((300, 200), 0)
+    window.run_until(lambda: len(painter.sizes) == 2 and not scheduler.polling)
+    assert [str(error) for error in errors] == ["chyba"]
+    assert not frames
+
+    painter.error = None
+    scheduler.request((400, 300), 0)
+    window.run_until(lambda: frames and not scheduler.polling)
+    assert [(image.size, box) for image, box in frames] == [((400, 300), None)]
+    scheduler.close()
+
+def test_latency():
+    """Tests that the latency is measured from the first merged request for every shown frame."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    assert scheduler.get_latency_statistics()["frames"] == 0
+    scheduler.request((300, 200))
+    time.sleep(0.02)
+    scheduler.request((400, 300))
+    window.run_until(lambda: frames and not scheduler.polling)
+    statistics = scheduler.get_latency_statistics()
+    assert statistics["frames"] == 1 and statistics["last"] >= 0.02
+
+    painter.error = ValueError("chyba")
+    scheduler.request((300, 200), 0)
+    window.run_until(lambda: errors and not scheduler.polling)
+    painter.error = None
+    scheduler.request((500, 300), 0)
+    window.run_until(lambda: len(frames) == 2 and not scheduler.polling)
+    assert scheduler.get_latency_statistics()["frames"] == 2
+    scheduler.close()
+
+def test_close():
+    """Tests that the worker stops when the scheduler is closed and pending requests are dropped."""
+    window, painter, scheduler, frames, errors = create_scheduler()
+    scheduler.request((300, 200))
+    scheduler.close()
+    scheduler.worker.join(5.0)
+    assert not scheduler.worker.is_alive()
+    assert not window.callbacks
+    assert not painter.sizes
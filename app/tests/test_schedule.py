@@ -5,6 +5,7 @@ import pickle
 from pathlib import Path
 import pytest
 from app.src.schedule import Schedule
+from app.src import schedule_format
 from app.src.lesson import Lesson
 from app.utils.utilities import Day
 
@@ -84,7 +85,7 @@ def test_save_and_load_to_json_file(index):
     assert os.path.exists(file_path)
 
     with open(file_path, 'rb') as file:
-        loaded_schedule = pickle.load(file)
+        loaded_schedule = schedule_format.decode(file.read())
 
     assert loaded_schedule.name == schedule.name
     assert loaded_schedule.lessons[index].name == schedule.lessons[index].name
@@ -95,6 +96,42 @@ def test_save_and_load_to_json_file(index):
     assert loaded_schedule.lessons[index].end_time == schedule.lessons[index].end_time
     assert loaded_schedule.lessons[index].color == schedule.lessons[index].color
 
+def test_pop_dirty_days():
+    """Tests that Schedule class remembers the days changed by its functions."""
+    schedule = Schedule("Rozvrh")
+    schedule.add_lesson(Lesson(day=Day.MON))
+    schedule.add_lesson(Lesson(day=Day.TUE))
+    assert schedule.pop_dirty_days() == {Day.MON, Day.TUE}
+    assert schedule.pop_dirty_days() == set()
+
+    schedule.edit_lesson(0, Lesson(day=Day.FRI))
+    assert schedule.pop_dirty_days() == {Day.MON, Day.FRI}
+
+    schedule.remove_lesson(1)
+    assert schedule.pop_dirty_days() == {Day.TUE}
+    assert not pickle.loads(pickle.dumps(schedule)).dirty_days
+
+def test_day_indexes():
+    """Tests that Schedule class keeps the indexes of the days up to date."""
+    schedule = Schedule("Rozvrh")
+    schedule.add_lesson(Lesson("A", day=Day.MON, start_time=time(10, 0), end_time=time(11, 0)))
+    schedule.add_lesson(Lesson("B", day=Day.MON, start_time=time(8, 0), end_time=time(9, 30)))
+    schedule.add_lesson(Lesson("C", day=Day.TUE, start_time=time(8, 0), end_time=time(9, 0)))
+    assert [lesson.name for lesson in schedule.get_lessons_on_day(Day.MON)] == ["B", "A"]
+    assert [lesson.name for lesson in schedule.get_overlapping_lessons(Day.MON, 9*60, 10*60)] == ["B"]
+    assert schedule.get_free_gaps(Day.MON, 30, 7*60, 12*60) == [(7*60, 8*60), (9*60 + 30, 10*60), (11*60, 12*60)]
+
+    schedule.edit_lesson(0, Lesson("D", day=Day.TUE, start_time=time(7, 0), end_time=time(8, 0)))
+    assert [lesson.name for lesson in schedule.get_lessons_on_day(Day.MON)] == ["B"]
+    assert [lesson.name for lesson in schedule.get_lessons_on_day(Day.TUE)] == ["D", "C"]
+
+    schedule.remove_lesson(1)
+    assert schedule.get_lessons_on_day(Day.MON) == []
+    assert schedule.get_free_gaps(Day.MON, 30) == [(0, 24*60)]
+
+    loaded_schedule = pickle.loads(pickle.dumps(schedule))
+    assert [lesson.name for lesson in loaded_schedule.get_lessons_on_day(Day.TUE)] == ["D", "C"]
+
 def test_rename():
     """Tests save_to_json_file function from Schedule class."""
     schedule = Schedule("Rozvrh")
@@ -0,0 +1,106 @@
+"""Tests for ScheduleDatabase class."""
+import sqlite3
+from datetime import time
+
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.schedule_database import ScheduleDatabase
+from app.utils.utilities import Day
+
+def create_schedule(name: str, place: str, instructor: str) -> Schedule:
+    """Creates a schedule with a morning and an afternoon lesson on Monday."""
+    schedule = Schedule(name)
+    schedule.add_lesson(Lesson("Fyzika", place, instructor, Day.MON, time(8, 0), time(9, 30), (10, 20, 30)))
+    schedule.add_lesson(Lesson("Chemie", "C-2", "Malá", Day.MON, time(13, 0), time(14, 30)))
+    return schedule
+
+def test_save_and_load_schedule(tmp_path):
+    """Tests save_schedule and load_schedule functions from ScheduleDatabase class."""
+    database = ScheduleDatabase(tmp_path / "schedules.db")
+    schedule = create_schedule("Rozvrh", "T-105", "Novák")
+    database.save_schedule(schedule)
+    database.save_schedule(schedule)
+    loaded = database.load_schedule("Rozvrh")
+    assert [lesson.__getstate__() for lesson in loaded.lessons] == [lesson.__getstate__() for lesson in schedule.lessons]
+    assert database.get_schedule_names() == ["Rozvrh"]
+
+    database.delete_schedule("Rozvrh")
+    assert database.load_schedule("Rozvrh") is None
+    assert not database.find_lessons()
+    database.close()
+
+def test_find_lessons(tmp_path):
+    """Tests find_lessons and find_schedules functions from ScheduleDatabase class."""
+    database = ScheduleDatabase(tmp_path / "schedules.db")
+    database.save_schedule(create_schedule("Adam", "T-105", "Novák"))
+    database.save_schedule(create_schedule("Bára", "T-105", "Svoboda"))
+    database.save_schedule(create_schedule("Cyril", "T-106", "Novák"))
+
+    assert database.find_schedules(day=Day.MON, start=8*60, end=12*60, place="T-105") == ["Adam", "Bára"]
+    assert database.find_schedules(day=Day.TUE, place="T-105") == []
+    assert database.find_schedules(start=9*60 + 30, end=12*60) == []
+    matches = database.find_lessons(instructor="Novák")
+    assert [(match.schedule_name, match.lesson.place) for match in matches] == [("Adam", "T-105"), ("Cyril", "T-106")]
+    assert matches[0].lesson.color == (10, 20, 30)
+    plan = database.connection.execute("EXPLAIN QUERY PLAN SELECT * FROM lessons WHERE place = ? AND day = ?",
+                                       ("T-105", 0)).fetchall()
+    assert "lessons_place" in str(plan)
+    database.close()
+
+def test_import_folder(tmp_path, monkeypatch):
+    """Tests that import_folder function from ScheduleDatabase class imports only the changed files."""
+    folder = tmp_path / "schedules"
+    folder.mkdir()
+    create_schedule("Adam", "T-105", "Novák").save_to_txt_file(folder / "Adam.txt")
+    create_schedule("Bára", "T-105", "Svoboda").save_to_txt_file(folder / "Bára.txt")
+    database = ScheduleDatabase(tmp_path / "schedules.db")
+    assert database.import_folder(folder) == []
+    assert database.get_schedule_names() == ["Adam", "Bára"]
+
+    saved = []
+    save_schedule = database.save_schedule
+    monkeypatch.setattr(database, "save_schedule", lambda schedule, *args: saved.append(schedule.name)
+                        or save_schedule(schedule, *args))
+    (folder / "Adam.txt").unlink()
+    create_schedule("Bára", "T-205", "Svoboda").save_to_txt_file(folder / "Bára.txt")
+    database.import_folder(folder)
+    assert saved == ["Bára"]
+    assert database.get_schedule_names() == ["Bára"]
+    assert database.find_schedules(place="T-205") == ["Bára"]
+    database.close()
+
+def test_import_same_names(tmp_path):
+    """Tests that schedules of different files with the same name are imported and replaced by their files."""
+    folder = tmp_path / "schedules"
+    folder.mkdir()
+    create_schedule("Rozvrh", "T-105", "Novák").save_to_txt_file(folder / "Adam.txt")
+    create_schedule("Rozvrh", "T-106", "Svoboda").save_to_txt_file(folder / "Bára.txt")
+    database = ScheduleDatabase(tmp_path / "schedules.db")
+    assert database.import_folder(folder) == []
+    assert database.get_schedule_names() == ["Rozvrh"]
+    assert len(database.find_lessons(day=Day.MON)) == 4
+
+    create_schedule("Rozvrh", "T-205", "Svoboda").save_to_txt_file(folder / "Bára.txt")
+    database.import_folder(folder)
+    assert database.find_schedules(place="T-105") == ["Rozvrh"]
+    assert not database.find_lessons(place="T-106")
+    assert len(database.find_lessons(place="T-205")) == 1
+    database.close()
+
+def test_old_version(tmp_path):
+    """Tests that a database of an older version is emptied."""
+    path = tmp_path / "schedules.db"
+    connection = sqlite3.connect(str(path))
+    connection.execute("CREATE TABLE schedules (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, "
+                       "file_path TEXT, content_hash TEXT)")
+    connection.execute("INSERT INTO schedules (name) VALUES ('Rozvrh')")
+    connection.execute("PRAGMA user_version = 1")
+    connection.commit()
+    connection.close()
+
+    database = ScheduleDatabase(path)
+    assert database.get_schedule_names() == []
+    database.save_schedule(create_schedule("Rozvrh", "T-105", "Novák"), "Adam.txt")
+    database.save_schedule(create_schedule("Rozvrh", "T-106", "Novák"), "Bára.txt")
+    assert len(database.find_lessons(instructor="Novák")) == 2
+    database.close()
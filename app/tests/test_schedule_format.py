@@ -0,0 +1,67 @@
+"""Tests for the file formats of the schedules."""
+import pickle
+from datetime import time
+
+import pytest
+
+from app.src import schedule_format
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.utils.utilities import Day
+
+def create_schedule() -> Schedule:
+    """Creates a schedule with lessons sharing some of the strings."""
+    schedule = Schedule("Rozvrh Nováka")
+    for day in Day:
+        schedule.add_lesson(Lesson("Čeština", "B-203", "Zavařil", day, time(8, 0), time(8, 45), (255, 0, 0)))
+        schedule.add_lesson(Lesson("Fyzika", "T-105", "Novák", day, time(13, 15), time(23, 59), (0, 128, 255)))
+    return schedule
+
+def assert_same_lessons(schedule: Schedule, other: Schedule) -> None:
+    """Checks that the schedules have the same name and lessons."""
+    assert other.name == schedule.name
+    assert len(other.lessons) == len(schedule.lessons)
+    for lesson, other_lesson in zip(schedule.lessons, other.lessons):
+        assert other_lesson.__getstate__() == lesson.__getstate__()
+
+@pytest.mark.parametrize("encode", (schedule_format.encode_binary, schedule_format.encode_json))
+def test_encode_decode(encode):
+    """Tests that the decoded schedule is the same as the encoded one in both of the formats."""
+    schedule = create_schedule()
+    decoded = schedule_format.decode(encode(schedule))
+    assert_same_lessons(schedule, decoded)
+    assert decoded.get_lessons_on_day(Day.SUN)[1].place == "T-105"
+
+def test_binary_format():
+    """Tests that the binary format is smaller than pickle and its metadata can be read alone."""
+    schedule = create_schedule()
+    data = schedule_format.encode_binary(schedule)
+    assert len(data) < len(pickle.dumps(schedule)) / 2
+    assert schedule_format.read_metadata(data[:40]) == ("Rozvrh Nováka", 14)
+
+    with pytest.raises(ValueError):
+        schedule_format.decode(data[:-1])
+    with pytest.raises(ValueError):
+        schedule_format.decode(data[:4] + b"\x02\x00" + data[6:])
+
+def test_damaged_pickle():
+    """Tests that any error of a damaged pickled schedule is raised as ValueError."""
+    data = pickle.dumps(create_schedule())
+    for damaged in (data[:len(data) // 2], data.replace(b"app.src.schedule", b"app.src.schedulX"), pickle.dumps([1, 2])):
+        with pytest.raises(ValueError):
+            schedule_format.decode_pickle(damaged)
+
+def test_migrate_folder(tmp_path):
+    """Tests migrate_folder function."""
+    schedule = create_schedule()
+    with open(tmp_path / "Starý.txt", "wb") as file:
+        pickle.dump(schedule, file)
+    schedule_format.save_file(schedule, tmp_path / "Nový.txt")
+    (tmp_path / "Poškozený.txt").write_bytes(b"\x80")
+
+    migrated, errors = schedule_format.migrate_folder(tmp_path)
+    assert [file.name for file in migrated] == ["Starý.txt"]
+    assert [file.name for file, _ in errors] == ["Poškozený.txt"]
+    data = (tmp_path / "Starý.txt").read_bytes()
+    assert data.startswith(schedule_format.MAGIC)
+    assert_same_lessons(schedule, schedule_format.decode(data))
@@ -0,0 +1,106 @@
+"""Tests for ScheduleGenerator class."""
+import itertools
+import random
+from datetime import time
+
+from app.src.lesson import Lesson
+from app.src.schedule_generator import Course
+from app.src.schedule_generator import ScheduleGenerator
+from app.src.schedule_generator import compute_score
+from app.src.schedule_generator import get_week_mask
+from app.utils.utilities import Day
+from app.utils.utilities import GeneratorObjective
+
+def create_catalog(seed: int, course_count: int) -> list:
+    """Creates random courses with one or two lessons on different days in every option."""
+    generator = random.Random(seed)
+    courses = []
+    for course in range(course_count):
+        options = []
+        for _ in range(generator.randrange(1, 5)):
+            option = []
+            for day in generator.sample(range(5), generator.randrange(1, 3)):
+                start = generator.randrange(8, 18) * 60 + generator.choice((0, 30))
+                option.append(Lesson(f"Předmět {course}",
+                                     "",
+                                     "",
+                                     Day(day),
+                                     time(start // 60, start % 60),
+                                     time((start + 90) // 60, (start + 90) % 60)))
+            options.append(tuple(option))
+        courses.append(Course(f"Předmět {course}", tuple(options)))
+    return courses
+
+def find_all_by_brute_force(courses: list) -> list:
+    """Tries all the combinations of the options and returns those without collisions."""
+    combinations = []
+    for choice in itertools.product(*(range(len(course.options)) for course in courses)):
+        lessons = [lesson for course, option in zip(courses, choice) for lesson in course.options[option]]
+        if not any(first.day == second.day
+                   and first.start_time < second.end_time
+                   and second.start_time < first.end_time
+                   for first, second in itertools.combinations(lessons, 2)):
+            combinations.append(choice)
+    return combinations
+
+def test_generate():
+    """Tests generate function from ScheduleGenerator class against trying all combinations."""
+    for seed in range(5):
+        courses = create_catalog(seed, 6)
+        generator = ScheduleGenerator(courses)
+        assert sorted(generator.generate()) == find_all_by_brute_force(courses)
+        assert len(list(generator.generate(limit=1))) <= 1
+
+def test_find_best():
+    """Tests find_best function from ScheduleGenerator class against trying all combinations."""
+    objectives_list = ((GeneratorObjective.FEWEST_DAYS,),
+                       (GeneratorObjective.FEWEST_GAPS,),
+                       (GeneratorObjective.LATEST_START, GeneratorObjective.FEWEST_DAYS))
+    for seed in range(5):
+        courses = create_catalog(seed, 6)
+        generator = ScheduleGenerator(courses)
+        combinations = find_all_by_brute_force(courses)
+        for objectives in objectives_list:
+            best = generator.find_best(objectives)
+            if not combinations:
+                assert best is None
+                continue
+
+            def score(choice):
+                occupied = 0
+                for mask_list, option in zip(generator.option_masks, choice):
+                    occupied |= mask_list[option]
+                return compute_score(occupied, objectives, generator.slot_count, False)
+            assert score(best) == min(score(choice) for choice in combinations)
+
+def test_compute_score():
+    """Tests compute_score function."""
+    lessons = [Lesson(day=Day.MON, start_time=time(9, 0), end_time=time(10, 0)),
+               Lesson(day=Day.MON, start_time=time(11, 0), end_time=time(12, 0)),
+               Lesson(day=Day.WED, start_time=time(8, 30), end_time=time(10, 0))]
+    score = compute_score(get_week_mask(lessons),
+                          (GeneratorObjective.FEWEST_DAYS, GeneratorObjective.FEWEST_GAPS, GeneratorObjective.LATEST_START),
+                          24*60,
+                          False)
+    assert score == (2, 60, -(8*60 + 30))
+
+def test_parallel_search():
+    """Tests that the parallel search finds the same combinations as the serial one."""
+    courses = create_catalog(7, 8)
+    generator = ScheduleGenerator(courses)
+    assert sorted(generator.find_all(processes=2)) == sorted(generator.find_all(processes=1))
+    assert generator.find_all(limit=5) == list(generator.generate(5))
+    objectives = (GeneratorObjective.FEWEST_DAYS, GeneratorObjective.FEWEST_GAPS)
+    best = generator.find_best(objectives, processes=1)
+    assert best is not None
+    parallel_best = generator.find_best(objectives, processes=2)
+    assert compute_score(get_week_mask(generator.build_schedule(parallel_best, "").lessons),
+                         objectives,
+                         generator.slot_count,
+                         False) == compute_score(get_week_mask(generator.build_schedule(best, "").lessons),
+                                                 objectives,
+                                                 generator.slot_count,
+                                                 False)
+
+    schedule = generator.build_schedule(best, "Rozvrh")
+    assert len(schedule.lessons) == sum(len(course.options[option]) for course, option in zip(courses, best))
@@ -0,0 +1,71 @@
+"""Tests for ScheduleIndex class."""
+import os
+from datetime import time
+
+from app.src import schedule_index
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.schedule_index import ScheduleIndex
+from app.src.schedule_index import load_schedule
+from app.src.schedule_journal import ScheduleJournal
+from app.utils.utilities import Day
+
+def create_schedule(name: str, lesson_count: int) -> Schedule:
+    """Creates a schedule with given number of lessons."""
+    schedule = Schedule(name)
+    for hour in range(lesson_count):
+        schedule.add_lesson(Lesson("Matematika", "", "", Day.MON, time(8 + hour, 0), time(9 + hour, 0)))
+    return schedule
+
+def test_refresh(tmp_path):
+    """Tests refresh function from ScheduleIndex class."""
+    create_schedule("První", 2).save_to_txt_file(tmp_path / "První.txt")
+    create_schedule("Druhý", 3).save_to_txt_file(tmp_path / "Druhý.txt")
+    (tmp_path / "Poškozený.txt").write_bytes(b"nejde o rozvrh")
+
+    index = ScheduleIndex(tmp_path)
+    errors = index.refresh()
+    assert [file.name for file, _ in errors] == ["Poškozený.txt"]
+    assert [(entry.name, entry.lesson_count) for entry in index.get_entries()] == [("Druhý", 3), ("První", 2)]
+    assert (tmp_path / "index.json").exists()
+
+    entry = index.get_entries()[1]
+    assert len(load_schedule(entry).lessons) == 2
+
+def test_refresh_changed_files(tmp_path, monkeypatch):
+    """Tests that refresh function from ScheduleIndex class reads only the changed files."""
+    create_schedule("První", 2).save_to_txt_file(tmp_path / "První.txt")
+    create_schedule("Druhý", 3).save_to_txt_file(tmp_path / "Druhý.txt")
+    ScheduleIndex(tmp_path).refresh()
+
+    read_files = []
+    read_entry = schedule_index.read_entry
+    monkeypatch.setattr(schedule_index,
+                        "read_entry",
+                        lambda file, *args: read_files.append(file.name) or read_entry(file, *args))
+    index = ScheduleIndex(tmp_path)
+    index.refresh()
+    assert not read_files
+
+    create_schedule("První", 5).save_to_txt_file(tmp_path / "První.txt")
+    stat = os.stat(tmp_path / "První.txt")
+    os.utime(tmp_path / "První.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    os.remove(tmp_path / "Druhý.txt")
+    index.refresh()
+    assert read_files == ["První.txt"]
+    assert [(entry.name, entry.lesson_count) for entry in index.get_entries()] == [("První", 5)]
+    assert ScheduleIndex(tmp_path).get_entries() == index.get_entries()
+
+def test_refresh_journal(tmp_path):
+    """Tests that refresh function from ScheduleIndex class reads the changes from the journals."""
+    schedule = create_schedule("Rozvrh", 1)
+    schedule.save_to_txt_file(tmp_path / "Rozvrh.txt")
+    index = ScheduleIndex(tmp_path)
+    index.refresh()
+
+    journal = ScheduleJournal(schedule, tmp_path / "Rozvrh.txt")
+    schedule.add_lesson(Lesson("Fyzika", "", "", Day.FRI, time(10, 0), time(11, 0)))
+    schedule.rename("Nový rozvrh")
+    journal.close()
+    index.refresh()
+    assert [(entry.name, entry.lesson_count) for entry in index.get_entries()] == [("Nový rozvrh", 2)]
@@ -0,0 +1,83 @@
+"""Tests for ScheduleJournal class."""
+import os
+from datetime import time
+
+from app.src import schedule_format
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.src.schedule_journal import ScheduleJournal
+from app.src.schedule_journal import get_journal_path
+from app.src.schedule_loader import load_file
+from app.utils.utilities import Day
+
+def create_lesson(hour: int) -> Lesson:
+    """Creates a lesson starting at given hour."""
+    return Lesson(f"Hodina {hour}", "T-105", "Novák", Day.WED, time(hour, 0), time(hour, 45), (0, hour, 0))
+
+def assert_same_lessons(schedule: Schedule, other: Schedule) -> None:
+    """Checks that the schedules have the same name and lessons."""
+    assert other.name == schedule.name
+    assert [lesson.__getstate__() for lesson in other.lessons] == [lesson.__getstate__() for lesson in schedule.lessons]
+
+def test_journal(tmp_path):
+    """Tests that the changes written to the journal are loaded with the schedule."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.add_lesson(create_lesson(8))
+    schedule.save_to_txt_file(file_path)
+    snapshot = file_path.read_bytes()
+
+    journal = ScheduleJournal(schedule, file_path, sync_batch=2)
+    schedule.add_lesson(create_lesson(9))
+    schedule.add_lesson(create_lesson(10))
+    schedule.edit_lesson(0, create_lesson(12))
+    schedule.remove_lesson(1)
+    schedule.rename("Nový rozvrh")
+
+    assert file_path.read_bytes() == snapshot
+    assert journal.record_count == 5
+    assert_same_lessons(schedule, load_file(file_path))
+
+    journal.close()
+    schedule.add_lesson(create_lesson(14))
+    assert len(load_file(file_path).lessons) == 2
+
+def test_damaged_journal(tmp_path):
+    """Tests that a damaged end of the journal is ignored and cut off."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.save_to_txt_file(file_path)
+    journal = ScheduleJournal(schedule, file_path)
+    schedule.add_lesson(create_lesson(8))
+    schedule.add_lesson(create_lesson(9))
+    journal.close()
+
+    journal_path = get_journal_path(file_path)
+    journal_path.write_bytes(journal_path.read_bytes()[:-3])
+    loaded = load_file(file_path)
+    assert [lesson.name for lesson in loaded.lessons] == ["Hodina 8"]
+
+    journal = ScheduleJournal(loaded, file_path)
+    loaded.add_lesson(create_lesson(10))
+    journal.close()
+    assert [lesson.name for lesson in load_file(file_path).lessons] == ["Hodina 8", "Hodina 10"]
+
+def test_compact(tmp_path):
+    """Tests that the journal is compacted to the snapshot."""
+    file_path = tmp_path / "Rozvrh.txt"
+    schedule = Schedule("Rozvrh")
+    schedule.save_to_txt_file(file_path)
+    journal = ScheduleJournal(schedule, file_path, compaction_threshold=4)
+    for hour in range(8, 14):
+        schedule.add_lesson(create_lesson(hour))
+
+    assert journal.record_count == 2
+    assert len(schedule_format.decode(file_path.read_bytes()).lessons) == 4
+    assert_same_lessons(schedule, load_file(file_path))
+
+    stale_journal = get_journal_path(file_path).read_bytes()
+    journal.compact()
+    journal.close()
+    get_journal_path(file_path).write_bytes(stale_journal)
+    assert_same_lessons(schedule, load_file(file_path))
+    assert os.path.getsize(get_journal_path(file_path)) > 0
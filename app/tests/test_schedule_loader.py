@@ -0,0 +1,48 @@
+"""Tests for functions loading many schedule files."""
+from datetime import time
+
+import pytest
+
+from app.src import schedule_loader
+from app.src.lesson import Lesson
+from app.src.schedule import Schedule
+from app.utils import config
+from app.utils.utilities import Day
+
+@pytest.fixture
+def schedule_folder(tmp_path):
+    """Saves schedules and a damaged file to a temporary folder."""
+    for number in range(20):
+        schedule = Schedule(f"Rozvrh {number:02d}")
+        for hour in range(number % 5):
+            schedule.add_lesson(Lesson("Fyzika", "", "", Day.TUE, time(8 + hour, 0), time(9 + hour, 0)))
+        schedule.save_to_txt_file(tmp_path / f"Rozvrh {number:02d}.txt")
+    (tmp_path / "Poškozený.txt").write_bytes(b"")
+    return tmp_path
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_load_folder(schedule_folder, processes):
+    """Tests load_folder function."""
+    report = schedule_loader.load_folder(schedule_folder, threads=4, processes=processes)
+    assert [schedule.name for _, schedule in report.schedules] == [f"Rozvrh {number:02d}" for number in range(20)]
+    assert [len(schedule.lessons) for _, schedule in report.schedules] == [number % 5 for number in range(20)]
+    assert [file.name for file, _ in report.errors] == ["Poškozený.txt"]
+    assert "poškozený" in schedule_loader.format_errors(report.errors)
+
+def test_iterate_schedules(schedule_folder):
+    """Tests that iterate_schedules function yields a result for every file."""
+    files = sorted(schedule_folder.glob("*.txt")) + [schedule_folder / "Chybějící.txt"]
+    results = list(schedule_loader.iterate_schedules(files, threads=4))
+    assert sorted(result.file for result in results) == sorted(files)
+    errors = {result.file.name: result.error for result in results if result.error is not None}
+    assert isinstance(errors["Chybějící.txt"], FileNotFoundError)
+    assert isinstance(errors["Poškozený.txt"], ValueError)
+
+def test_load_large_file(schedule_folder, monkeypatch):
+    """Tests that the lessons of a schedule reaching the threshold are loaded to a table."""
+    monkeypatch.setattr(config, "COLUMNAR_LESSON_THRESHOLD", 3)
+    small = schedule_loader.load_file(schedule_folder / "Rozvrh 02.txt")
+    large = schedule_loader.load_file(schedule_folder / "Rozvrh 04.txt")
+    assert not small.is_columnar()
+    assert large.is_columnar() and large.name == "Rozvrh 04"
+    assert [lesson.start_time for lesson in large.get_lessons_on_day(Day.TUE)] == [time(8 + hour, 0) for hour in range(4)]
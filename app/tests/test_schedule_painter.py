@@ -2,7 +2,7 @@
 from pathlib import Path
 from datetime import time
 
-from PIL import Image
+from PIL import Image, ImageChops
 import pytest
 
 from app.utils import utilities
@@ -24,14 +24,8 @@ def load_test_image(request):
     directory_path = Path(__file__).parent / "test_pictures"
     return (request.param, Image.open(directory_path / request.param))
 
-def test_draw(load_test_image):
-    """Test draw function from SchedulePainter class."""
-    painter = SchedulePainter()
-    directory_path = Path(__file__).parent
-    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
-    painter.update_image()
-
-    test_file_name, test_image = load_test_image
+def create_test_schedule(test_file_name: str) -> Schedule:
+    """Creates the schedule drawn in the test picture with given name."""
     schedule = Schedule("Rozvrh")
     if "1" in test_file_name:
         lesson1 = Lesson("Matematika",
@@ -51,8 +45,146 @@ def test_draw(load_test_image):
                          time(12, 30),
                          (0, 0, 255))
         schedule.add_lesson(lesson2)
+    return schedule
 
-    painter.change_schedule(schedule)
+def test_draw(load_test_image):
+    """Test draw function from SchedulePainter class."""
+    painter = SchedulePainter(utilities.OutlineMode.LOOP)
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.update_image()
+
+    test_file_name, test_image = load_test_image
+    painter.change_schedule(create_test_schedule(test_file_name))
     painter.draw()
     assert test_image.size == painter.image.size
     assert list(painter.image.getdata()) == list(test_image.getdata())
+
+@pytest.mark.parametrize("outline_mode", (utilities.OutlineMode.STROKE, utilities.OutlineMode.MASK))
+def test_draw_outline_modes(load_test_image, outline_mode):
+    """Tests that the single pass outline modes of SchedulePainter are close to the test pictures."""
+    painter = SchedulePainter(outline_mode)
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.update_image()
+
+    test_file_name, test_image = load_test_image
+    painter.change_schedule(create_test_schedule(test_file_name))
+    painter.draw()
+    assert test_image.size == painter.image.size
+    difference = list(ImageChops.difference(painter.image, test_image.convert("RGB")).convert("L").getdata())
+    assert sum(1 for pixel in difference if pixel) / len(difference) < 0.05
+    assert sum(difference) / len(difference) / 255 < 0.005
+
+def test_draw_background():
+    """Tests that the background layer of SchedulePainter is cached."""
+    painter = SchedulePainter()
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.update_image()
+    schedule = create_test_schedule("schedule_0.png")
+    painter.change_schedule(schedule)
+    painter.draw()
+    background = painter.background
+
+    schedule.add_lesson(Lesson("Matematika", "T-105", "Novák", Day.MON, time(12, 0), time(16, 30)))
+    painter.draw()
+    assert painter.background is background
+
+    schedule.rename("Nový rozvrh")
+    painter.draw()
+    assert painter.background is not background
+
+    background = painter.background
+    painter.settings["days_in_week"] = "1111111"
+    painter.draw()
+    assert painter.background is not background
+
+def test_draw_sprites():
+    """Tests that SchedulePainter reuses rendered lessons."""
+    painter = SchedulePainter()
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.update_image()
+    painter.change_schedule(create_test_schedule("schedule_012.png"))
+    painter.draw()
+    first_image = painter.image.copy()
+    assert painter.sprites.misses == 2
+
+    painter.update_image()
+    painter.draw()
+    assert painter.sprites.hits == 2
+    assert list(painter.image.getdata()) == list(first_image.getdata())
+
+def test_compute_plan():
+    """Tests that the plan of SchedulePainter is reused and diffed."""
+    painter = SchedulePainter()
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.update_image()
+    schedule = create_test_schedule("schedule_012.png")
+    painter.change_schedule(schedule)
+    plan = painter.compute_plan()
+    assert painter.compute_plan() is plan
+    assert len(plan.lessons) == 2
+
+    painter.draw()
+    painter.draw()
+    assert painter.sprites.misses == 2
+    assert painter.sprites.hits == 0
+
+    schedule.add_lesson(Lesson("Fyzika", "T-115", "Novák", Day.WED, time(10, 0), time(11, 30), (0, 255, 0)))
+    new_plan = painter.compute_plan()
+    assert new_plan is not plan
+    assert new_plan.background == plan.background
+    removed, added = new_plan.diff(plan)
+    assert removed == ()
+    assert len(added) == 1
+
+@pytest.mark.parametrize("orientation", ("horizontal", "vertical"))
+def test_draw_dirty(orientation):
+    """Tests that draw_dirty function from SchedulePainter class gives the same image as draw."""
+    painter = SchedulePainter()
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.settings["schedule_orientation"] = orientation
+    painter.update_image()
+    schedule = create_test_schedule("schedule_012.png")
+    painter.change_schedule(schedule)
+    assert painter.draw_dirty() == (0, 0, painter.image.width, painter.image.height)
+    assert painter.draw_dirty() is None
+
+    schedule.add_lesson(Lesson("Fyzika", "T-115", "Novák", Day.WED, time(10, 0), time(11, 30), (0, 255, 0)))
+    schedule.edit_lesson(0, Lesson("Matematika", "T-105", "Novák", Day.MON, time(13, 15), time(15, 0), (255, 255, 0)))
+    dirty_box = painter.draw_dirty()
+    assert dirty_box is not None
+    assert dirty_box != (0, 0, painter.image.width, painter.image.height)
+
+    expected_painter = SchedulePainter()
+    expected_painter.settings = painter.settings
+    expected_painter.update_image()
+    expected_painter.change_schedule(schedule)
+    expected_painter.draw()
+    assert list(painter.image.getdata()) == list(expected_painter.image.getdata())
+
+    schedule.remove_lesson(1)
+    painter.draw_dirty()
+    expected_painter.draw()
+    assert list(painter.image.getdata()) == list(expected_painter.image.getdata())
+
+def test_set_viewport_size():
+    """Tests set_viewport_size function from SchedulePainter class."""
+    painter = SchedulePainter()
+    directory_path = Path(__file__).parent
+    painter.settings = utilities.load_settings(directory_path / "test_settings.json")
+    painter.update_image()
+    painter.change_schedule(create_test_schedule("schedule_012.png"))
+
+    painter.set_viewport_size((500, 250))
+    painter.draw()
+    assert painter.image.size == (500, 250)
+    assert painter.background.size == (500, 250)
+
+    painter.set_viewport_size(None)
+    painter.draw()
+    assert painter.image.size == (800, 400)
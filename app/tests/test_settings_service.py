@@ -0,0 +1,86 @@
+"""Tests for SettingsService class."""
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.utils.settings_service import SettingsService
+from app.utils.settings_service import validate_settings
+
+@pytest.fixture
+def settings_path(tmp_path):
+    """Copies the test settings to a temporary file."""
+    file_path = tmp_path / "settings.json"
+    shutil.copy(Path(__file__).parent / "test_settings.json", file_path)
+    return file_path
+
+def test_get(settings_path):
+    """Tests that get function from SettingsService class reads the file only once."""
+    service = SettingsService(settings_path)
+    settings = service.get()
+    assert settings["schedule_width"] == 800
+    assert settings["text_scale"] == 1.0
+
+    os.remove(settings_path)
+    assert service.get() is settings
+
+def test_update(settings_path):
+    """Tests update function from SettingsService class."""
+    service = SettingsService(settings_path)
+    notified = []
+    service.subscribe(notified.append)
+    settings = dict(service.get())
+    settings["schedule_orientation"] = "vertical"
+    service.update(settings)
+
+    assert service.get()["schedule_orientation"] == "vertical"
+    assert notified == [service.get()]
+    with open(settings_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["schedule_orientation"] == "vertical"
+    assert not service.reload_if_changed()
+    assert os.listdir(settings_path.parent) == ["settings.json"]
+
+def test_update_invalid(settings_path):
+    """Tests that update function from SettingsService class keeps the file if the settings are not valid."""
+    service = SettingsService(settings_path)
+    content = settings_path.read_bytes()
+    settings = dict(service.get())
+    settings["schedule_width"] = -1
+    with pytest.raises(ValueError):
+        service.update(settings)
+    assert settings_path.read_bytes() == content
+    assert service.get()["schedule_width"] == 800
+
+def test_reload_if_changed(settings_path):
+    """Tests that SettingsService class reads the file again after it is modified."""
+    service = SettingsService(settings_path)
+    notified = []
+    service.subscribe(notified.append)
+    service.get()
+
+    with open(settings_path, "r", encoding="utf-8") as f:
+        settings = json.load(f)
+    settings["days_in_week"] = "1111111"
+    with open(settings_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f)
+    os.utime(settings_path, ns=(0, service.modification_time + 1_000_000_000))
+
+    assert service.reload_if_changed()
+    assert service.get()["days_in_week"] == "1111111"
+    assert len(notified) == 1
+
+@pytest.mark.parametrize("key, value", (("schedule_width", 0),
+                                        ("schedule_orientation", "diagonal"),
+                                        ("day_start", "8:00"),
+                                        ("days_in_week", "0000000"),
+                                        ("text_scale", "big")))
+def test_validate_settings(settings_path, key, value):
+    """Tests that validate_settings function rejects wrong values."""
+    with open(settings_path, "r", encoding="utf-8") as f:
+        settings = json.load(f)
+    validate_settings(settings)
+    settings[key] = value
+    with pytest.raises(ValueError):
+        validate_settings(settings)
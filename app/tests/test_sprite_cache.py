@@ -0,0 +1,24 @@
+"""Tests for SpriteCache class."""
+from PIL import Image
+
+from app.gui.sprite_cache import SpriteCache
+
+def test_get_and_put():
+    """Tests get and put functions from SpriteCache class."""
+    cache = SpriteCache()
+    sprite = (Image.new("RGBA", (10, 10)), (0, 0))
+    assert cache.get("lesson") is None
+    cache.put("lesson", sprite)
+    assert cache.get("lesson") is sprite
+    assert cache.memory_used == 400
+    assert cache.get_hit_rate() == 0.5
+
+def test_memory_budget():
+    """Tests that SpriteCache evicts the least recently used sprites over the budget."""
+    cache = SpriteCache(1000)
+    cache.put(1, (Image.new("RGBA", (10, 10)), (0, 0)))
+    cache.put(2, (Image.new("RGBA", (10, 10)), (0, 0)))
+    cache.get(1)
+    cache.put(3, (Image.new("RGBA", (10, 10)), (0, 0)))
+    assert list(cache.sprites) == [1, 3]
+    assert cache.memory_used == 800
@@ -0,0 +1,36 @@
+"""Tests for TextFitter class."""
+import pytest
+
+from app.gui.font_cache import FontCache
+from app.gui.text_fitter import TextFitter
+
+@pytest.mark.parametrize("text, max_size, width", (("Matematika", 40, 100),
+                                                   ("Velmi dlouhý název předmětu", 120, 57.5),
+                                                   ("F", 20, 300),
+                                                   ("Programování", 30, 0)))
+def test_fit(text, max_size, width):
+    """Tests that fit function from TextFitter class gives the same size as shrinking by one."""
+    fonts = FontCache()
+    fitter = TextFitter(fonts)
+    expected_size = max_size
+    while fonts.get("arial.ttf", expected_size).getlength(text) > width and expected_size > 1:
+        expected_size -= 1
+    assert fitter.fit("arial.ttf", (text,), max_size, width) == expected_size
+
+def test_fit_more_texts():
+    """Tests that fit function from TextFitter class fits all the passed texts."""
+    fonts = FontCache()
+    fitter = TextFitter(fonts)
+    size = fitter.fit("arial.ttf", ("Novák", "T-105 a T-106"), 50, 80)
+    assert fonts.get("arial.ttf", size).getlength("T-105 a T-106") <= 80
+    assert fonts.get("arial.ttf", size + 1).getlength("T-105 a T-106") > 80
+
+def test_fit_memoization():
+    """Tests that fit function from TextFitter class memoizes the results."""
+    fonts = FontCache()
+    fitter = TextFitter(fonts)
+    fitter.fit("arial.ttf", ("Matematika",), 40, 100)
+    misses = fonts.get_statistics()[1]
+    hits = fonts.get_statistics()[0]
+    fitter.fit("arial.ttf", ("Matematika",), 40, 100)
+    assert fonts.get_statistics() == (hits, misses)
@@ -1,11 +1,32 @@
 """Contains constants used throughout the code."""
 from pathlib import Path
 
+from app.utils.utilities import OutlineMode
+
 APP_NAME = "Rozvrhář"
 SCHEDULE_FOLDER_PATH = Path(__file__).parent.parent / "schedules"
+SCHEDULE_INDEX_FILE_NAME = "index.json"
+LOADER_THREAD_COUNT = 8
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_SYNC_BATCH = 16
+JOURNAL_COMPACTION_THRESHOLD = 1000
+COLUMNAR_LESSON_THRESHOLD = 10000
+AUTOSAVE_DELAY = 1.0
+AUTOSAVE_MAX_DELAY = 10.0
+AUTOSAVE_STATUS_INTERVAL = 1000
+DATABASE_PATH = SCHEDULE_FOLDER_PATH / "schedules.db"
+DATABASE_IMPORT_POLL_INTERVAL = 50
+RENDER_MANIFEST_FILE_NAME = "render.json"
 
 MAIN_WINDOW_INITIAL_SIZE = (800, 600)
+MIN_VIEWPORT_SIZE = (200, 100)
+RENDER_DEBOUNCE_DELAY = 50
+RENDER_POLL_INTERVAL = 10
+RENDER_LATENCY_HISTORY = 100
+SETTINGS_CHECK_INTERVAL = 2000
 LESSON_WINDOW_INITIAL_SIZE = (600, 400)
+FREE_TIME_WINDOW_INITIAL_SIZE = (500, 400)
+SEARCH_WINDOW_INITIAL_SIZE = (800, 400)
 SETTINGS_PATH = Path(__file__).parent / "settings.json"
 
 BG_LINE_WIDTH_FACTOR = 1.0 / 500
@@ -23,3 +44,11 @@ LSSN_NAME_TEXT_RATIO = 1.0 / 3
 LSSN_INFO_TEXT_RATIO = 1.0 / 2
 LSSN_TEXT_PADDING_FACTOR =  1.0 / 200
 LSSN_UPPER_PART_RATIO = 2/3
+TEXT_OUTLINE_MODE = OutlineMode.MASK
+
+FONT_CACHE_SIZE = 128
+TEXT_FIT_CACHE_SIZE = 1024
+SPRITE_CACHE_MEMORY_BUDGET = 64 * 1024 * 1024
+
+OCCUPANCY_GRANULARITY = 1
+FREE_TIME_GRANULARITY = 5
@@ -0,0 +1,180 @@
+"""Contains a service keeping the settings loaded in memory."""
+import json
+import os
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TypedDict
+
+from app.utils import config
+
+class Settings(TypedDict):
+    """Settings of the schedules."""
+    schedule_width: int
+    schedule_height: int
+    schedule_orientation: str
+    day_start: str
+    day_end: str
+    days_in_week: str
+    text_scale: float
+    text_font: str
+    text_bold_font: str
+
+def validate_settings(settings: Dict) -> Settings:
+    """
+    Checks the settings and converts them to the right types.
+
+    Args:
+        settings (Dict): Loaded settings.
+
+    Raises:
+        ValueError: If some of the settings is missing or has a wrong value.
+
+    Returns:
+        Settings: The validated settings.
+    """
+    try:
+        validated = Settings(schedule_width=int(settings["schedule_width"]),
+                             schedule_height=int(settings["schedule_height"]),
+                             schedule_orientation=str(settings["schedule_orientation"]),
+                             day_start=str(settings["day_start"]),
+                             day_end=str(settings["day_end"]),
+                             days_in_week=str(settings["days_in_week"]),
+                             text_scale=float(settings["text_scale"]),
+                             text_font=str(settings["text_font"]),
+                             text_bold_font=str(settings["text_bold_font"]))
+    except KeyError as e:
+        raise ValueError(f"V nastavení chybí položka {e}.") from e
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Nastavení obsahuje špatnou hodnotu: {e}") from e
+
+    if validated["schedule_width"] <= 0 or validated["schedule_height"] <= 0:
+        raise ValueError("Rozměry rozvrhu musí být kladné.")
+    if validated["schedule_orientation"] not in ("horizontal", "vertical"):
+        raise ValueError("Orientace rozvrhu musí být horizontal nebo vertical.")
+    for day_time in (validated["day_start"], validated["day_end"]):
+        if (len(day_time) != 5 or day_time[2] != ":" or not day_time[:2].isdigit()
+            or not day_time[3:].isdigit() or int(day_time[:2]) > 23 or int(day_time[3:]) > 59):
+            raise ValueError("Časy začátku a konce dne musí být ve formátu HH:MM.")
+    if (len(validated["days_in_week"]) != 7
+        or set(validated["days_in_week"]) - {"0", "1"}
+        or "1" not in validated["days_in_week"]):
+        raise ValueError("Dny v týdnu musí být zadány sedmi znaky 0 nebo 1 s alespoň jednou 1.")
+    if validated["text_scale"] <= 0:
+        raise ValueError("Škálování textu musí být kladné.")
+    return validated
+
+class SettingsService():
+    """
+    Keeps the settings loaded in memory.
+
+    The settings are read from the file only once. They are read again only after they are
+    written by the service or when the modification time of the file changes. Subscribers are
+    notified about every change of the settings.
+    """
+
+    def __init__(self, file_path: Path=config.SETTINGS_PATH):
+        self.file_path = Path(file_path)
+        self.settings: Optional[Settings] = None
+        self.modification_time: Optional[int] = None
+        self.subscribers: List[Callable[[Settings], None]] = []
+
+    def get(self) -> Settings:
+        """
+        Returns the settings.
+
+        The file is read only on the first call.
+
+        Returns:
+            Settings: The settings. They must not be changed, changes are made by update.
+        """
+        if self.settings is None:
+            self.load()
+        return self.settings
+
+    def load(self) -> None:
+        """Reads the settings from the file."""
+        modification_time = os.stat(self.file_path).st_mtime_ns
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            self.settings = validate_settings(json.load(f))
+        self.modification_time = modification_time
+
+    def update(self, settings: Dict) -> None:
+        """
+        Validates and saves the settings to the file and notifies the subscribers.
+
+        The settings are written to a temporary file which then replaces the settings file, so an
+        interrupted write never leaves a broken settings file.
+
+        Args:
+            settings (Dict): New settings.
+
+        Raises:
+            ValueError: If the settings are not valid.
+            OSError: If the settings cannot be written.
+        """
+        validated = validate_settings(settings)
+        temporary_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(validated, f, indent=4)
+        os.replace(temporary_path, self.file_path)
+        self.settings = validated
+        self.modification_time = os.stat(self.file_path).st_mtime_ns
+        self.notify()
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reads the settings again if the file has been modified by someone else.
+
+        If the modified file does not contain valid settings, the old settings are kept.
+
+        Returns:
+            bool: True if the settings have been read again.
+        """
+        try:
+            if os.stat(self.file_path).st_mtime_ns == self.modification_time:
+                return False
+            self.load()
+        except (OSError, ValueError):
+            return False
+        self.notify()
+        return True
+
+    def subscribe(self, callback: Callable[[Settings], None]) -> None:
+        """
+        Registers a function called with the new settings whenever they change.
+
+        Args:
+            callback (Callable[[Settings], None]): The function.
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Settings], None]) -> None:
+        """
+        Removes a registered function.
+
+        Args:
+            callback (Callable[[Settings], None]): The function.
+        """
+        self.subscribers.remove(callback)
+
+    def notify(self) -> None:
+        """Calls all the subscribers with the current settings."""
+        for callback in list(self.subscribers):
+            callback(self.settings)
+
+_service: Optional[SettingsService] = None
+
+def get_settings_service() -> SettingsService:
+    """
+    Returns the service for the settings of the application.
+
+    Returns:
+        SettingsService: The service shared by the whole application.
+    """
+    global _service
+    if _service is None:
+        _service = SettingsService()
+    return _service
@@ -40,3 +40,28 @@ class ScreenState(Enum):
     """Enum class for posible states of the screen."""
     SCHEDULE_DRAWN = 0
     SCHEDULE_LIST_SHOWN = 1
+
+class OutlineMode(Enum):
+    """Enum class for possible ways of drawing the outline of lesson names."""
+    LOOP = 0
+    STROKE = 1
+    MASK = 2
+
+class GeneratorObjective(Enum):
+    """Enum class for the objectives of the generated schedules."""
+    FEWEST_DAYS = 0
+    FEWEST_GAPS = 1
+    LATEST_START = 2
+
+class ChangeKind(Enum):
+    """Enum class for the kinds of changes of a schedule."""
+    ADD = 0
+    EDIT = 1
+    REMOVE = 2
+    RENAME = 3
+
+class RenderStatus(Enum):
+    """Enum class for the results of rendering of a schedule file."""
+    RENDERED = 0
+    SKIPPED = 1
+    FAILED = 2